@@ -5,4 +5,4 @@ This package exposes a minimal translation chain built with LangChain
 Expression Language (LCEL) and a FastAPI server for serving the chain.
 """
 
-__all__ = ["chains", "router", "config", "prompt_template"]
+__all__ = ["chains", "router", "config", "prompt_template", "go_check", "scanner", "findings"]
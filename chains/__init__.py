@@ -2,15 +2,48 @@
 Composable LangChain building blocks grouped by responsibility.
 """
 
-from .chains import translation_chain, fibonacci_chain, code_check_full_chain, code_check_small_chain
-from .models import build_chat_model
+from . import chains as _registry
+from .chains import get_chain, register_chain, list_chains, built_chains
+from .models import build_chat_model, close_chat_models, aclose_chat_models, run_async
 from .parsers import default_parser
+from .cache import get_response_cache
+from .ratelimit import RateLimiter, get_rate_limiter
+from .budget import ContextBudgetExceeded, PromptBudget, count_tokens, prompt_budget
+from .findings import FindingsOutputParser, findings_parser, parse_findings
+from .metrics import metrics_handler, metrics_registry
+
+
+def __getattr__(name: str):
+    # `translation_chain` and friends are built by the registry on first access.
+    if name in _registry._CHAIN_ALIASES:
+        return getattr(_registry, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
+    "get_chain",
+    "register_chain",
+    "list_chains",
+    "built_chains",
     "translation_chain",
     "fibonacci_chain",
     "code_check_full_chain",
     "code_check_small_chain",
     "build_chat_model",
+    "close_chat_models",
+    "aclose_chat_models",
+    "run_async",
     "default_parser",
+    "get_response_cache",
+    "RateLimiter",
+    "get_rate_limiter",
+    "ContextBudgetExceeded",
+    "PromptBudget",
+    "count_tokens",
+    "prompt_budget",
+    "FindingsOutputParser",
+    "findings_parser",
+    "parse_findings",
+    "metrics_handler",
+    "metrics_registry",
 ]
@@ -0,0 +1,266 @@
+"""
+Token counting and context-window preflight.
+
+Prompts are measured before any network call so an oversized request fails
+fast (or is split by the caller) instead of after a slow, billed round trip.
+
+Counting is exact when `QWEN_TOKENIZER_PATH` points at a Qwen
+`tokenizer.json` and the optional `tokenizers` package is installed.
+Otherwise an offline estimator modelled on Qwen's byte-level BPE
+pre-tokenizer is used; it errs on the high side.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import math
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+from langchain_core.prompt_values import PromptValue
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+from ..config import settings
+
+# Qwen's pre-tokenizer pattern, approximated with `re` classes:
+# contractions, letter runs with one leading non-letter, single digits,
+# punctuation runs, newlines and other whitespace.
+PRETOKEN_RE = re.compile(
+    r"'(?:s|t|re|ve|m|ll|d)"
+    r"|[^\r\n\w]?[^\W\d_]+"
+    r"|\d"
+    r"| ?[^\s\w]+[\r\n]*"
+    r"|\s*[\r\n]+"
+    r"|\s+(?!\S)"
+    r"|\s+",
+    re.IGNORECASE,
+)
+CJK_RE = re.compile(r"[　-〿㐀-䶿一-鿿＀-￯]")
+CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+")
+
+# Estimator calibration for Qwen's 151k vocabulary
+CJK_CHARS_PER_TOKEN = 1.4
+WORD_CHARS_PER_TOKEN = 7
+PUNCT_CHARS_PER_TOKEN = 2
+SPACES_PER_TOKEN = 8
+ESTIMATE_MARGIN = 1.1
+
+# ChatML framing: <|im_start|>{role}\n ... <|im_end|>\n per message, plus the
+# assistant header the model completes after.
+TOKENS_PER_MESSAGE = 5
+TOKENS_PER_REPLY = 3
+
+# Context windows of DashScope models (longest matching prefix wins).
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "qwen-turbo": 131072,
+    "qwen-plus": 131072,
+    "qwen-max": 32768,
+    "qwen-long": 10000000,
+    "qwen-coder-turbo": 131072,
+    "qwen-coder-plus": 131072,
+    "qwen3": 131072,
+    "qwen2.5": 131072,
+}
+DEFAULT_CONTEXT_WINDOW = 32768
+
+
+def _estimate_pretoken(piece: str) -> int:
+    cjk = len(CJK_RE.findall(piece))
+    if cjk:
+        rest = len(piece) - cjk
+        return math.ceil(cjk / CJK_CHARS_PER_TOKEN) + (1 if rest else 0)
+    if piece.isspace():
+        return 1 + len(piece.strip("\r\n")) // SPACES_PER_TOKEN
+    core = piece.lstrip()
+    if core[:1].isalpha() or core[1:2].isalpha():
+        parts = CAMEL_RE.findall(core) or [core]
+        return sum(math.ceil(len(part) / WORD_CHARS_PER_TOKEN) for part in parts)
+    if core.isdigit():
+        return 1
+    return max(1, math.ceil(len(core.strip("\r\n")) / PUNCT_CHARS_PER_TOKEN))
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the Qwen token count of `text` without a tokenizer."""
+
+    if not text:
+        return 0
+    raw = sum(_estimate_pretoken(piece) for piece in PRETOKEN_RE.findall(text))
+    return math.ceil(raw * ESTIMATE_MARGIN)
+
+
+@lru_cache(maxsize=1)
+def _exact_counter() -> Optional[Callable[[str], int]]:
+    """Return an exact counter from the configured tokenizer file, if any."""
+
+    if not settings.tokenizer_path or importlib.util.find_spec("tokenizers") is None:
+        return None
+    from tokenizers import Tokenizer
+
+    tokenizer = Tokenizer.from_file(settings.tokenizer_path)
+    return lambda text: len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of `text` (exact when a tokenizer is configured)."""
+
+    counter = _exact_counter()
+    return counter(text) if counter is not None else estimate_tokens(text)
+
+
+def count_message_tokens(messages: Sequence[BaseMessage]) -> int:
+    """Count the tokens of a chat request, including message framing."""
+
+    total = TOKENS_PER_REPLY
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        total += TOKENS_PER_MESSAGE + count_tokens(message.type) + count_tokens(content)
+    return total
+
+
+def context_window(model: Optional[str] = None) -> int:
+    """Return the context window of `model` (default: the configured model)."""
+
+    if settings.context_window > 0:
+        return settings.context_window
+    model = (model or settings.model).lower()
+    matches = [prefix for prefix in MODEL_CONTEXT_WINDOWS if model.startswith(prefix)]
+    if not matches:
+        return DEFAULT_CONTEXT_WINDOW
+    return MODEL_CONTEXT_WINDOWS[max(matches, key=len)]
+
+
+def available_tokens(model: Optional[str] = None) -> int:
+    """Return the prompt tokens left once the output reservation is taken."""
+
+    return context_window(model) - settings.reserved_output_tokens
+
+
+@dataclass
+class PromptBudget:
+    """Token accounting of one formatted prompt against the model window."""
+
+    total: int
+    window: int
+    reserved_output: int
+    sections: Dict[str, int] = field(default_factory=dict)
+    variables: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def available(self) -> int:
+        return self.window - self.reserved_output
+
+    @property
+    def fits(self) -> bool:
+        return self.total <= self.available
+
+    @property
+    def overflow(self) -> int:
+        return max(0, self.total - self.available)
+
+    def summary(self) -> str:
+        """Return a one-line human readable summary."""
+
+        parts = [f"{name}={tokens}" for name, tokens in {**self.sections, **self.variables}.items()]
+        detail = f" ({', '.join(parts)})" if parts else ""
+        return f"{self.total}/{self.available} tokens{detail}"
+
+
+class ContextBudgetExceeded(ValueError):
+    """Raised when a prompt does not fit the model's context window."""
+
+    def __init__(self, budget: PromptBudget):
+        self.budget = budget
+        super().__init__(
+            f"Prompt needs {budget.total} tokens but only {budget.available} are available "
+            f"(window {budget.window} - reserved output {budget.reserved_output}): "
+            f"{budget.summary()}"
+        )
+
+
+def section_token_counts(prompt: ChatPromptTemplate) -> Dict[str, int]:
+    """
+    Return token counts of the static sections of a `build_chat_prompt` prompt.
+
+    Prompts built elsewhere carry no section metadata and return `{}`.
+    """
+
+    sections = (prompt.metadata or {}).get("sections", {})
+    return {
+        name: count_tokens(text.replace("{{", "{").replace("}}", "}"))
+        for name, text in sections.items()
+    }
+
+
+def prompt_budget(
+    prompt: ChatPromptTemplate,
+    inputs: Mapping[str, Any],
+    model: Optional[str] = None,
+) -> PromptBudget:
+    """
+    Measure `prompt` formatted with `inputs` against the model window.
+
+    Besides the total, the budget lists the static sections of the template
+    and every input variable, so callers can see what to trim or split.
+    """
+
+    messages = prompt.format_messages(**inputs)
+    return PromptBudget(
+        total=count_message_tokens(messages),
+        window=context_window(model),
+        reserved_output=settings.reserved_output_tokens,
+        sections=section_token_counts(prompt),
+        variables={name: count_tokens(str(value)) for name, value in inputs.items()},
+    )
+
+
+def check_prompt_value(value: PromptValue, model: Optional[str] = None) -> PromptValue:
+    """Pass `value` through, raising `ContextBudgetExceeded` if it is too large for `model`."""
+
+    budget = PromptBudget(
+        total=count_message_tokens(value.to_messages()),
+        window=context_window(model),
+        reserved_output=settings.reserved_output_tokens,
+    )
+    if not budget.fits:
+        raise ContextBudgetExceeded(budget)
+    return value
+
+
+@lru_cache(maxsize=None)
+def make_context_guard(model: Optional[str] = None) -> RunnableLambda:
+    """
+    Return the chain step placed between a prompt and `model`.
+
+    Chains calling another model than the configured one (the routing tiers)
+    must be guarded with that model's window.
+    """
+
+    def guard(value: PromptValue) -> PromptValue:
+        return check_prompt_value(value, model)
+
+    return RunnableLambda(guard, name="context_guard")
+
+
+# Guard for chains calling the configured model.
+context_guard = make_context_guard()
+
+
+__all__ = [
+    "PromptBudget",
+    "ContextBudgetExceeded",
+    "estimate_tokens",
+    "count_tokens",
+    "count_message_tokens",
+    "context_window",
+    "available_tokens",
+    "section_token_counts",
+    "prompt_budget",
+    "check_prompt_value",
+    "make_context_guard",
+    "context_guard",
+]
@@ -0,0 +1,234 @@
+"""Persistent LLM response cache shared by all chat models."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from ..config import settings
+
+RULE_BOOK_DIR = Path(__file__).resolve().parent.parent / "prompt_template"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+def _dump_generations(generations: Sequence[Generation]) -> str:
+    """Serialize generations (chat or plain text) to JSON."""
+
+    items = []
+    for generation in generations:
+        if isinstance(generation, ChatGeneration):
+            items.append({"message": message_to_dict(generation.message)})
+        else:
+            items.append({"text": generation.text})
+    return json.dumps(items, ensure_ascii=False)
+
+
+def _load_generations(value: str) -> List[Generation]:
+    """Inverse of `_dump_generations`."""
+
+    generations: List[Generation] = []
+    for item in json.loads(value):
+        if "message" in item:
+            generations.append(ChatGeneration(message=messages_from_dict([item["message"]])[0]))
+        else:
+            generations.append(Generation(text=item["text"]))
+    return generations
+
+
+@lru_cache(maxsize=None)
+def rule_book_version() -> str:
+    """
+    Return the rule-book version mixed into every cache key.
+
+    Uses CODE_CHECKER_RULEBOOK_VERSION when set, otherwise a short hash of
+    the rule books under prompt_template, so editing a rule invalidates
+    cached answers.
+    """
+
+    if settings.rule_book_version:
+        return settings.rule_book_version
+    digest = hashlib.sha256()
+    for path in sorted(RULE_BOOK_DIR.rglob("*-auto-gen.md")):
+        digest.update(path.relative_to(RULE_BOOK_DIR).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class SQLiteResponseCache(BaseCache):
+    """
+    LangChain cache storing model responses in a local SQLite database.
+
+    Entries are keyed by a hash of (rendered messages, model parameters,
+    rule-book version). The database runs in WAL mode so several uvicorn
+    workers and CLI processes can share it. Entries older than `ttl` seconds
+    are ignored and evicted, and the least recently used entries are evicted
+    once the table holds more than `max_entries` rows.
+    """
+
+    # Eviction runs once per this many writes to keep updates cheap.
+    EVICT_EVERY = 64
+
+    def __init__(self, path: str, ttl: float, max_entries: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        """Hash the rendered prompt, the model parameters and the rule-book version."""
+
+        digest = hashlib.sha256()
+        for part in (prompt, llm_string, rule_book_version()):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        """Return cached generations for the prompt, or None on a miss."""
+
+        key = self.make_key(prompt, llm_string)
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value FROM responses WHERE key = ? AND created_at >= ?",
+            (key, now - self.ttl),
+        ).fetchone()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return _load_generations(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        """Store generations for the prompt and occasionally evict old entries."""
+
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (self.make_key(prompt, llm_string), _dump_generations(return_val), now, now),
+        )
+
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % self.EVICT_EVERY == 1
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries and trim to `max_entries`; return rows removed."""
+
+        conn = self._connection()
+        removed = conn.execute(
+            "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)
+        ).rowcount
+        removed += conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?"
+            ")",
+            (self.max_entries,),
+        ).rowcount
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every cached response."""
+
+        self._connection().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for this process and the current size."""
+
+        entries = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": entries,
+                "path": self.path,
+            }
+
+
+_cache: Optional[SQLiteResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache(temperature: Optional[float] = None) -> Optional[SQLiteResponseCache]:
+    """
+    Return the process-wide response cache, or None when it is disabled.
+
+    The cache is on by default. A model sampling with `temperature` > 0
+    gets no cache unless CODE_CHECKER_LLM_CACHE_SAMPLED=1, so it does not
+    silently repeat one answer for the cache lifetime.
+
+    Environment variables:
+        CODE_CHECKER_LLM_CACHE:             cache database path, default
+                                            ~/.cache/code_checker/llm_cache.sqlite3
+                                            ("" disables).
+        CODE_CHECKER_LLM_CACHE_TTL:         entry lifetime in seconds (default 7 days).
+        CODE_CHECKER_LLM_CACHE_MAX_ENTRIES: maximum number of entries.
+        CODE_CHECKER_LLM_CACHE_SAMPLED:     also cache models with temperature > 0.
+        CODE_CHECKER_RULEBOOK_VERSION:      overrides the rule-book hash.
+    """
+
+    global _cache
+    if not settings.llm_cache_path:
+        return None
+    if temperature is not None and temperature > 0 and not settings.llm_cache_sampled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SQLiteResponseCache(
+                os.path.expanduser(settings.llm_cache_path),
+                ttl=settings.llm_cache_ttl,
+                max_entries=settings.llm_cache_max_entries,
+            )
+    return _cache
+
+
+__all__ = ["SQLiteResponseCache", "get_response_cache", "rule_book_version"]
@@ -1,24 +1,166 @@
-"""Composable LCEL chains."""
+"""
+Composable LCEL chains.
 
+Chains are registered by name and built on first use, then memoized so the
+same instance is re-used by both CLI and server. Importing this module does
+not read rule books or construct model clients. Every chain measures its
+formatted prompt against the window of the model it calls, and
+reports its runs to `chains.metrics`.
+"""
+
+import threading
+from typing import Callable, Dict, List
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableLambda
+
+from .budget import context_guard, make_context_guard
+from .inputs import CodeCheckInput, prepare_code_check_input
 from .models import build_chat_model
+from .findings import findings_parser
+from .metrics import instrument
 from .parsers import default_parser
-from .prompts import translation_prompt, fibonacci_prompt, code_check_full_prompt, code_check_small_prompt
+from .routing import ESCALATION, TRIAGE, build_tier_model, tier_model
+from .prompts import (
+    translation_prompt,
+    get_fibonacci_prompt,
+    get_code_check_full_prompt,
+    get_code_check_small_prompt,
+    get_code_check_chunk_prompt,
+    get_code_check_triage_prompt,
+)
+
+ChainBuilder = Callable[[], Runnable]
+
+_builders: Dict[str, ChainBuilder] = {}
+_chains: Dict[str, Runnable] = {}
+_lock = threading.RLock()
+
+
+def register_chain(name: str, builder: ChainBuilder) -> None:
+    """Register a chain builder under `name`, dropping any memoized instance."""
+
+    with _lock:
+        _builders[name] = builder
+        _chains.pop(name, None)
+
+
+def get_chain(name: str) -> Runnable:
+    """Return the chain registered as `name`, building it on first use."""
+
+    chain = _chains.get(name)
+    if chain is not None:
+        return chain
+
+    with _lock:
+        chain = _chains.get(name)
+        if chain is None:
+            if name not in _builders:
+                raise KeyError(f"Unknown chain: {name!r}")
+            chain = instrument(name, _builders[name]())
+            _chains[name] = chain
+    return chain
+
+
+def list_chains() -> List[str]:
+    """Return the names of all registered chains."""
+
+    return list(_builders)
+
+
+def built_chains() -> List[str]:
+    """Return the names of chains that have already been built."""
+
+    return list(_chains)
+
+
+def build_code_check_chain(get_prompt: Callable[[str], ChatPromptTemplate]) -> Runnable:
+    """
+    Build a code check chain whose prompt is picked per request.
+
+    The input carries the Go source, file kind and optional docs (see
+    `CodeCheckInput`); the prompt for each file kind is built once and its
+    rule book stays cached, so one process can check any number of files.
+    """
+
+    prompt = RunnableLambda(lambda inputs: get_prompt(inputs["file_kind"]), name="code_check_prompt")
+    chain = (
+        RunnableLambda(prepare_code_check_input, name="prepare_code_check_input")
+        | prompt
+        | context_guard
+        | build_chat_model()
+        | default_parser
+    )
+    return chain.with_types(input_type=CodeCheckInput)
+
+
+register_chain(
+    "translation",
+    lambda: translation_prompt | context_guard | build_chat_model() | default_parser,
+)
+register_chain(
+    "fibonacci",
+    lambda: get_fibonacci_prompt() | context_guard | build_chat_model() | default_parser,
+)
+register_chain(
+    "code_check_full",
+    lambda: build_code_check_chain(get_code_check_full_prompt),
+)
+register_chain(
+    "code_check_small",
+    lambda: build_code_check_chain(get_code_check_small_prompt),
+)
+register_chain(
+    "code_check_chunk",
+    lambda: (
+        get_code_check_chunk_prompt()
+        | make_context_guard(tier_model(ESCALATION))
+        | build_tier_model(ESCALATION)
+        | default_parser
+    ),
+)
+register_chain(
+    "code_check_chunk_findings",
+    lambda: (
+        get_code_check_chunk_prompt("findings")
+        | make_context_guard(tier_model(ESCALATION))
+        | build_tier_model(ESCALATION).bind(response_format={"type": "json_object"})
+        | findings_parser
+    ),
+)
+register_chain(
+    "code_check_triage",
+    lambda: (
+        get_code_check_triage_prompt()
+        | make_context_guard(tier_model(TRIAGE))
+        | build_tier_model(TRIAGE)
+        | default_parser
+    ),
+)
 
-# Build once so the chain can be re-used by both CLI and server.
-translation_chain = translation_prompt | build_chat_model() | default_parser
+# Module-level names kept for existing `from ..chains import xxx_chain` imports.
+_CHAIN_ALIASES = {
+    "translation_chain": "translation",
+    "fibonacci_chain": "fibonacci",
+    "code_check_full_chain": "code_check_full",
+    "code_check_small_chain": "code_check_small",
+}
 
-# Build fibonacci chain
-fibonacci_chain = fibonacci_prompt | build_chat_model() | default_parser
 
-# Build code check full chain
-code_check_full_chain = code_check_full_prompt | build_chat_model() | default_parser
+def __getattr__(name: str):
+    if name in _CHAIN_ALIASES:
+        return get_chain(_CHAIN_ALIASES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Build code check small chain
-code_check_small_chain = code_check_small_prompt | build_chat_model() | default_parser
 
 __all__ = [
+    "register_chain",
+    "get_chain",
+    "list_chains",
+    "built_chains",
+    "build_code_check_chain",
     "translation_chain", 
     "fibonacci_chain",
     "code_check_full_chain",
     "code_check_small_chain"
-]
\ No newline at end of file
+]
@@ -0,0 +1,370 @@
+"""
+Structured findings: decode model JSON output into `CheckResult` objects.
+
+Checks that ask for JSON findings get objects of the form
+
+    {"rule": ..., "severity": "error|warning|info", "line": 12,
+     "end_line": 14, "message": ..., "suggestion": ...}
+
+either as a bare array or wrapped as `{"findings": [...]}`.
+`FindingsStreamDecoder` pulls each finding object out of the stream as soon
+as its closing brace arrives, so a stream yields findings one by one and
+one broken item never costs the others. Items that do not decode are
+repaired locally (trailing commas, smart quotes, unquoted keys, truncation,
+...) and, failing that, reported as `MALFORMED_RULE` results that
+`arepair_findings` re-asks the model about, item by item.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
+
+from langchain_core.messages import BaseMessage
+from langchain_core.output_parsers import BaseTransformOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+from ..findings import CheckResult, CheckSeverity
+from .models import build_chat_model
+from .parsers import default_parser
+
+MALFORMED_RULE = "Malformed Finding"
+
+SEVERITIES = {
+    "error": CheckSeverity.ERROR,
+    "错误": CheckSeverity.ERROR,
+    "严重": CheckSeverity.ERROR,
+    "warning": CheckSeverity.WARNING,
+    "warn": CheckSeverity.WARNING,
+    "警告": CheckSeverity.WARNING,
+    "info": CheckSeverity.INFO,
+    "提示": CheckSeverity.INFO,
+    "建议": CheckSeverity.INFO,
+}
+
+LINE_SPAN_RE = re.compile(r"(\d+)(?:\s*[-~～至到]\s*(\d+))?")
+TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+MISSING_COMMA_RE = re.compile(r'("|\d|true|false|null)(\s+")')
+UNQUOTED_KEY_RE = re.compile(r"([{,]\s*)([A-Za-z_]\w*)\s*:")
+PY_LITERALS = [(re.compile(r"\bNone\b"), "null"), (re.compile(r"\bTrue\b"), "true"), (re.compile(r"\bFalse\b"), "false")]
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+class FindingsStreamDecoder:
+    """
+    Incrementally extract finding objects from streamed text.
+
+    A finding is an object that is an element of an array, or a top-level
+    object without an array value (so a `{"findings": [...]}` wrapper
+    yields its elements, and `{"findings": []}` yields none). Text outside
+    JSON, such as a markdown fence, is skipped.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        # (bracket, start offset, is a finding candidate, contains findings)
+        self._stack: List[List[Any]] = []
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[str]:
+        """Consume a piece of the stream and return the raw findings it completes."""
+
+        self._text += text
+        items: List[str] = []
+        text = self._text
+        pos = self._pos
+        while pos < len(text):
+            char = text[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"' and self._stack:
+                self._in_string = True
+            elif char in "{[":
+                candidate = char == "{" and (not self._stack or self._stack[-1][0] == "[")
+                if char == "[" and len(self._stack) == 1:
+                    # A top-level object holding an array is a wrapper, even an empty one
+                    self._stack[0][3] = True
+                self._stack.append([char, pos, candidate, False])
+            elif char in "}]" and self._stack:
+                bracket, start, candidate, has_findings = self._stack.pop()
+                if candidate and not has_findings:
+                    items.append(text[start:pos + 1])
+                    for entry in self._stack:
+                        entry[3] = True
+                if not self._stack:
+                    text = text[pos + 1:]
+                    pos = -1
+            pos += 1
+        self._text = text
+        self._pos = pos
+        return items
+
+    def close(self) -> List[str]:
+        """Return the unfinished finding of a truncated stream, if any."""
+
+        for depth in range(len(self._stack) - 1, -1, -1):
+            bracket, start, candidate, has_findings = self._stack[depth]
+            if candidate and not has_findings:
+                # An open array below it means this is a wrapper, not a finding
+                if any(entry[0] == "[" for entry in self._stack[depth + 1:]):
+                    return []
+                return [self._text[start:]]
+        return []
+
+
+def repair_json(text: str) -> Optional[Any]:
+    """Try increasingly lenient fixes of a JSON object; None if none works."""
+
+    def attempt(candidate: str) -> Optional[Any]:
+        try:
+            return json.loads(candidate, strict=False)
+        except json.JSONDecodeError:
+            return None
+
+    candidate = text.strip().translate(SMART_QUOTES)
+    steps = [
+        lambda s: s.replace("'", '"') if '"' not in s else s,
+        lambda s: TRAILING_COMMA_RE.sub(r"\1", s),
+        lambda s: MISSING_COMMA_RE.sub(r'\1, \2', s),
+        lambda s: UNQUOTED_KEY_RE.sub(r'\1"\2":', s),
+        _replace_literals,
+        _close_truncated,
+    ]
+    value = attempt(candidate)
+    for step in steps:
+        if value is not None:
+            break
+        candidate = step(candidate)
+        value = attempt(candidate)
+    return value
+
+
+def _replace_literals(text: str) -> str:
+    for pattern, literal in PY_LITERALS:
+        text = pattern.sub(literal, text)
+    return text
+
+
+def _close_truncated(text: str) -> str:
+    """Close the strings and brackets a truncated object left open."""
+
+    stack: List[str] = []
+    in_string = escape = False
+    for char in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    text = re.sub(r'[,:]\s*$', "", text.rstrip())
+    text = re.sub(r',\s*"[^"]*"$', "", text)
+    return TRAILING_COMMA_RE.sub(r"\1", text + "".join(reversed(stack)))
+
+
+def _line_span(item: Dict[str, Any]) -> Tuple[Optional[int], Optional[int]]:
+    line = item.get("line", item.get("line_number", item.get("start_line")))
+    end_line = item.get("end_line", item.get("end_line_number"))
+    if isinstance(line, (list, tuple)) and line:
+        line, end_line = line[0], line[-1] if end_line is None else end_line
+    if isinstance(line, str):
+        match = LINE_SPAN_RE.search(line)
+        line = int(match.group(1)) if match else None
+        if match and match.group(2) and end_line is None:
+            end_line = int(match.group(2))
+    if isinstance(end_line, str):
+        match = LINE_SPAN_RE.search(end_line)
+        end_line = int(match.group(1)) if match else None
+    line = int(line) if isinstance(line, (int, float)) else None
+    end_line = int(end_line) if isinstance(end_line, (int, float)) else None
+    return line, end_line
+
+
+def finding_to_result(item: Any, default_rule: str = "Code Check") -> CheckResult:
+    """
+    Convert a decoded finding into a `CheckResult`.
+
+    Raises:
+        ValueError: If the item is not an object or has no message
+    """
+
+    if not isinstance(item, dict):
+        raise ValueError(f"Finding is not an object: {item!r}")
+    message = item.get("message") or item.get("description") or item.get("问题")
+    if not message:
+        raise ValueError(f"Finding has no message: {item!r}")
+    line, end_line = _line_span(item)
+    severity = SEVERITIES.get(str(item.get("severity", "warning")).strip().lower(), CheckSeverity.WARNING)
+    return CheckResult(
+        rule_name=str(item.get("rule") or default_rule),
+        severity=severity,
+        message=str(message),
+        line_number=line,
+        end_line_number=end_line,
+        suggestion=item.get("suggestion") or None,
+        context=item.get("code") or None,
+    )
+
+
+def malformed_result(raw: str, reason: str) -> CheckResult:
+    """Report a finding that could not be decoded, keeping its raw text for repair."""
+
+    return CheckResult(
+        rule_name=MALFORMED_RULE,
+        severity=CheckSeverity.INFO,
+        message=f"Could not decode a finding: {reason}",
+        context=raw,
+    )
+
+
+def decode_finding(raw: str, default_rule: str = "Code Check") -> CheckResult:
+    """Decode one raw finding object, repairing it locally if needed."""
+
+    try:
+        item = json.loads(raw, strict=False)
+    except json.JSONDecodeError:
+        item = repair_json(raw)
+        if item is None:
+            return malformed_result(raw, "invalid JSON")
+    try:
+        return finding_to_result(item, default_rule)
+    except ValueError as exc:
+        return malformed_result(raw, str(exc))
+
+
+def parse_findings(text: str, default_rule: str = "Code Check") -> List[CheckResult]:
+    """Decode every finding of a complete response."""
+
+    decoder = FindingsStreamDecoder()
+    raws = decoder.feed(text) + decoder.close()
+    return [decode_finding(raw, default_rule) for raw in raws]
+
+
+def _text_of(chunk: Union[str, BaseMessage]) -> str:
+    if isinstance(chunk, BaseMessage):
+        return chunk.content if isinstance(chunk.content, str) else str(chunk.content)
+    return chunk
+
+
+class FindingsOutputParser(BaseTransformOutputParser[List[CheckResult]]):
+    """
+    Parse JSON findings into `CheckResult` objects.
+
+    `invoke` returns the list of findings; `stream` yields each finding as
+    soon as its object is complete.
+    """
+
+    default_rule: str = "Code Check"
+
+    @property
+    def _type(self) -> str:
+        return "findings_output_parser"
+
+    def parse(self, text: str) -> List[CheckResult]:
+        return parse_findings(text, self.default_rule)
+
+    def _transform(self, input: Iterator[Union[str, BaseMessage]]) -> Iterator[CheckResult]:
+        decoder = FindingsStreamDecoder()
+        for chunk in input:
+            for raw in decoder.feed(_text_of(chunk)):
+                yield decode_finding(raw, self.default_rule)
+        for raw in decoder.close():
+            yield decode_finding(raw, self.default_rule)
+
+    async def _atransform(self, input: AsyncIterator[Union[str, BaseMessage]]) -> AsyncIterator[CheckResult]:
+        decoder = FindingsStreamDecoder()
+        async for chunk in input:
+            for raw in decoder.feed(_text_of(chunk)):
+                yield decode_finding(raw, self.default_rule)
+        for raw in decoder.close():
+            yield decode_finding(raw, self.default_rule)
+
+
+findings_parser = FindingsOutputParser()
+
+
+REPAIR_PROMPT = ChatPromptTemplate.from_messages([
+    (
+        "system",
+        "把用户给出的内容修正为一个合法的 JSON 对象，字段为 rule、severity（error、warning 或 info）、"
+        "line、end_line、message、suggestion。保留原有含义，只输出 JSON 对象。",
+    ),
+    ("user", "{item}"),
+])
+
+
+def build_repair_chain() -> Runnable:
+    """Return the chain that asks the model to fix a single malformed finding."""
+
+    return REPAIR_PROMPT | build_chat_model() | default_parser
+
+
+def _needs_repair(result: CheckResult) -> bool:
+    return result.rule_name == MALFORMED_RULE and bool(result.context)
+
+
+def repair_findings(results: List[CheckResult], default_rule: str = "Code Check") -> List[CheckResult]:
+    """Re-ask the model about malformed findings only; the rest are kept as is."""
+
+    pending = [index for index, result in enumerate(results) if _needs_repair(result)]
+    if not pending:
+        return results
+    outputs = build_repair_chain().batch(
+        [{"item": results[index].context} for index in pending], return_exceptions=True
+    )
+    return _merge_repairs(results, pending, outputs, default_rule)
+
+
+async def arepair_findings(results: List[CheckResult], default_rule: str = "Code Check") -> List[CheckResult]:
+    """Async variant of `repair_findings`."""
+
+    pending = [index for index, result in enumerate(results) if _needs_repair(result)]
+    if not pending:
+        return results
+    outputs = await build_repair_chain().abatch(
+        [{"item": results[index].context} for index in pending], return_exceptions=True
+    )
+    return _merge_repairs(results, pending, outputs, default_rule)
+
+
+def _merge_repairs(results: List[CheckResult], pending: List[int], outputs: list, default_rule: str) -> List[CheckResult]:
+    repaired = list(results)
+    for index, output in zip(pending, outputs):
+        if isinstance(output, Exception):
+            continue
+        fixed = parse_findings(output, default_rule)
+        if len(fixed) == 1 and not _needs_repair(fixed[0]):
+            repaired[index] = fixed[0]
+    return repaired
+
+
+__all__ = [
+    "MALFORMED_RULE",
+    "FindingsStreamDecoder",
+    "FindingsOutputParser",
+    "findings_parser",
+    "repair_json",
+    "finding_to_result",
+    "decode_finding",
+    "parse_findings",
+    "repair_findings",
+    "arepair_findings",
+]
@@ -0,0 +1,34 @@
+"""Invoke-time inputs of the code check chains."""
+
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+from ..prompt_template import detect_file_kind
+
+NO_DOCS = "（无）"
+
+
+class CodeCheckInput(BaseModel):
+    """Input of the `code_check_full` and `code_check_small` chains."""
+
+    code: str = Field(description="Go source to check.")
+    file_kind: Optional[str] = Field(
+        default=None,
+        description='Rule book kind, "resource" or "data_source"; detected from the code if omitted.',
+    )
+    docs: Optional[str] = Field(default=None, description="Documentation of the resource, if any.")
+
+
+def prepare_code_check_input(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the file kind and docs placeholder of a code check input."""
+
+    code = inputs["code"]
+    return {
+        "code": code,
+        "file_kind": inputs.get("file_kind") or detect_file_kind(code),
+        "docs": inputs.get("docs") or NO_DOCS,
+    }
+
+
+__all__ = ["CodeCheckInput", "prepare_code_check_input"]
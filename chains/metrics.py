@@ -0,0 +1,417 @@
+"""
+Process-wide latency, token and cache metrics.
+
+Registered chains carry `metrics_handler` as a callback (see `instrument`),
+which records per chain: requests, errors and end-to-end latency, and per
+chain and model: upstream calls, time to first token (streamed calls),
+call latency, prompt / completion tokens and response-cache hits. The
+router adds HTTP request metrics. Comparing chain latency with model
+latency and prompt tokens tells slow upstream calls from big prompts and
+from our own overhead.
+
+`metrics_registry.render()` returns the Prometheus text format served at
+`/metrics`; `metrics_registry.summary()` returns the same numbers as JSON
+for CLI runs. Updates are a dict lookup and a few additions under a lock;
+CODE_CHECKER_METRICS=0 leaves chains uninstrumented.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import Runnable
+
+from ..config import settings
+from .cache import get_response_cache
+from .ratelimit import rate_limiter_snapshots
+from .routing import routing_stats
+
+# Metadata key naming the registered chain a run belongs to; inherited by
+# every nested run (prompt, model, parser).
+CHAIN_KEY = "code_checker_chain"
+OTHER_CHAIN = "other"
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0, 60.0, 120.0, 300.0)
+TTFT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+PREFIX = "code_checker_"
+
+# name -> (type, help, histogram buckets)
+METRICS: Dict[str, Tuple[str, str, Optional[Tuple[float, ...]]]] = {
+    "chain_requests_total": ("counter", "Chain invocations.", None),
+    "chain_errors_total": ("counter", "Chain invocations that raised.", None),
+    "chain_latency_seconds": ("histogram", "End-to-end chain latency.", LATENCY_BUCKETS),
+    "llm_requests_total": ("counter", "Chat model calls, including cache hits.", None),
+    "llm_errors_total": ("counter", "Chat model calls that raised.", None),
+    "llm_cache_hits_total": ("counter", "Chat model calls answered from the response cache.", None),
+    "llm_prompt_tokens_total": ("counter", "Prompt tokens sent upstream.", None),
+    "llm_completion_tokens_total": ("counter", "Completion tokens received from upstream.", None),
+    "llm_latency_seconds": ("histogram", "Chat model call latency.", LATENCY_BUCKETS),
+    "llm_time_to_first_token_seconds": ("histogram", "Time to the first streamed token.", TTFT_BUCKETS),
+    "http_requests_total": ("counter", "HTTP requests by route and status.", None),
+    "http_request_duration_seconds": ("histogram", "HTTP request duration until the body is sent.", LATENCY_BUCKETS),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout."""
+
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot: +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by interpolating inside its bucket."""
+
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if seen + count >= rank and count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+    def to_dict(self) -> dict:
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4),
+            "p50": round(self.quantile(0.5), 4),
+            "p95": round(self.quantile(0.95), 4),
+        }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by metric name and labels."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = defaultdict(dict)
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = defaultdict(dict)
+
+    def inc(self, name: str, labels: Labels, value: float = 1) -> None:
+        with self._lock:
+            series = self._counters[name]
+            series[labels] = series.get(labels, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        with self._lock:
+            series = self._histograms[name]
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(METRICS[name][2])
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def _copy(self) -> Tuple[Dict[str, Dict[Labels, float]], Dict[str, Dict[Labels, Histogram]]]:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {}
+            for name, series in self._histograms.items():
+                histograms[name] = {}
+                for labels, histogram in series.items():
+                    copy = histograms[name][labels] = Histogram(histogram.buckets)
+                    copy.counts, copy.total, copy.count = list(histogram.counts), histogram.total, histogram.count
+        return counters, histograms
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+
+        counters, histograms = self._copy()
+        lines: List[str] = []
+        for name, (kind, help_text, _) in METRICS.items():
+            series = counters.get(name) or histograms.get(name)
+            if not series:
+                continue
+            full_name = PREFIX + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for labels, value in sorted(series.items()):
+                if kind == "counter":
+                    lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(value.buckets + (float("inf"),), value.counts):
+                    cumulative += count
+                    le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                    lines.append(f"{full_name}_bucket{_format_labels(labels, le)} {cumulative}")
+                lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(round(value.total, 6))}")
+                lines.append(f"{full_name}_count{_format_labels(labels)} {value.count}")
+        lines.extend(_render_snapshots())
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Return the counters as JSON-friendly dicts.
+
+        `chains` holds per-chain request, error, latency, model latency,
+        time-to-first-token, token and cache-hit figures (models of a chain
+        are added up); `upstream`, `response_cache` and `routing` are the
+        rate limiter, cache and triage snapshots.
+        """
+
+        counters, histograms = self._copy()
+        chains: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        for name, series in counters.items():
+            if name.startswith("http_"):
+                continue
+            key = name[: -len("_total")]
+            for labels, value in series.items():
+                chain = dict(labels).get("chain", OTHER_CHAIN)
+                chains[chain][key] = chains[chain].get(key, 0) + value
+        for name, series in histograms.items():
+            if name.startswith("http_"):
+                continue
+            key = name[: -len("_seconds")]
+            merged: Dict[str, Histogram] = {}
+            for labels, histogram in series.items():
+                chain = dict(labels).get("chain", OTHER_CHAIN)
+                total = merged.setdefault(chain, Histogram(histogram.buckets))
+                total.counts = [a + b for a, b in zip(total.counts, histogram.counts)]
+                total.total += histogram.total
+                total.count += histogram.count
+            for chain, histogram in merged.items():
+                chains[chain][key] = histogram.to_dict()
+
+        cache = get_response_cache()
+        return {
+            "chains": {chain: chains[chain] for chain in sorted(chains)},
+            "upstream": rate_limiter_snapshots(),
+            "response_cache": cache.stats() if cache is not None else None,
+            "routing": routing_stats.snapshot(),
+        }
+
+
+def _render_snapshots() -> List[str]:
+    """Render rate limiter, response cache and routing snapshots as metrics."""
+
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str, samples: List[Tuple[Labels, float]]) -> None:
+        if not samples:
+            return
+        full_name = PREFIX + name
+        lines.append(f"# HELP {full_name} {help_text}")
+        lines.append(f"# TYPE {full_name} {kind}")
+        for labels, value in samples:
+            lines.append(f"{full_name}{_format_labels(labels)} {_format_value(value)}")
+
+    limiters = sorted(rate_limiter_snapshots().items())
+    for key, kind, help_text in (
+        ("requests", "counter", "Upstream requests sent, including retries."),
+        ("retries", "counter", "Upstream requests retried after a failure."),
+        ("rate_limited", "counter", "Upstream requests rejected with HTTP 429."),
+        ("errors", "counter", "Upstream requests that failed."),
+        ("concurrency_limit", "gauge", "Current adaptive concurrency limit."),
+        ("in_flight", "gauge", "Upstream requests in flight."),
+    ):
+        name = f"upstream_{key}_total" if kind == "counter" else f"upstream_{key}"
+        family(name, kind, help_text, [((("model", model),), snapshot[key]) for model, snapshot in limiters])
+
+    cache = get_response_cache()
+    if cache is not None:
+        stats = cache.stats()
+        family("response_cache_hits_total", "counter", "Response cache hits.", [((), stats["hits"])])
+        family("response_cache_misses_total", "counter", "Response cache misses.", [((), stats["misses"])])
+        family("response_cache_evictions_total", "counter", "Response cache evictions.", [((), stats["evictions"])])
+        family("response_cache_entries", "gauge", "Response cache entries.", [((), stats["entries"])])
+
+    routing = sorted(routing_stats.snapshot().items())
+    for key in ("triaged", "escalated"):
+        family(
+            f"routing_{key}_total", "counter", f"Units {key} by tiered routing.",
+            [((("kind", kind),), counts[key]) for kind, counts in routing],
+        )
+    return lines
+
+
+class _Run:
+    __slots__ = ("labels", "started", "first_token")
+
+    def __init__(self, labels: Labels):
+        self.labels = labels
+        self.started = time.perf_counter()
+        self.first_token: Optional[float] = None
+
+
+def _usage(response: LLMResult) -> Tuple[int, int, bool]:
+    """Return `(prompt tokens, completion tokens, cache hit)` of a model response."""
+
+    prompt = completion = 0
+    cached = False
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if not usage:
+                continue
+            # LangChain zeroes `total_cost` on generations replayed from the cache
+            if usage.get("total_cost") == 0:
+                cached = True
+                continue
+            prompt += usage.get("input_tokens") or 0
+            completion += usage.get("output_tokens") or 0
+    if not prompt and not completion and not cached:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt = usage.get("prompt_tokens") or 0
+        completion = usage.get("completion_tokens") or 0
+    return prompt, completion, cached
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Record chain and chat model timings, tokens and errors in a registry.
+
+    Only the outermost run of a registered chain (the one named after it,
+    or a root run) counts as a chain request; nested prompt / parser runs
+    are ignored.
+    Run inline so async chains do not hop to a thread per event.
+    """
+
+    run_inline = True
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self._runs: Dict[UUID, _Run] = {}
+
+    def on_chain_start(
+        self,
+        serialized,
+        inputs,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata=None,
+        **kwargs: Any,
+    ) -> None:
+        chain = (metadata or {}).get(CHAIN_KEY)
+        # LangServe renames the outermost run after its path
+        if chain is not None and (parent_run_id is None or kwargs.get("name") == chain):
+            self._runs[run_id] = _Run((("chain", chain),))
+
+    def _end_chain(self, run_id: UUID, error: bool) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        self.registry.inc("chain_requests_total", run.labels)
+        if error:
+            self.registry.inc("chain_errors_total", run.labels)
+        self.registry.observe("chain_latency_seconds", run.labels, time.perf_counter() - run.started)
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_chain(run_id, error=False)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end_chain(run_id, error=True)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        metadata = metadata or {}
+        self._runs[run_id] = _Run((
+            ("chain", metadata.get(CHAIN_KEY, OTHER_CHAIN)),
+            ("model", str(metadata.get("ls_model_name", ""))),
+        ))
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.get(run_id)
+        if run is not None and run.first_token is None:
+            run.first_token = time.perf_counter()
+            self.registry.observe("llm_time_to_first_token_seconds", run.labels, run.first_token - run.started)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        prompt, completion, cached = _usage(response)
+        self.registry.inc("llm_requests_total", run.labels)
+        if cached:
+            self.registry.inc("llm_cache_hits_total", run.labels)
+        else:
+            self.registry.observe("llm_latency_seconds", run.labels, time.perf_counter() - run.started)
+        if prompt:
+            self.registry.inc("llm_prompt_tokens_total", run.labels, prompt)
+        if completion:
+            self.registry.inc("llm_completion_tokens_total", run.labels, completion)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._runs.pop(run_id, None)
+        if run is None:
+            return
+        self.registry.inc("llm_requests_total", run.labels)
+        self.registry.inc("llm_errors_total", run.labels)
+        self.registry.observe("llm_latency_seconds", run.labels, time.perf_counter() - run.started)
+
+
+metrics_registry = MetricsRegistry()
+metrics_handler = MetricsCallbackHandler(metrics_registry)
+
+
+def write_summary(path: Path) -> None:
+    """Write `metrics_registry.summary()` as JSON, e.g. at the end of a CLI run."""
+
+    Path(path).write_text(
+        json.dumps(metrics_registry.summary(), ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+
+
+def instrument(name: str, chain: Runnable) -> Runnable:
+    """Attach `metrics_handler` to a registered chain, tagging its runs with `name`."""
+
+    if not settings.metrics:
+        return chain
+    return chain.with_config(run_name=name, metadata={CHAIN_KEY: name}, callbacks=[metrics_handler])
+
+
+__all__ = [
+    "CHAIN_KEY",
+    "Histogram",
+    "MetricsRegistry",
+    "MetricsCallbackHandler",
+    "metrics_registry",
+    "metrics_handler",
+    "instrument",
+    "write_summary",
+]
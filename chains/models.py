@@ -1,32 +1,225 @@
 """Model factory for LangChain examples."""
 
-from typing import Optional
+import asyncio
+import atexit
+import importlib.util
+import threading
+from typing import Awaitable, Dict, Optional, Tuple, TypeVar
 
+import httpx
 from langchain_openai import ChatOpenAI
 
 from ..config import settings, ensure_api_key
+from .cache import get_response_cache
+from .ratelimit import RateLimitedChatOpenAI, get_rate_limiter
+
+ModelKey = Tuple[str, str, float]
+T = TypeVar("T")
+
+# Process-wide caches: one ChatOpenAI per (base_url, model, temperature), and
+# one pair of pooled HTTP clients per base_url shared by all of those models.
+_models: Dict[ModelKey, ChatOpenAI] = {}
+_http_clients: Dict[str, Tuple[httpx.Client, httpx.AsyncClient]] = {}
+_lock = threading.Lock()
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 needs the optional `h2` package (installed by `httpx[http2]`)."""
+
+    return settings.http2 and importlib.util.find_spec("h2") is not None
+
+
+class LoopLocalTransport(httpx.AsyncBaseTransport):
+    """
+    Async transport keeping one connection pool per event loop.
+
+    Pooled connections belong to the loop that opened them, while models
+    (and their async client) are shared process-wide and CLI entry points
+    start a new loop per `asyncio.run`. Pools of finished loops are closed
+    by `aclose_loop_connections`, or dropped once another loop needs one.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._pools: Dict[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                # Pools of loops closed without `aclose_loop_connections` can
+                # no longer be closed cleanly; drop them so their sockets go
+                for closed in [other for other in self._pools if other.is_closed()]:
+                    del self._pools[closed]
+                pool = self._pools[loop] = httpx.AsyncHTTPTransport(**self._kwargs)
+        return pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool().handle_async_request(request)
+
+    async def aclose_current(self) -> None:
+        """Close the pool of the running loop; the transport stays usable."""
+
+        with self._lock:
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.aclose()
+
+    async def aclose(self) -> None:
+        await self.aclose_current()
+        with self._lock:
+            self._pools.clear()
+
+
+def _get_http_clients(base_url: str) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    """Return the keep-alive HTTP clients for `base_url`. Caller holds `_lock`."""
+
+    clients = _http_clients.get(base_url)
+    if clients is None:
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        )
+        http2 = _http2_enabled()
+        clients = (
+            httpx.Client(http2=http2, limits=limits),
+            httpx.AsyncClient(transport=LoopLocalTransport(http2=http2, limits=limits)),
+        )
+        _http_clients[base_url] = clients
+    return clients
 
 
 def build_chat_model(
     temperature: Optional[float] = None,
+    model: Optional[str] = None,
 ) -> ChatOpenAI:
     """
-    Construct a ChatOpenAI client with sensible defaults.
+    Return a shared ChatOpenAI client with sensible defaults.
+
+    Clients are cached per (base_url, model, temperature) and all clients for
+    the same base url share one pooled HTTP/2 connection pool (one per event
+    loop for async calls), so repeated calls reuse warm connections instead
+    of paying TLS setup again.
+    Responses are served from the persistent cache in `chains.cache`
+    (default ~/.cache/code_checker/llm_cache.sqlite3) when it is enabled;
+    models with a temperature above 0 skip it unless opted in. Upstream calls share the model's `RateLimiter`
+    (`chains.ratelimit`), which paces, bounds and retries them.
 
     Environment variables:
-        QWEN_BASE_URL:      overrides default base url.
-        QWEN_API_KEY:       required for authentication.
-        QWEN_MODEL:         overrides default model name.
-        QWEN_TEMPERATURE:   overrides default temperature.
+        QWEN_BASE_URL:                  overrides default base url.
+        QWEN_API_KEY:                   required for authentication.
+        QWEN_MODEL:                     default model when `model` is None.
+        QWEN_TEMPERATURE:               overrides default temperature.
+        CODE_CHECKER_LLM_CACHE:         response cache path ("" disables).
+        CODE_CHECKER_LLM_CACHE_SAMPLED: caches models with temperature > 0.
+        QWEN_HTTP2:                     enables HTTP/2 when `h2` is installed.
+        QWEN_HTTP_MAX_CONNECTIONS:      overrides connection pool size.
+        QWEN_HTTP_MAX_KEEPALIVE:        overrides idle connections kept alive.
+        QWEN_HTTP_KEEPALIVE_EXPIRY:     overrides idle connection lifetime (s).
+        QWEN_RATE_LIMIT_RPM:            requests per minute (0: unlimited).
+        QWEN_RATE_LIMIT_TPM:            tokens per minute (0: unlimited).
+        QWEN_CONCURRENCY_INITIAL:       starting adaptive concurrency limit.
+        QWEN_CONCURRENCY_MAX:           upper bound of the concurrency limit.
+        QWEN_MAX_RETRIES:               retries of throttled / failed calls.
+        QWEN_RETRY_BACKOFF:             base backoff interval (s).
+        QWEN_RETRY_BACKOFF_MAX:         longest backoff interval (s).
     """
 
     ensure_api_key()
-    return ChatOpenAI(
-        base_url=settings.base_url,
-        api_key=settings.api_key,
-        model=settings.model,
-        temperature=temperature if temperature is not None else settings.temperature,
-    )
+    temperature = temperature if temperature is not None else settings.temperature
+    model_name = model or settings.model
+    key: ModelKey = (settings.base_url, model_name, float(temperature))
+
+    with _lock:
+        chat_model = _models.get(key)
+        if chat_model is None:
+            http_client, http_async_client = _get_http_clients(settings.base_url)
+            chat_model = RateLimitedChatOpenAI(
+                base_url=settings.base_url,
+                api_key=settings.api_key,
+                model=model_name,
+                temperature=temperature,
+                http_client=http_client,
+                http_async_client=http_async_client,
+                cache=get_response_cache(temperature),
+                # Retries are coordinated by the limiter, not per client
+                max_retries=0,
+                limiter=get_rate_limiter(model_name),
+                retry_attempts=settings.max_retries,
+            )
+            _models[key] = chat_model
+    return chat_model
+
+
+def close_chat_models() -> None:
+    """
+    Close the pooled HTTP clients and forget all cached models.
+
+    Intended for process shutdown; chains built before this call keep
+    references to the closed clients and must not be used afterwards.
+    """
+
+    with _lock:
+        clients = list(_http_clients.values())
+        _http_clients.clear()
+        _models.clear()
+    for http_client, _ in clients:
+        http_client.close()
+
+
+async def aclose_chat_models() -> None:
+    """Async variant of `close_chat_models` that also closes async pools."""
+
+    with _lock:
+        clients = list(_http_clients.values())
+        _http_clients.clear()
+        _models.clear()
+    for http_client, http_async_client in clients:
+        http_client.close()
+        await http_async_client.aclose()
+
+
+async def aclose_loop_connections() -> None:
+    """
+    Close the async connections the running loop opened; models stay usable.
+
+    Call before a loop started for one run ends (see `run_async`); the next
+    loop opens fresh connections.
+    """
+
+    with _lock:
+        clients = list(_http_clients.values())
+    for _, http_async_client in clients:
+        transport = getattr(http_async_client, "_transport", None)
+        if isinstance(transport, LoopLocalTransport):
+            await transport.aclose_current()
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """`asyncio.run` that closes the loop's pooled model connections before the loop ends."""
+
+    async def _run() -> T:
+        try:
+            return await coro
+        finally:
+            await aclose_loop_connections()
+
+    return asyncio.run(_run())
+
+
+# Async pools are closed per loop (`run_async`) or by `aclose_chat_models`
+# from the server lifespan; no loop is left to close them at exit.
+atexit.register(close_chat_models)
 
 
-__all__ = ["build_chat_model"]
\ No newline at end of file
+__all__ = [
+    "LoopLocalTransport",
+    "build_chat_model",
+    "close_chat_models",
+    "aclose_chat_models",
+    "aclose_loop_connections",
+    "run_async",
+]
@@ -1,14 +1,28 @@
 """Prompt templates for LCEL chains."""
 
+from .. import prompt_template
 from ..prompt_template import \
     translation_prompt, \
-    fibonacci_prompt, \
-    code_check_full_prompt, \
-    code_check_small_prompt
+    get_fibonacci_prompt, \
+    get_code_check_full_prompt, \
+    get_code_check_small_prompt, \
+    get_code_check_chunk_prompt, \
+    get_code_check_triage_prompt
+
+
+def __getattr__(name: str):
+    # Lazily built prompts are resolved by the prompt_template package.
+    return getattr(prompt_template, name)
+
 
 __all__ = [
     "translation_prompt",
+    "get_fibonacci_prompt",
+    "get_code_check_full_prompt",
+    "get_code_check_small_prompt",
+    "get_code_check_chunk_prompt",
+    "get_code_check_triage_prompt",
     "fibonacci_prompt", 
     "code_check_full_prompt",
     "code_check_small_prompt",
-]
\ No newline at end of file
+]
@@ -0,0 +1,531 @@
+"""
+Client-side rate limiting and adaptive concurrency for the chat endpoint.
+
+All chat models of one model name share a `RateLimiter` holding:
+
+- token buckets for requests per minute and tokens per minute; requests
+  reserve their estimated prompt tokens and settle the difference with the
+  reported usage when they finish
+- an AIMD concurrency limit: it grows by 1/limit per success, halves on
+  HTTP 429 and shrinks slightly when latency per token climbs well above
+  its running baseline
+- a shared pause: a 429 (honouring `Retry-After`) holds back every caller
+  instead of letting each retry on its own
+
+`RateLimitedChatOpenAI` acquires the limiter around every upstream call and
+retries rate-limit, timeout, connection and 5xx errors with jittered
+exponential backoff. Streams are only retried before their first chunk.
+Cache hits never reach the model, so they consume no budget.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+import openai
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+from pydantic import Field
+
+from ..config import settings
+from .budget import count_message_tokens
+
+# Bucket capacity in seconds of refill: bursts above this are smoothed out.
+BURST_SECONDS = 10
+
+# AIMD tuning
+DECREASE_FACTOR = 0.5          # on HTTP 429
+LATENCY_DECREASE_FACTOR = 0.9  # when latency per token exceeds the tolerance
+LATENCY_TOLERANCE = 2.0        # multiple of the baseline latency per token
+BASELINE_ALPHA = 0.05          # weight of a new sample in the baseline
+DECREASE_COOLDOWN = 2.0        # seconds; failures closer together count once
+
+RETRYABLE_STATUS = {408, 409, 429}
+
+
+class TokenBucket:
+    """A bucket refilled continuously at `per_minute / 60` per second."""
+
+    def __init__(self, per_minute: float, burst_seconds: float = BURST_SECONDS):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take `amount` and return the seconds to wait before using it.
+
+        The bucket may go into debt, so concurrent callers queue up behind
+        each other in reservation order instead of polling.
+        """
+
+        with self._lock:
+            self._refill()
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Take (or, if negative, give back) `amount` after the fact."""
+
+        with self._lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class _Waiter:
+    """A caller waiting for a concurrency slot, woken from any thread."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.event = threading.Event() if loop is None else None
+        self.future = loop.create_future() if loop is not None else None
+        self.granted = False
+
+    def grant(self) -> bool:
+        """Hand a slot to the waiter; False if it gave up waiting."""
+
+        if self.future is not None:
+            if self.future.done():
+                return False
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+        else:
+            self.event.set()
+        self.granted = True
+        return True
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveConcurrency:
+    """An AIMD concurrency limit shared by sync and async callers."""
+
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = 16):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self._last_decrease = 0.0
+        self._waiters: Deque[_Waiter] = deque()
+        self._lock = threading.Lock()
+
+    def _try_take(self, waiter: Optional[_Waiter] = None) -> bool:
+        # Caller holds `_lock`
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        if waiter is not None:
+            self._waiters.append(waiter)
+        return False
+
+    def _wake(self) -> None:
+        # Caller holds `_lock`
+        while self._waiters and self.in_flight < int(self.limit):
+            if self._waiters.popleft().grant():
+                self.in_flight += 1
+
+    def acquire(self) -> None:
+        waiter = _Waiter()
+        with self._lock:
+            if self._try_take(waiter):
+                return
+        waiter.event.wait()
+
+    async def aacquire(self) -> None:
+        waiter = _Waiter(asyncio.get_running_loop())
+        with self._lock:
+            if self._try_take(waiter):
+                return
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter.granted:
+                    self.in_flight -= 1
+                    self._wake()
+                elif waiter in self._waiters:
+                    # `_wake` may already have popped it and skipped it
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def _decrease(self, factor: float) -> None:
+        # Caller holds `_lock`
+        now = time.monotonic()
+        if now - self._last_decrease < DECREASE_COOLDOWN:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * factor)
+
+    def on_success(self, latency: float, tokens: int) -> None:
+        """Grow the limit additively, or shrink it when latency per token climbs."""
+
+        sample = latency / max(tokens, 1)
+        with self._lock:
+            if self.baseline is None:
+                self.baseline = sample
+            if sample > self.baseline * LATENCY_TOLERANCE:
+                self._decrease(LATENCY_DECREASE_FACTOR)
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self.baseline += BASELINE_ALPHA * (sample - self.baseline)
+            self._wake()
+
+    def on_rate_limited(self) -> None:
+        with self._lock:
+            self._decrease(DECREASE_FACTOR)
+
+
+class RateLimiter:
+    """Request and token buckets, adaptive concurrency and a shared pause."""
+
+    def __init__(
+        self,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        initial_concurrency: int = 4,
+        max_concurrency: int = 16,
+    ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, maximum=max_concurrency)
+        self.paused_until = 0.0
+        self.stats: Dict[str, int] = {"requests": 0, "retries": 0, "rate_limited": 0, "errors": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _bucket_delay(self, tokens: int) -> float:
+        delay = 0.0
+        if self.requests is not None:
+            delay = max(delay, self.requests.reserve(1))
+        if self.tokens is not None:
+            delay = max(delay, self.tokens.reserve(tokens))
+        return delay
+
+    def _pause_left(self) -> float:
+        return self.paused_until - time.monotonic()
+
+    def acquire(self, tokens: int) -> None:
+        """Block until a request of about `tokens` prompt tokens may be sent."""
+
+        self.concurrency.acquire()
+        try:
+            while self._pause_left() > 0:
+                time.sleep(self._pause_left())
+            time.sleep(self._bucket_delay(tokens))
+        except BaseException:
+            self.concurrency.release()
+            raise
+        self._count("requests")
+
+    async def aacquire(self, tokens: int) -> None:
+        """Async variant of `acquire`."""
+
+        await self.concurrency.aacquire()
+        try:
+            while self._pause_left() > 0:
+                await asyncio.sleep(self._pause_left())
+            await asyncio.sleep(self._bucket_delay(tokens))
+        except BaseException:
+            self.concurrency.release()
+            raise
+        self._count("requests")
+
+    def release(
+        self,
+        estimated: int,
+        used: Optional[int] = None,
+        latency: Optional[float] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """
+        Return the concurrency slot of a finished request.
+
+        Args:
+            estimated: Tokens reserved by `acquire`
+            used: Total tokens reported by the endpoint, if any
+            latency: Seconds the request took, when it succeeded
+            error: The exception the request failed with, if any
+        """
+
+        if used is not None and self.tokens is not None:
+            self.tokens.adjust(used - estimated)
+        if isinstance(error, openai.RateLimitError):
+            self._count("rate_limited")
+            self.concurrency.on_rate_limited()
+        elif error is not None:
+            self._count("errors")
+        elif latency is not None:
+            self.concurrency.on_success(latency, used or estimated)
+        self.concurrency.release()
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller for `seconds`."""
+
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current limit, load and counters."""
+
+        return {
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+            "paused_for": max(0.0, round(self._pause_left(), 2)),
+            **self.stats,
+        }
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Return the delay requested by a `Retry-After(-Ms)` response header, if any."""
+
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(0.0, float(value) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Rate limits, timeouts, dropped connections and server errors are retried."""
+
+    if isinstance(exc, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code in RETRYABLE_STATUS or exc.status_code >= 500
+    return False
+
+
+def backoff_delay(attempt: int, requested: Optional[float] = None) -> float:
+    """
+    Return the wait before retry number `attempt` (from 0).
+
+    Uses equal jitter over an exponential backoff, or the server's
+    `Retry-After` plus up to one base interval of jitter.
+    """
+
+    base = settings.retry_backoff
+    if requested is not None:
+        return requested + random.uniform(0, base)
+    ceiling = min(settings.retry_backoff_max, base * 2 ** attempt)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(model: Optional[str] = None) -> RateLimiter:
+    """Return the process-wide limiter for a model name (default: `settings.model`)."""
+
+    model = model or settings.model
+    with _limiters_lock:
+        limiter = _limiters.get(model)
+        if limiter is None:
+            limiter = RateLimiter(
+                requests_per_minute=settings.rate_limit_rpm,
+                tokens_per_minute=settings.rate_limit_tpm,
+                initial_concurrency=settings.concurrency_initial,
+                max_concurrency=settings.concurrency_max,
+            )
+            _limiters[model] = limiter
+    return limiter
+
+
+def rate_limiter_snapshots() -> Dict[str, Dict[str, Any]]:
+    """Return the `RateLimiter.snapshot()` of every model's limiter."""
+
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {model: limiter.snapshot() for model, limiter in limiters.items()}
+
+
+def _result_tokens(result: ChatResult) -> Optional[int]:
+    usage = (result.llm_output or {}).get("token_usage") or {}
+    if usage.get("total_tokens") is not None:
+        return usage["total_tokens"]
+    for generation in result.generations:
+        metadata = getattr(generation.message, "usage_metadata", None)
+        if metadata:
+            return metadata.get("total_tokens")
+    return None
+
+
+def _chunk_tokens(chunk: ChatGenerationChunk) -> Optional[int]:
+    metadata = getattr(chunk.message, "usage_metadata", None)
+    return metadata.get("total_tokens") if metadata else None
+
+
+class RateLimitedChatOpenAI(ChatOpenAI):
+    """`ChatOpenAI` whose upstream calls go through a shared `RateLimiter`."""
+
+    limiter: Optional[Any] = Field(default=None, exclude=True)
+    retry_attempts: int = Field(default=0, exclude=True)
+
+    def _estimate(self, messages: List[BaseMessage]) -> int:
+        return count_message_tokens(messages)
+
+    def _failed(self, exc: Exception, estimated: int, attempt: int, yielded: bool = False) -> float:
+        """Release a failed request; return the retry delay or re-raise."""
+
+        self.limiter.release(estimated, error=exc)
+        if yielded or attempt >= self.retry_attempts or not is_retryable(exc):
+            raise exc
+        delay = backoff_delay(attempt, retry_after(exc))
+        if isinstance(exc, openai.RateLimitError):
+            self.limiter.pause(delay)
+        self.limiter._count("retries")
+        return delay
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.limiter is None:
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        estimated = self._estimate(messages)
+        attempt = 0
+        while True:
+            self.limiter.acquire(estimated)
+            started = time.monotonic()
+            try:
+                result = super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                time.sleep(self._failed(exc, estimated, attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                self.limiter.release(estimated)
+                raise
+            self.limiter.release(estimated, _result_tokens(result), time.monotonic() - started)
+            return result
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.limiter is None:
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        estimated = self._estimate(messages)
+        attempt = 0
+        while True:
+            await self.limiter.aacquire(estimated)
+            started = time.monotonic()
+            try:
+                result = await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+            except Exception as exc:
+                await asyncio.sleep(self._failed(exc, estimated, attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                self.limiter.release(estimated)
+                raise
+            self.limiter.release(estimated, _result_tokens(result), time.monotonic() - started)
+            return result
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        if self.limiter is None:
+            yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return
+        estimated = self._estimate(messages)
+        attempt = 0
+        while True:
+            self.limiter.acquire(estimated)
+            started = time.monotonic()
+            used: Optional[int] = None
+            yielded = released = completed = False
+            try:
+                for chunk in super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    used = _chunk_tokens(chunk) or used
+                    yielded = True
+                    yield chunk
+                completed = True
+            except Exception as exc:
+                released = True
+                time.sleep(self._failed(exc, estimated, attempt, yielded))
+                attempt += 1
+                continue
+            finally:
+                if not released:
+                    # Completed, or closed early by the consumer
+                    latency = time.monotonic() - started if completed else None
+                    self.limiter.release(estimated, used, latency)
+            return
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs) -> AsyncIterator[ChatGenerationChunk]:
+        if self.limiter is None:
+            async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+        estimated = self._estimate(messages)
+        attempt = 0
+        while True:
+            await self.limiter.aacquire(estimated)
+            started = time.monotonic()
+            used: Optional[int] = None
+            yielded = released = completed = False
+            try:
+                async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+                    used = _chunk_tokens(chunk) or used
+                    yielded = True
+                    yield chunk
+                completed = True
+            except Exception as exc:
+                released = True
+                await asyncio.sleep(self._failed(exc, estimated, attempt, yielded))
+                attempt += 1
+                continue
+            finally:
+                if not released:
+                    # Completed, or closed early by the consumer
+                    latency = time.monotonic() - started if completed else None
+                    self.limiter.release(estimated, used, latency)
+            return
+
+
+__all__ = [
+    "TokenBucket",
+    "AdaptiveConcurrency",
+    "RateLimiter",
+    "RateLimitedChatOpenAI",
+    "get_rate_limiter",
+    "rate_limiter_snapshots",
+    "retry_after",
+    "is_retryable",
+    "backoff_delay",
+]
@@ -0,0 +1,99 @@
+"""
+Tiered model routing.
+
+A cheap triage model screens each unit of work (a Go chunk, a batch of
+markdown lines) with a short yes/no prompt; only flagged units are sent to
+the escalation model with the full rules. Tiers are configured in
+`Settings` (QWEN_TRIAGE_MODEL, QWEN_ESCALATION_MODEL) and routing is
+enabled with CODE_CHECKER_TIERED=1 or per call.
+
+Triage errs on the side of escalating: anything other than a clear "no",
+and any triage failure, sends the unit to the stronger model.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Dict, Optional
+
+from langchain_openai import ChatOpenAI
+
+from ..config import settings
+from .models import build_chat_model
+
+TRIAGE = "triage"
+ESCALATION = "escalation"
+
+NEGATIVE_RE = re.compile(r"^\W*(?:no\b|否|无问题|没有问题|不存在问题)", re.I)
+
+
+def tier_model(tier: str) -> str:
+    """Return the model name of a tier."""
+
+    if tier == TRIAGE:
+        return settings.triage_model
+    if tier == ESCALATION:
+        return settings.escalation_model
+    raise ValueError(f"Unknown model tier: {tier!r}")
+
+
+def build_tier_model(tier: str, temperature: Optional[float] = None) -> ChatOpenAI:
+    """Return the shared chat model of a tier."""
+
+    return build_chat_model(temperature, model=tier_model(tier))
+
+
+def tiered_enabled(tiered: Optional[bool] = None) -> bool:
+    """Resolve a per-call `tiered` flag against CODE_CHECKER_TIERED."""
+
+    return settings.tiered_routing if tiered is None else tiered
+
+
+def parse_triage(response: str) -> bool:
+    """Return True when a triage answer asks for escalation."""
+
+    return NEGATIVE_RE.match(response.strip()) is None
+
+
+class RoutingStats:
+    """Process-wide triage / escalation counters per unit kind."""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, escalated: bool, failed: bool = False) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(kind, {"triaged": 0, "escalated": 0, "triage_failed": 0})
+            counts["triaged"] += 1
+            counts["escalated"] += int(escalated)
+            counts["triage_failed"] += int(failed)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return the counters and escalation rate of every kind."""
+
+        with self._lock:
+            return {
+                kind: {**counts, "escalation_rate": counts["escalated"] / counts["triaged"]}
+                for kind, counts in self._counts.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+routing_stats = RoutingStats()
+
+
+__all__ = [
+    "TRIAGE",
+    "ESCALATION",
+    "tier_model",
+    "build_tier_model",
+    "tiered_enabled",
+    "parse_triage",
+    "RoutingStats",
+    "routing_stats",
+]
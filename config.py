@@ -20,6 +20,46 @@ class Settings:
     model: str = os.getenv("QWEN_MODEL", "qwen-turbo")
     temperature: float = float(os.getenv("QWEN_TEMPERATURE", "0"))
 
+    # Model tiers: a cheap model screens chunks / lines and only flagged
+    # ones are escalated to the stronger model with the full rules.
+    tiered_routing: bool = os.getenv("CODE_CHECKER_TIERED", "0") == "1"
+    triage_model: str = os.getenv("QWEN_TRIAGE_MODEL", "qwen-turbo")
+    escalation_model: str = os.getenv("QWEN_ESCALATION_MODEL", os.getenv("QWEN_MODEL", "qwen-turbo"))
+    triage_top_k: int = int(os.getenv("CODE_CHECKER_TRIAGE_TOP_K", "2"))
+
+    http2: bool = os.getenv("QWEN_HTTP2", "1") == "1"
+    http_max_connections: int = int(os.getenv("QWEN_HTTP_MAX_CONNECTIONS", "20"))
+    http_max_keepalive_connections: int = int(os.getenv("QWEN_HTTP_MAX_KEEPALIVE", "10"))
+    http_keepalive_expiry: float = float(os.getenv("QWEN_HTTP_KEEPALIVE_EXPIRY", "60"))
+
+    rate_limit_rpm: float = float(os.getenv("QWEN_RATE_LIMIT_RPM", "0"))
+    rate_limit_tpm: float = float(os.getenv("QWEN_RATE_LIMIT_TPM", "0"))
+    concurrency_initial: int = int(os.getenv("QWEN_CONCURRENCY_INITIAL", "4"))
+    concurrency_max: int = int(os.getenv("QWEN_CONCURRENCY_MAX", "16"))
+    max_retries: int = int(os.getenv("QWEN_MAX_RETRIES", "6"))
+    retry_backoff: float = float(os.getenv("QWEN_RETRY_BACKOFF", "1"))
+    retry_backoff_max: float = float(os.getenv("QWEN_RETRY_BACKOFF_MAX", "60"))
+
+    context_window: int = int(os.getenv("CODE_CHECKER_CONTEXT_WINDOW", "0"))
+    reserved_output_tokens: int = int(os.getenv("CODE_CHECKER_RESERVED_OUTPUT_TOKENS", "8192"))
+    tokenizer_path: str = os.getenv("QWEN_TOKENIZER_PATH", "")
+
+    batch_workers: int = int(os.getenv("CODE_CHECKER_BATCH_WORKERS", "8"))
+    batch_max_jobs: int = int(os.getenv("CODE_CHECKER_BATCH_MAX_JOBS", "100"))
+
+    chunk_concurrency: int = int(os.getenv("CODE_CHECKER_CHUNK_CONCURRENCY", "4"))
+    rule_top_k: int = int(os.getenv("CODE_CHECKER_RULE_TOP_K", "4"))
+    rule_index_dir: str = os.getenv("CODE_CHECKER_RULE_INDEX_DIR", "~/.cache/code_checker/rule_index")
+
+    llm_cache_path: str = os.getenv("CODE_CHECKER_LLM_CACHE", "~/.cache/code_checker/llm_cache.sqlite3")
+    llm_cache_ttl: float = float(os.getenv("CODE_CHECKER_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+    llm_cache_max_entries: int = int(os.getenv("CODE_CHECKER_LLM_CACHE_MAX_ENTRIES", "50000"))
+    # Sampled (temperature > 0) answers are only cached when opted in
+    llm_cache_sampled: bool = os.getenv("CODE_CHECKER_LLM_CACHE_SAMPLED", "0") == "1"
+    rule_book_version: str = os.getenv("CODE_CHECKER_RULEBOOK_VERSION", "")
+
+    metrics: bool = os.getenv("CODE_CHECKER_METRICS", "1") == "1"
+
     host: str = os.getenv("CODE_CHECKER_HOST", "0.0.0.0")
     port: int = int(os.getenv("CODE_CHECKER_PORT", "8000"))
 
@@ -0,0 +1,54 @@
+"""
+Check results shared by the Go and markdown checkers.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class CheckSeverity(Enum):
+    """Severity level of a check result."""
+    ERROR = "error"
+    WARNING = "warning"
+    INFO = "info"
+
+
+@dataclass
+class CheckResult:
+    """Result of a single check."""
+    rule_name: str
+    severity: CheckSeverity
+    message: str
+    line_number: Optional[int] = None
+    column_number: Optional[int] = None
+    context: Optional[str] = None
+    suggestion: Optional[str] = None
+    end_line_number: Optional[int] = None
+    # The check itself failed for these lines (e.g. an unparsable model
+    # answer); they were not judged and must be checked again
+    failed: bool = False
+
+    def __str__(self) -> str:
+        """String representation of the check result."""
+        location = ""
+        if self.line_number is not None:
+            location = f"Line {self.line_number}"
+            if self.end_line_number is not None and self.end_line_number != self.line_number:
+                location = f"Lines {self.line_number}-{self.end_line_number}"
+            if self.column_number is not None:
+                location += f", Column {self.column_number}"
+            location += ": "
+        
+        result = f"[{self.severity.value.upper()}] {self.rule_name}: {location}{self.message}"
+        
+        if self.suggestion:
+            result += f"\n  Suggestion: {self.suggestion}"
+        
+        if self.context:
+            result += f"\n  Context: {self.context}"
+        
+        return result
+
+
+__all__ = ["CheckSeverity", "CheckResult"]
@@ -0,0 +1,46 @@
+"""
+Go source checking: local pre-checks, chunking, rule retrieval and
+per-chunk LLM checks.
+"""
+
+from .chunker import GoChunk, chunk_go_source, split_chunk
+from .prechecks import format_findings, precheck_go_source, prepend_findings
+from .rule_index import RuleIndex, RuleSection, get_rule_index
+from .runner import (
+    ChunkDelta,
+    ChunkReport,
+    acheck_go_findings,
+    acheck_go_source,
+    astream_go_findings,
+    astream_go_source,
+    check_go_findings,
+    check_go_source,
+    format_report_header,
+    format_reports,
+    format_routing_summary,
+    triage_chunks,
+)
+
+__all__ = [
+    "GoChunk",
+    "chunk_go_source",
+    "split_chunk",
+    "precheck_go_source",
+    "format_findings",
+    "prepend_findings",
+    "RuleIndex",
+    "RuleSection",
+    "get_rule_index",
+    "ChunkReport",
+    "check_go_source",
+    "acheck_go_source",
+    "astream_go_source",
+    "check_go_findings",
+    "acheck_go_findings",
+    "astream_go_findings",
+    "ChunkDelta",
+    "format_report_header",
+    "format_reports",
+    "format_routing_summary",
+    "triage_chunks",
+]
@@ -0,0 +1,233 @@
+"""
+Semantic chunker for Go resource and data source files.
+
+Splits a Go file into units that can be checked independently:
+
+- header:        package clause and imports
+- declarations:  consecutive top-level type / const / var blocks
+- schema:        the `Resource...()` / `DataSource...()` schema function
+- crud:          each Create / Read / Update / Delete function
+- helper:        any other function
+
+Every chunk keeps its 1-based line span so findings can point at exact
+lines. The chunker only needs a light lexer (strings, runes, comments and
+bracket depth), not a Go toolchain.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+DECL_RE = re.compile(r"^(package|import|type|const|var|func)\b")
+FUNC_NAME_RE = re.compile(r"^func\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)")
+CRUD_RE = re.compile(r"(Create|Read|Update|Delete)(Context)?$")
+SCHEMA_NAME_RE = re.compile(r"^(?i:resource|datasource|data_source)")
+
+
+@dataclass(frozen=True)
+class GoChunk:
+    """A contiguous, meaningful unit of a Go source file."""
+
+    kind: str
+    name: str
+    start_line: int
+    end_line: int
+    text: str
+
+    @property
+    def line_count(self) -> int:
+        return self.end_line - self.start_line + 1
+
+    def numbered_text(self) -> str:
+        """Return the chunk text with original line numbers as a prefix."""
+
+        return "\n".join(
+            f"{number:>4} | {line}"
+            for number, line in enumerate(self.text.split("\n"), start=self.start_line)
+        )
+
+
+@dataclass
+class _Decl:
+    keyword: str
+    start: int  # 0-based index of the first line (doc comments included)
+    end: int  # 0-based index of the last line
+
+
+def _scan_lines(lines: List[str]) -> List[Tuple[int, bool]]:
+    """
+    Return (bracket depth, inside comment or raw string) at the start of each line.
+
+    Depth counts (), [] and {} outside strings, runes and comments.
+    """
+
+    states: List[Tuple[int, bool]] = []
+    depth = 0
+    in_block_comment = False
+    in_raw_string = False
+
+    for line in lines:
+        states.append((depth, in_block_comment or in_raw_string))
+        i = 0
+        n = len(line)
+        while i < n:
+            ch = line[i]
+            if in_block_comment:
+                end = line.find("*/", i)
+                if end < 0:
+                    break
+                in_block_comment = False
+                i = end + 2
+                continue
+            if in_raw_string:
+                end = line.find("`", i)
+                if end < 0:
+                    break
+                in_raw_string = False
+                i = end + 1
+                continue
+            if line.startswith("//", i):
+                break
+            if line.startswith("/*", i):
+                in_block_comment = True
+                i += 2
+                continue
+            if ch == "`":
+                in_raw_string = True
+                i += 1
+                continue
+            if ch in "\"'":
+                # Interpreted string or rune literal; both end on this line
+                i += 1
+                while i < n and line[i] != ch:
+                    i += 2 if line[i] == "\\" else 1
+                i += 1
+                continue
+            if ch in "([{":
+                depth += 1
+            elif ch in ")]}":
+                depth = max(0, depth - 1)
+            i += 1
+
+    return states
+
+
+def _find_decls(lines: List[str]) -> List[_Decl]:
+    """Locate top-level declarations, attaching preceding doc comments."""
+
+    states = _scan_lines(lines)
+    starts: List[Tuple[int, str]] = []
+    for index, line in enumerate(lines):
+        depth, continued = states[index]
+        if depth or continued:
+            continue
+        match = DECL_RE.match(line)
+        if match:
+            starts.append((index, match.group(1)))
+
+    decls: List[_Decl] = []
+    for position, (index, keyword) in enumerate(starts):
+        # A declaration ends before the next top-level blank line, comment
+        # or declaration once its brackets are balanced again.
+        limit = starts[position + 1][0] if position + 1 < len(starts) else len(lines)
+        end = index
+        for probe in range(index + 1, limit):
+            depth, continued = states[probe]
+            if not depth and not continued and (
+                not lines[probe].strip() or lines[probe].startswith("//")
+            ):
+                break
+            end = probe
+
+        start = index
+        while start > 0 and lines[start - 1].startswith("//") and not states[start - 1][1]:
+            start -= 1
+        decls.append(_Decl(keyword, start, end))
+
+    return decls
+
+
+def _func_kind(name: str, signature: str) -> str:
+    if CRUD_RE.search(name):
+        return "crud"
+    if SCHEMA_NAME_RE.match(name) and "*schema.Resource" in signature:
+        return "schema"
+    return "helper"
+
+
+def chunk_go_source(source: str) -> List[GoChunk]:
+    """
+    Split Go source into semantic chunks in file order.
+
+    Args:
+        source: Contents of a Go file
+
+    Returns:
+        List of GoChunk objects with 1-based inclusive line spans
+    """
+
+    lines = source.split("\n")
+    chunks: List[GoChunk] = []
+    pending: Optional[Tuple[str, str, int, int]] = None  # kind, name, start, end
+
+    def flush() -> None:
+        nonlocal pending
+        if pending is not None:
+            kind, name, start, end = pending
+            chunks.append(GoChunk(
+                kind=kind,
+                name=name,
+                start_line=start + 1,
+                end_line=end + 1,
+                text="\n".join(lines[start:end + 1]),
+            ))
+            pending = None
+
+    for decl in _find_decls(lines):
+        if decl.keyword in ("package", "import"):
+            kind, name = "header", "package and imports"
+        elif decl.keyword in ("type", "const", "var"):
+            kind, name = "declarations", "types, constants and variables"
+        else:
+            signature = next(
+                line for line in lines[decl.start:decl.end + 1] if line.startswith("func")
+            )
+            match = FUNC_NAME_RE.match(signature)
+            name = match.group(1) if match else "func"
+            kind = _func_kind(name, signature)
+
+        # Header and declaration blocks merge with the block right before them
+        if pending is not None and kind == pending[0] and kind in ("header", "declarations"):
+            pending = (kind, pending[1], pending[2], decl.end)
+            continue
+
+        flush()
+        pending = (kind, name, decl.start, decl.end)
+
+    flush()
+    return chunks
+
+
+def split_chunk(chunk: GoChunk) -> List[GoChunk]:
+    """
+    Split `chunk` into two halves by line, for chunks too large for one request.
+
+    The halves keep the chunk kind and original line numbers; a one-line
+    chunk is returned unchanged.
+    """
+
+    if chunk.line_count < 2:
+        return [chunk]
+    lines = chunk.text.split("\n")
+    middle = len(lines) // 2
+    name = chunk.name.split(" (lines ")[0]
+    parts = []
+    for start, part in ((chunk.start_line, lines[:middle]), (chunk.start_line + middle, lines[middle:])):
+        end = start + len(part) - 1
+        parts.append(GoChunk(chunk.kind, f"{name} (lines {start}-{end})", start, end, "\n".join(part)))
+    return parts
+
+
+__all__ = ["GoChunk", "chunk_go_source", "split_chunk"]
@@ -0,0 +1,261 @@
+"""
+Deterministic Go pre-checks for the mechanical rules of the rule books.
+
+These rules need no judgement, so they are enforced locally in
+milliseconds before any LLM call, and the rule-book sections they fully
+cover are left out of the prompts (see `prompt_template.rule_books`):
+
+- import grouping: stdlib, then third-party grouped by source, then
+  project packages; one blank line between groups, sorted within a group
+- declarations: type / const / var below the imports, const before var,
+  several consts (or vars) in one parenthesized block
+- schema field order: CRUD contexts first, then Importer, Timeouts,
+  CustomizeDiff and Schema
+
+Findings use the markdown checkers' `CheckResult` format.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Tuple
+
+from ..findings import CheckResult, CheckSeverity
+from .chunker import _Decl, _find_decls, _scan_lines
+
+PROJECT_MODULE = "github.com/huaweicloud/terraform-provider-huaweicloud"
+
+IMPORT_LINE_RE = re.compile(r'^\s*(?:[A-Za-z_.][\w]*\s+)?"([^"]+)"')
+RESOURCE_RETURN_RE = re.compile(r"^\s*return\s+&schema\.Resource\s*\{")
+FIELD_RE = re.compile(r"^\s*([A-Z]\w*)\s*:")
+
+CRUD_FIELDS = ["CreateContext", "ReadContext", "UpdateContext", "DeleteContext"]
+SCHEMA_FIELD_ORDER = CRUD_FIELDS + ["Importer", "Timeouts", "CustomizeDiff", "Schema"]
+
+STDLIB, THIRD_PARTY, PROJECT = 0, 1, 2
+CATEGORY_NAMES = {STDLIB: "系统库", THIRD_PARTY: "第三方库", PROJECT: "本项目的库"}
+
+IMPORT_RULE = "Go Import Grouping"
+DECLARATION_RULE = "Go Declaration Order"
+SCHEMA_ORDER_RULE = "Go Schema Field Order"
+
+
+def _finding(rule: str, line: int, message: str, suggestion: Optional[str] = None) -> CheckResult:
+    return CheckResult(
+        rule_name=rule,
+        severity=CheckSeverity.WARNING,
+        message=message,
+        line_number=line,
+        suggestion=suggestion,
+    )
+
+
+def import_category(path: str) -> Tuple[int, str]:
+    """Return (category, source) of an import path; source groups third-party packages."""
+
+    if path == PROJECT_MODULE or path.startswith(PROJECT_MODULE + "/"):
+        return PROJECT, PROJECT_MODULE
+    parts = path.split("/")
+    if "." not in parts[0]:
+        return STDLIB, ""
+    return THIRD_PARTY, "/".join(parts[:2])
+
+
+def _import_groups(lines: List[str], decl: _Decl) -> List[List[Tuple[int, str]]]:
+    """Return the blank-line separated groups of (line number, path) of an import decl."""
+
+    if "(" not in lines[decl.start] and IMPORT_LINE_RE.search(lines[decl.start][len("import"):]):
+        match = IMPORT_LINE_RE.search(lines[decl.start][len("import"):])
+        return [[(decl.start + 1, match.group(1))]]
+
+    groups: List[List[Tuple[int, str]]] = [[]]
+    for index in range(decl.start + 1, decl.end + 1):
+        line = lines[index]
+        if not line.strip():
+            if groups[-1]:
+                groups.append([])
+            continue
+        match = IMPORT_LINE_RE.match(line)
+        if match:
+            groups[-1].append((index + 1, match.group(1)))
+    return [group for group in groups if group]
+
+
+def check_imports(lines: List[str], decls: List[_Decl]) -> List[CheckResult]:
+    """Check the placement, grouping and ordering of the import block."""
+
+    results: List[CheckResult] = []
+    imports = [decl for decl in decls if decl.keyword == "import"]
+    packages = [decl for decl in decls if decl.keyword == "package"]
+    if not imports:
+        return results
+    decl = imports[0]
+    if packages:
+        package_line = packages[0].end
+        if decl.start != package_line + 2 or lines[package_line + 1].strip():
+            results.append(_finding(
+                IMPORT_RULE, decl.start + 1,
+                "import 导入块应位于包声明的下方，彼此间保持一个空行",
+            ))
+    for extra in imports[1:]:
+        results.append(_finding(
+            IMPORT_RULE, extra.start + 1,
+            "存在多个 import 声明，应合并为一个 import 导入块",
+        ))
+
+    previous_category = STDLIB
+    previous_key: Optional[Tuple[int, str]] = None
+    for group in _import_groups(lines, decl):
+        keys = [import_category(path) for _, path in group]
+        first_line = group[0][0]
+        if len(set(keys)) > 1:
+            line, path = group[[i for i, key in enumerate(keys) if key != keys[0]][0]]
+            results.append(_finding(
+                IMPORT_RULE, line,
+                f"导入 \"{path}\" 与同组的其他导入来源不同，不同来源的引用间应保持一个空行",
+            ))
+        elif previous_key is not None and keys[0] == previous_key and keys[0][0] != STDLIB:
+            results.append(_finding(
+                IMPORT_RULE, first_line,
+                "相同来源的导入不应以空行分隔，应紧凑排列",
+            ))
+        elif previous_key is not None and keys[0] == previous_key:
+            results.append(_finding(IMPORT_RULE, first_line, "系统库导入不应以空行分隔，应紧凑排列"))
+
+        for (line, path), (category, _) in zip(group, keys):
+            if category < previous_category:
+                results.append(_finding(
+                    IMPORT_RULE, line,
+                    f"{CATEGORY_NAMES[category]} \"{path}\" 应排在{CATEGORY_NAMES[previous_category]}之前",
+                    "导入顺序为：系统库、第三方库（按来源分组）、本项目的库",
+                ))
+            previous_category = max(previous_category, category)
+
+        paths = [path for _, path in group]
+        if paths != sorted(paths):
+            line = next(line for (line, path), expected in zip(group, sorted(paths)) if path != expected)
+            results.append(_finding(IMPORT_RULE, line, "同组导入应按字母升序排列", "运行 goimports 或手动排序"))
+        previous_key = keys[-1]
+    return results
+
+
+def check_declarations(lines: List[str], decls: List[_Decl]) -> List[CheckResult]:
+    """Check placement and order of top-level type / const / var declarations."""
+
+    results: List[CheckResult] = []
+    import_end = max((decl.end for decl in decls if decl.keyword in ("package", "import")), default=-1)
+    first_func = next((decl.start for decl in decls if decl.keyword == "func"), len(lines))
+    first_var: Optional[_Decl] = None
+    single = {"const": [], "var": []}
+
+    for decl in decls:
+        if decl.keyword not in ("type", "const", "var"):
+            continue
+        line = decl.start + 1
+        while lines[line - 1].startswith("//"):
+            line += 1
+        if decl.start < import_end or decl.start > first_func:
+            results.append(_finding(
+                DECLARATION_RULE, line,
+                f"{decl.keyword} 声明应位于导入块下方、方法定义之前",
+            ))
+        if decl.keyword == "var" and first_var is None:
+            first_var = decl
+        if decl.keyword == "const" and first_var is not None:
+            results.append(_finding(
+                DECLARATION_RULE, line,
+                f"常量声明应位于变量声明（第 {first_var.start + 1} 行）之上",
+            ))
+        if decl.keyword in single and not lines[line - 1].rstrip().endswith("("):
+            single[decl.keyword].append(line)
+
+    for keyword, decl_lines in single.items():
+        if len(decl_lines) > 1:
+            results.append(_finding(
+                DECLARATION_RULE, decl_lines[1],
+                f"存在多个 {keyword} 声明，应使用复数的括号表达格式",
+                f"{keyword} (\n    ...\n)",
+            ))
+    return results
+
+
+def check_schema_field_order(lines: List[str]) -> List[CheckResult]:
+    """Check the order of the fields of the `&schema.Resource{...}` literal of the main method."""
+
+    results: List[CheckResult] = []
+    states = _scan_lines(lines)
+    for index, line in enumerate(lines):
+        if states[index] != (1, False) or not RESOURCE_RETURN_RE.match(line):
+            continue
+        fields: List[Tuple[int, str]] = []
+        for probe in range(index + 1, len(lines)):
+            depth, continued = states[probe]
+            if depth < 2:
+                break
+            match = FIELD_RE.match(lines[probe])
+            if depth == 2 and not continued and match:
+                fields.append((probe + 1, match.group(1)))
+
+        names = [name for _, name in fields]
+        crud = [name for name in names if name in CRUD_FIELDS]
+        if crud and names[0] not in CRUD_FIELDS:
+            results.append(_finding(
+                SCHEMA_ORDER_RULE, fields[0][0],
+                "CRUD 方法应声明在 schema.Resource 对象的顶部",
+            ))
+        ordered = [(line, name) for line, name in fields if name in SCHEMA_FIELD_ORDER]
+        for (_, before), (line, name) in zip(ordered, ordered[1:]):
+            if SCHEMA_FIELD_ORDER.index(name) < SCHEMA_FIELD_ORDER.index(before):
+                results.append(_finding(
+                    SCHEMA_ORDER_RULE, line,
+                    f"{name} 应声明在 {before} 之前",
+                    "声明顺序为：" + "、".join(SCHEMA_FIELD_ORDER),
+                ))
+        break
+    return results
+
+
+def precheck_go_source(source: str) -> List[CheckResult]:
+    """
+    Run every deterministic pre-check on a Go file.
+
+    Returns:
+        CheckResult objects sorted by line number
+    """
+
+    lines = source.replace("\r\n", "\n").split("\n")
+    decls = _find_decls(lines)
+    results = (
+        check_imports(lines, decls)
+        + check_declarations(lines, decls)
+        + check_schema_field_order(lines)
+    )
+    return sorted(results, key=lambda result: result.line_number or 0)
+
+
+def format_findings(results: List[CheckResult], title: str = "本地规则检查") -> str:
+    """Render findings as a markdown section (empty if there are none)."""
+
+    if not results:
+        return ""
+    items = "\n".join(f"- {result}" for result in results)
+    return f"## {title}\n\n{items}\n"
+
+
+def prepend_findings(source: str, report: str) -> str:
+    """Return the LLM `report` preceded by the pre-check findings of `source`."""
+
+    findings = format_findings(precheck_go_source(source))
+    return f"{findings}\n{report}" if findings else report
+
+
+__all__ = [
+    "PROJECT_MODULE",
+    "import_category",
+    "check_imports",
+    "check_declarations",
+    "check_schema_field_order",
+    "precheck_go_source",
+    "format_findings",
+    "prepend_findings",
+]
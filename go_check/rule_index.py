@@ -0,0 +1,296 @@
+"""
+Retrieval index over the heading-structured rule books.
+
+The rule books (`resource-auto-gen.md`, `data-source-auto-gen.md`) are split
+into sections by heading. A code chunk is scored against the sections with
+an offline BM25 ranker plus keyword triggers (e.g. `CustomizeDiff`,
+`Timeouts`, `marker`), and only the top-k sections are sent with the
+request. The index is built once per rule-book version and persisted as
+JSON next to the LLM cache.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config import settings
+from ..prompt_template import load_llm_rule_book
+from .chunker import GoChunk
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+WORD_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+CJK_RE = re.compile(r"[一-鿿]+")
+CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+# Index format version; bump when the persisted layout or tokenizer changes.
+INDEX_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Code patterns that pull in a section whose title contains the given text.
+KEYWORD_TRIGGERS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"// @API\b"), "资源所用API的声明汇总"),
+    (re.compile(r"\*schema\.Resource\s*\{"), "主方法"),
+    (re.compile(r"\b(Create|Read|Update|Delete)Context\s*:"), "CRUD方法声明"),
+    (re.compile(r"\bImporter\s*:"), "导入方法声明"),
+    (re.compile(r"\bTimeouts?\b"), "Timeout"),
+    (re.compile(r"\bCustomizeDiff\b"), "CustomizeDiff方法"),
+    (re.compile(r"\bmap\[string\]\*schema\.Schema\b"), "Schema定义"),
+    (re.compile(r"\bDeprecated\s*:"), "废弃参数"),
+    (re.compile(r"\bNewServiceClient\b|\bGetRegion\b"), "获取region和创建client"),
+    (re.compile(r"\bRequestOpts\b|\bJSONBody\b"), "构建请求体"),
+    (re.compile(r"\bd\.SetId\("), "设置ID"),
+    (re.compile(r"\bStateChangeConf\b|\bWaitForStateContext\b"), "轮询"),
+    (re.compile(r"\boffset\b", re.I), "limit+offset"),
+    (re.compile(r"\bmarker\b", re.I), "marker+maxitems"),
+    (re.compile(r"\bCheckDeleted"), "CheckDeleted处理"),
+    (re.compile(r"\bd\.Set\("), "根据查询返回信息回填属性"),
+]
+
+# Function-name suffixes of CRUD chunks and the section describing them.
+CRUD_SECTIONS = {
+    "Create": "CreateContext方法",
+    "Read": "ReadContext方法",
+    "Update": "UpdateContext方法",
+    "Delete": "DeleteContext方法",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokenize mixed Chinese / Go text for lexical ranking.
+
+    Identifiers are lowercased and also split on camelCase and underscores;
+    runs of Chinese characters become overlapping bigrams.
+    """
+
+    tokens: List[str] = []
+    for word in WORD_RE.findall(text):
+        lowered = word.lower()
+        tokens.append(lowered)
+        parts = [p.lower() for piece in word.split("_") for p in CAMEL_RE.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    for run in CJK_RE.findall(text):
+        if len(run) == 1:
+            tokens.append(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+@dataclass
+class RuleSection:
+    """One heading-delimited section of a rule book."""
+
+    index: int
+    level: int
+    title: str
+    path: List[str]
+    text: str
+    length: int = 0
+    terms: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def render(self) -> str:
+        """Render the section with its heading path as context."""
+
+        breadcrumb = " > ".join(self.path)
+        return f"<!-- {breadcrumb} -->\n{self.text.strip()}"
+
+
+def split_sections(markdown: str) -> List[RuleSection]:
+    """Split a rule book into sections by heading, ignoring fenced code."""
+
+    sections: List[RuleSection] = []
+    path: List[Tuple[int, str]] = []
+    current: Optional[Tuple[int, str]] = None
+    body: List[str] = []
+    in_fence = False
+
+    def flush() -> None:
+        text = "\n".join(body).strip()
+        if current is not None and text:
+            sections.append(RuleSection(
+                index=len(sections),
+                level=current[0],
+                title=current[1],
+                path=[title for _, title in path],
+                text=text,
+            ))
+
+    for line in markdown.split("\n"):
+        if FENCE_RE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line)
+        if match:
+            flush()
+            level, title = len(match.group(1)), match.group(2).strip()
+            while path and path[-1][0] >= level:
+                path.pop()
+            path.append((level, title))
+            current = (level, title)
+            body = [line]
+        elif current is not None:
+            body.append(line)
+    flush()
+
+    for section in sections:
+        # Titles count three times so a matching heading outranks a passing mention
+        terms = Counter(tokenize(section.text)) + Counter(tokenize(" ".join(section.path)) * 3)
+        section.terms = dict(terms)
+        section.length = sum(terms.values())
+    return sections
+
+
+class RuleIndex:
+    """BM25 index with keyword triggers over one rule book."""
+
+    def __init__(self, kind: str, version: str, sections: List[RuleSection]):
+        self.kind = kind
+        self.version = version
+        self.sections = sections
+        self.avg_length = (
+            sum(s.length for s in sections) / len(sections) if sections else 0.0
+        )
+        df: Counter = Counter()
+        for section in sections:
+            df.update(section.terms.keys())
+        n = len(sections)
+        self.idf = {
+            term: math.log(1 + (n - count + 0.5) / (count + 0.5))
+            for term, count in df.items()
+        }
+
+    @classmethod
+    def build(cls, kind: str = "resource") -> "RuleIndex":
+        """Build the index for a rule book kind from its markdown."""
+
+        markdown = load_llm_rule_book(kind)
+        return cls(kind, _rule_book_hash(markdown), split_sections(markdown))
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "index_version": INDEX_VERSION,
+            "kind": self.kind,
+            "version": self.version,
+            "sections": [asdict(section) for section in self.sections],
+        }, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, data: str) -> "RuleIndex":
+        payload = json.loads(data)
+        if payload.get("index_version") != INDEX_VERSION:
+            raise ValueError("Stale rule index format")
+        sections = [RuleSection(**section) for section in payload["sections"]]
+        return cls(payload["kind"], payload["version"], sections)
+
+    def _bm25(self, query: Counter, section: RuleSection) -> float:
+        score = 0.0
+        norm = K1 * (1 - B + B * section.length / (self.avg_length or 1))
+        for term, query_count in query.items():
+            tf = section.terms.get(term)
+            if not tf:
+                continue
+            score += self.idf.get(term, 0.0) * tf * (K1 + 1) / (tf + norm) * query_count
+        return score
+
+    def triggered(self, code: str, chunk: Optional[GoChunk] = None) -> List[int]:
+        """Return indices of sections pulled in by keyword triggers."""
+
+        titles = [title for pattern, title in KEYWORD_TRIGGERS if pattern.search(code)]
+        if chunk is not None and chunk.kind == "crud":
+            for suffix, title in CRUD_SECTIONS.items():
+                if re.search(suffix + r"(Context)?$", chunk.name):
+                    titles.append(title)
+        return [
+            section.index
+            for section in self.sections
+            if any(title in section.title for title in titles)
+        ]
+
+    def search(
+        self,
+        code: str,
+        chunk: Optional[GoChunk] = None,
+        top_k: int = 4,
+    ) -> List[RuleSection]:
+        """
+        Return the `top_k` sections most relevant to `code`, in document order.
+
+        Triggered sections rank above every purely lexical match.
+        """
+
+        query = Counter(tokenize(code))
+        scores = {section.index: self._bm25(query, section) for section in self.sections}
+        boost = max(scores.values(), default=0.0) + 1.0
+        for index in self.triggered(code, chunk):
+            scores[index] += boost
+
+        ranked = sorted(
+            (index for index, score in scores.items() if score > 0),
+            key=lambda index: -scores[index],
+        )
+        return sorted((self.sections[i] for i in ranked[:top_k]), key=lambda s: s.index)
+
+    @staticmethod
+    def render(sections: Sequence[RuleSection]) -> str:
+        """Join selected sections into the rules text of a prompt."""
+
+        return "\n\n".join(section.render() for section in sections)
+
+
+def _rule_book_hash(markdown: str) -> str:
+    return hashlib.sha256(markdown.encode("utf-8")).hexdigest()[:16]
+
+
+def _index_path(kind: str, version: str) -> Path:
+    return Path(os.path.expanduser(settings.rule_index_dir)) / f"{kind}-{version}.json"
+
+
+@lru_cache(maxsize=None)
+def get_rule_index(kind: str = "resource") -> RuleIndex:
+    """
+    Return the index for a rule book kind, loading it from disk when possible.
+
+    The persisted file name carries the rule-book hash, so editing a rule
+    book builds a fresh index.
+    """
+
+    version = _rule_book_hash(load_llm_rule_book(kind))
+    path = _index_path(kind, version)
+    if path.exists():
+        try:
+            return RuleIndex.from_json(path.read_text(encoding="utf-8"))
+        except (ValueError, KeyError, TypeError):
+            pass
+
+    index = RuleIndex.build(kind)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(index.to_json(), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only cache directory only costs a rebuild next time
+        pass
+    return index
+
+
+__all__ = [
+    "RuleSection",
+    "RuleIndex",
+    "get_rule_index",
+    "split_sections",
+    "tokenize",
+]
@@ -0,0 +1,492 @@
+"""Check a Go file chunk by chunk with bounded parallelism."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterable, List, Optional, Tuple
+
+from ..chains import get_chain
+from ..chains.budget import prompt_budget
+from ..chains.findings import MALFORMED_RULE, arepair_findings, repair_findings
+from ..chains.routing import ESCALATION, parse_triage, routing_stats, tier_model, tiered_enabled
+from ..config import settings
+from ..prompt_template import get_code_check_chunk_prompt, load_llm_rule_book
+from ..findings import CheckResult
+from .chunker import GoChunk, chunk_go_source, split_chunk
+from .rule_index import RuleIndex, get_rule_index
+
+
+@dataclass
+class ChunkReport:
+    """Model output for a single chunk."""
+
+    chunk: GoChunk
+    report: str
+    escalated: Optional[bool] = None  # None when the check was not tiered
+
+
+@dataclass
+class ChunkDelta:
+    """A piece of streamed model output for one chunk."""
+
+    index: int  # position of the chunk in file order
+    chunk: GoChunk
+    text: str
+    done: bool = False  # True on the last (empty) delta of the chunk
+
+
+# Report of a chunk the triage model found nothing suspicious in.
+CLEARED_REPORT = "无问题（初筛未发现问题）"
+
+
+def build_chunk_input(chunk: GoChunk, rules: str) -> dict:
+    """Return the `code_check_chunk` chain input for one chunk."""
+
+    return {
+        "rules": rules,
+        "kind": chunk.kind,
+        "name": chunk.name,
+        "start_line": chunk.start_line,
+        "end_line": chunk.end_line,
+        "code": chunk.numbered_text(),
+    }
+
+
+def rules_for_chunk(chunk: GoChunk, rule_book: str = "resource", top_k: Optional[int] = None) -> str:
+    """
+    Return the rule-book text to send with `chunk`.
+
+    Only the `top_k` sections retrieved from the rule index are included;
+    a `top_k` of zero or less sends the whole rule book.
+    """
+
+    top_k = settings.rule_top_k if top_k is None else top_k
+    if top_k <= 0:
+        return load_llm_rule_book(rule_book)
+    index = get_rule_index(rule_book)
+    return RuleIndex.render(index.search(chunk.text, chunk, top_k))
+
+
+def fit_chunk(chunk: GoChunk, rule_book: str = "resource", top_k: Optional[int] = None) -> List[Tuple[GoChunk, dict]]:
+    """
+    Return `(chunk, chain input)` pairs that fit the escalation model's context window.
+
+    Chunks whose prompt is too large are split in halves until each part
+    fits. When the code is not what overflows (the rules alone are too
+    large), or a single line still does not fit, the chunk is left to the
+    chain's context guard to reject.
+    """
+
+    inputs = build_chunk_input(chunk, rules_for_chunk(chunk, rule_book, top_k))
+    if chunk.line_count < 2:
+        return [(chunk, inputs)]
+    budget = prompt_budget(get_code_check_chunk_prompt(), inputs, model=tier_model(ESCALATION))
+    if budget.fits or budget.overflow >= budget.variables["code"]:
+        return [(chunk, inputs)]
+    return [pair for part in split_chunk(chunk) for pair in fit_chunk(part, rule_book, top_k)]
+
+
+def build_chunk_inputs(
+    chunks: List[GoChunk],
+    rule_book: str,
+    top_k: Optional[int] = None,
+    tiered: Optional[bool] = None,
+) -> Tuple[List[GoChunk], List[dict]]:
+    """
+    Return the chunks to check and their chain inputs, split to fit the window.
+
+    With tiered routing the inputs are for escalated chunks, which get the
+    whole rule book unless `top_k` is given; the triage model only sees
+    the top sections (see `build_triage_inputs`). The whole book is the
+    same for every chunk, so it also stays in the provider's cached prefix.
+    """
+
+    if top_k is None and tiered_enabled(tiered):
+        top_k = 0
+    pairs = [pair for chunk in chunks for pair in fit_chunk(chunk, rule_book, top_k)]
+    return [chunk for chunk, _ in pairs], [inputs for _, inputs in pairs]
+
+
+def build_triage_inputs(chunks: List[GoChunk], inputs: List[dict], rule_book: str = "resource") -> List[dict]:
+    """Return triage inputs: the chunk inputs with only the top rule sections."""
+
+    return [
+        {**values, "rules": rules_for_chunk(chunk, rule_book, settings.triage_top_k)}
+        for chunk, values in zip(chunks, inputs)
+    ]
+
+
+def _triage_flags(outputs: list) -> List[bool]:
+    flags = []
+    for output in outputs:
+        failed = isinstance(output, Exception)
+        escalated = failed or parse_triage(output)
+        routing_stats.record("go_chunk", escalated, failed)
+        flags.append(escalated)
+    return flags
+
+
+def triage_chunks(
+    chunks: List[GoChunk],
+    inputs: List[dict],
+    rule_book: str = "resource",
+    max_concurrency: Optional[int] = None,
+) -> List[bool]:
+    """Screen chunks with the triage model; True marks a chunk to escalate."""
+
+    outputs = get_chain("code_check_triage").batch(
+        build_triage_inputs(chunks, inputs, rule_book),
+        config={"max_concurrency": max_concurrency or settings.chunk_concurrency},
+        return_exceptions=True,
+    )
+    return _triage_flags(outputs)
+
+
+async def atriage_chunks(
+    chunks: List[GoChunk],
+    inputs: List[dict],
+    rule_book: str = "resource",
+    max_concurrency: Optional[int] = None,
+) -> List[bool]:
+    """Async variant of `triage_chunks`."""
+
+    outputs = await get_chain("code_check_triage").abatch(
+        build_triage_inputs(chunks, inputs, rule_book),
+        config={"max_concurrency": max_concurrency or settings.chunk_concurrency},
+        return_exceptions=True,
+    )
+    return _triage_flags(outputs)
+
+
+def _route_reports(chunks: List[GoChunk], flags: Optional[List[bool]], outputs: List[str]) -> List[ChunkReport]:
+    """Pair chunks with the outputs of the escalated ones, in file order."""
+
+    if flags is None:
+        return [ChunkReport(chunk, output) for chunk, output in zip(chunks, outputs)]
+    escalated = iter(outputs)
+    return [
+        ChunkReport(chunk, next(escalated) if flag else CLEARED_REPORT, escalated=flag)
+        for chunk, flag in zip(chunks, flags)
+    ]
+
+
+def select_chunks(source: str, kinds: Optional[Iterable[str]] = None) -> List[GoChunk]:
+    """Chunk `source`, keeping only chunks of the given kinds (all if None)."""
+
+    chunks = chunk_go_source(source)
+    if kinds is None:
+        return chunks
+    wanted = set(kinds)
+    return [chunk for chunk in chunks if chunk.kind in wanted]
+
+
+def check_go_source(
+    source: str,
+    rule_book: str = "resource",
+    kinds: Optional[Iterable[str]] = None,
+    max_concurrency: Optional[int] = None,
+    top_k: Optional[int] = None,
+    tiered: Optional[bool] = None,
+) -> List[ChunkReport]:
+    """
+    Check every chunk of a Go file as its own request.
+
+    With tiered routing, a cheap model screens every chunk first and only
+    flagged chunks are checked by the escalation model with the full rules.
+
+    Args:
+        source: Contents of the Go file
+        rule_book: Rule book kind ("resource" or "data_source")
+        kinds: Optional chunk kinds to check (all if None)
+        max_concurrency: Requests in flight at once
+                         (default: CODE_CHECKER_CHUNK_CONCURRENCY)
+        top_k: Rule sections retrieved per chunk, 0 for the whole book
+               (default: CODE_CHECKER_RULE_TOP_K; the whole book for
+               escalated chunks when tiered)
+        tiered: Screen chunks with the triage model first
+                (default: CODE_CHECKER_TIERED)
+
+    Returns:
+        One ChunkReport per checked chunk, in file order; chunks too large
+        for the model window are reported in parts
+    """
+
+    chunks = select_chunks(source, kinds)
+    if not chunks:
+        return []
+    chunks, inputs = build_chunk_inputs(chunks, rule_book, top_k, tiered)
+    flags = None
+    if tiered_enabled(tiered):
+        flags = triage_chunks(chunks, inputs, rule_book, max_concurrency)
+        inputs = [values for values, flag in zip(inputs, flags) if flag]
+    outputs = []
+    if inputs:
+        outputs = get_chain("code_check_chunk").batch(
+            inputs,
+            config={"max_concurrency": max_concurrency or settings.chunk_concurrency},
+        )
+    return _route_reports(chunks, flags, outputs)
+
+
+async def acheck_go_source(
+    source: str,
+    rule_book: str = "resource",
+    kinds: Optional[Iterable[str]] = None,
+    max_concurrency: Optional[int] = None,
+    top_k: Optional[int] = None,
+    tiered: Optional[bool] = None,
+) -> List[ChunkReport]:
+    """Async variant of `check_go_source`."""
+
+    chunks = select_chunks(source, kinds)
+    if not chunks:
+        return []
+    chunks, inputs = build_chunk_inputs(chunks, rule_book, top_k, tiered)
+    flags = None
+    if tiered_enabled(tiered):
+        flags = await atriage_chunks(chunks, inputs, rule_book, max_concurrency)
+        inputs = [values for values, flag in zip(inputs, flags) if flag]
+    outputs = []
+    if inputs:
+        outputs = await get_chain("code_check_chunk").abatch(
+            inputs,
+            config={"max_concurrency": max_concurrency or settings.chunk_concurrency},
+        )
+    return _route_reports(chunks, flags, outputs)
+
+
+async def _astream_chunks(
+    chain_name: str,
+    source: str,
+    rule_book: str,
+    kinds: Optional[Iterable[str]],
+    max_concurrency: Optional[int],
+    top_k: Optional[int],
+    tiered: Optional[bool],
+    cleared: Optional[Any],
+) -> AsyncIterator[Tuple[int, GoChunk, Any, bool]]:
+    """
+    Stream `(index, chunk, piece, done)` from `chain_name` over every chunk.
+
+    Chunks the triage model clears yield `cleared` as their only piece
+    (nothing if it is None) before their `done` item.
+    """
+
+    chunks = select_chunks(source, kinds)
+    if not chunks:
+        return
+    chunks, inputs = build_chunk_inputs(chunks, rule_book, top_k, tiered)
+    chain = get_chain(chain_name)
+    triage = get_chain("code_check_triage") if tiered_enabled(tiered) else None
+    triage_inputs = build_triage_inputs(chunks, inputs, rule_book) if triage else None
+    semaphore = asyncio.Semaphore(max_concurrency or settings.chunk_concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _stream(index: int, chunk: GoChunk, values: dict) -> None:
+        try:
+            async with semaphore:
+                if triage is not None and not await _atriage_one(triage, triage_inputs[index]):
+                    if cleared is not None:
+                        await queue.put((index, chunk, cleared, False))
+                else:
+                    async for piece in chain.astream(values):
+                        await queue.put((index, chunk, piece, False))
+            await queue.put((index, chunk, None, True))
+        except Exception as exc:
+            await queue.put(exc)
+
+    tasks = [
+        asyncio.create_task(_stream(index, chunk, values))
+        for index, (chunk, values) in enumerate(zip(chunks, inputs))
+    ]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if item[3]:
+                remaining -= 1
+            yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def astream_go_source(
+    source: str,
+    rule_book: str = "resource",
+    kinds: Optional[Iterable[str]] = None,
+    max_concurrency: Optional[int] = None,
+    top_k: Optional[int] = None,
+    tiered: Optional[bool] = None,
+) -> AsyncIterator[ChunkDelta]:
+    """
+    Stream the check of every chunk of a Go file as output arrives.
+
+    Chunks are checked concurrently, so deltas of different chunks
+    interleave; each chunk ends with a `done` delta. Closing the iterator
+    cancels the requests still in flight. With tiered routing, chunks the
+    triage model clears yield `CLEARED_REPORT` as their only text.
+    """
+
+    items = _astream_chunks(
+        "code_check_chunk", source, rule_book, kinds, max_concurrency, top_k, tiered, CLEARED_REPORT
+    )
+    async for index, chunk, piece, done in items:
+        yield ChunkDelta(index, chunk, "" if done else piece, done)
+
+
+def _sorted_findings(results: Iterable[CheckResult]) -> List[CheckResult]:
+    return sorted(results, key=lambda result: result.line_number or 0)
+
+
+def check_go_findings(
+    source: str,
+    rule_book: str = "resource",
+    kinds: Optional[Iterable[str]] = None,
+    max_concurrency: Optional[int] = None,
+    top_k: Optional[int] = None,
+    tiered: Optional[bool] = None,
+    repair: bool = True,
+) -> List[CheckResult]:
+    """
+    Check every chunk of a Go file for structured findings.
+
+    Takes the arguments of `check_go_source`. Findings the model emitted
+    as malformed JSON are re-asked about one by one when `repair` is set.
+
+    Returns:
+        CheckResult objects of all chunks sorted by line number
+    """
+
+    chunks = select_chunks(source, kinds)
+    if not chunks:
+        return []
+    chunks, inputs = build_chunk_inputs(chunks, rule_book, top_k, tiered)
+    if tiered_enabled(tiered):
+        flags = triage_chunks(chunks, inputs, rule_book, max_concurrency)
+        inputs = [values for values, flag in zip(inputs, flags) if flag]
+    outputs = []
+    if inputs:
+        outputs = get_chain("code_check_chunk_findings").batch(
+            inputs,
+            config={"max_concurrency": max_concurrency or settings.chunk_concurrency},
+        )
+    results = [result for output in outputs for result in output]
+    return _sorted_findings(repair_findings(results) if repair else results)
+
+
+async def acheck_go_findings(
+    source: str,
+    rule_book: str = "resource",
+    kinds: Optional[Iterable[str]] = None,
+    max_concurrency: Optional[int] = None,
+    top_k: Optional[int] = None,
+    tiered: Optional[bool] = None,
+    repair: bool = True,
+) -> List[CheckResult]:
+    """Async variant of `check_go_findings`."""
+
+    chunks = select_chunks(source, kinds)
+    if not chunks:
+        return []
+    chunks, inputs = build_chunk_inputs(chunks, rule_book, top_k, tiered)
+    if tiered_enabled(tiered):
+        flags = await atriage_chunks(chunks, inputs, rule_book, max_concurrency)
+        inputs = [values for values, flag in zip(inputs, flags) if flag]
+    outputs = []
+    if inputs:
+        outputs = await get_chain("code_check_chunk_findings").abatch(
+            inputs,
+            config={"max_concurrency": max_concurrency or settings.chunk_concurrency},
+        )
+    results = [result for output in outputs for result in output]
+    return _sorted_findings(await arepair_findings(results) if repair else results)
+
+
+async def astream_go_findings(
+    source: str,
+    rule_book: str = "resource",
+    kinds: Optional[Iterable[str]] = None,
+    max_concurrency: Optional[int] = None,
+    top_k: Optional[int] = None,
+    tiered: Optional[bool] = None,
+    repair: bool = True,
+) -> AsyncIterator[CheckResult]:
+    """
+    Yield each finding of a Go file as soon as its JSON object is complete.
+
+    Findings of different chunks interleave. A malformed finding is
+    re-asked about on its own when `repair` is set; the rest of its
+    chunk keeps streaming meanwhile.
+    """
+
+    items = _astream_chunks(
+        "code_check_chunk_findings", source, rule_book, kinds, max_concurrency, top_k, tiered, None
+    )
+    async for _, _, result, done in items:
+        if done:
+            continue
+        if repair and result.rule_name == MALFORMED_RULE:
+            result = (await arepair_findings([result]))[0]
+        yield result
+
+
+async def _atriage_one(triage, values: dict) -> bool:
+    try:
+        output = await triage.ainvoke(values)
+    except Exception as exc:
+        output = exc
+    return _triage_flags([output])[0]
+
+
+def format_report_header(chunk: GoChunk) -> str:
+    """Return the markdown heading that introduces a chunk's report."""
+
+    return f"## {chunk.name} ({chunk.kind}, lines {chunk.start_line}-{chunk.end_line})\n\n"
+
+
+def format_reports(reports: List[ChunkReport]) -> str:
+    """Render chunk reports as one markdown document."""
+
+    sections = []
+    for item in reports:
+        sections.append(f"{format_report_header(item.chunk)}{item.report.strip()}\n")
+    return "\n".join(sections)
+
+
+def format_routing_summary(reports: List[ChunkReport]) -> str:
+    """Return a one-line escalation summary of tiered reports ("" if not tiered)."""
+
+    routed = [item for item in reports if item.escalated is not None]
+    if not routed:
+        return ""
+    escalated = sum(1 for item in routed if item.escalated)
+    return f"初筛 {len(routed)} 个片段，升级检查 {escalated} 个（{escalated / len(routed):.0%}）"
+
+
+__all__ = [
+    "ChunkReport",
+    "ChunkDelta",
+    "build_chunk_input",
+    "build_chunk_inputs",
+    "fit_chunk",
+    "rules_for_chunk",
+    "CLEARED_REPORT",
+    "build_triage_inputs",
+    "triage_chunks",
+    "atriage_chunks",
+    "select_chunks",
+    "check_go_source",
+    "acheck_go_source",
+    "astream_go_source",
+    "check_go_findings",
+    "acheck_go_findings",
+    "astream_go_findings",
+    "format_report_header",
+    "format_reports",
+    "format_routing_summary",
+]
@@ -1,17 +1,52 @@
 """
 Prompt templates for LangChain.
+
+Prompts that read files (rule books, Go sources, JSON templates) are built
+on first access and cached; importing this package stays cheap.
 """
 
-from .prompt_builder import build_chat_prompt
-from .fibonacci.prompt import fibonacci_prompt
+from .prompt_builder import (
+    LAYOUT_INLINE,
+    LAYOUT_PREFIX_CACHE,
+    build_chat_prompt,
+    static_prefix,
+)
 from .translation.prompt import translation_prompt
-from .code_check_full.prompt import code_check_full_prompt
-from .code_check_small.prompt import code_check_small_prompt
+from .fibonacci.prompt import get_fibonacci_prompt
+from .code_check_full.prompt import get_code_check_full_prompt
+from .code_check_small.prompt import get_code_check_small_prompt
+from .code_check_chunk.prompt import get_code_check_chunk_prompt
+from .code_check_triage.prompt import get_code_check_triage_prompt
+from .rule_books import detect_file_kind, load_llm_rule_book, load_rule_book
+
+_LAZY_PROMPTS = {
+    "fibonacci_prompt": get_fibonacci_prompt,
+    "code_check_full_prompt": get_code_check_full_prompt,
+    "code_check_small_prompt": get_code_check_small_prompt,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_PROMPTS:
+        return _LAZY_PROMPTS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "build_chat_prompt",
+    "LAYOUT_INLINE",
+    "LAYOUT_PREFIX_CACHE",
+    "static_prefix",
+    "get_fibonacci_prompt",
+    "get_code_check_full_prompt",
+    "get_code_check_small_prompt",
+    "get_code_check_chunk_prompt",
+    "get_code_check_triage_prompt",
+    "load_rule_book",
+    "load_llm_rule_book",
+    "detect_file_kind",
     "fibonacci_prompt",
     "translation_prompt",
     "code_check_full_prompt",
     "code_check_small_prompt",
-]
\ No newline at end of file
+]
@@ -0,0 +1,98 @@
+from functools import lru_cache
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from ..prompt_builder import LAYOUT_PREFIX_CACHE, build_chat_prompt, static_prefix
+
+OUTPUT_MARKDOWN = "markdown"
+OUTPUT_FINDINGS = "findings"
+
+FINDINGS_OUTPUT = {
+    "format": "json",
+    "language": "中文",
+    "description": (
+        '只输出一个 JSON 对象 {{"findings": [...]}}，不要输出其他内容。数组元素格式为 '
+        '{{"rule": "规范章节标题", "severity": "error 或 warning 或 info", "line": 起始行号, '
+        '"end_line": 结束行号, "message": "问题说明", "suggestion": "修改建议"}}，'
+        '没有问题时输出 {{"findings": []}}'
+    ),
+}
+
+def build_code_check_chunk_prompt(output_format: str = OUTPUT_MARKDOWN) -> ChatPromptTemplate:
+    """Build the prompt that checks one chunk of a Go file.
+    
+    Rules and code are invoke-time variables, so the template is built once
+    and re-used for every chunk. The prefix-cache layout keeps the system
+    message static; the variables below all go in the user message:
+    
+        rules:       rule book text (markdown)
+        kind:        chunk kind (header, declarations, schema, crud, helper)
+        name:        chunk name, e.g. the function name
+        start_line:  first line of the chunk in the original file
+        end_line:    last line of the chunk in the original file
+        code:        chunk source, each line prefixed with its line number
+    
+    Args:
+        output_format: "markdown" for a free-form report, or "findings" for
+            a JSON object of findings (see `chains.findings`).
+    
+    Returns:
+        ChatPromptTemplate: The configured prompt template for chunk checking.
+    """
+    role = "code checker"
+    task = "检查代码片段是否符合代码规范"
+
+    context = "```markdown\n{rules}\n```"
+
+    instructions = [
+        "每行代码前的数字是它在原文件中的行号，指出问题时必须引用这些行号",
+        "只检查与该代码片段相关的规范",
+    ]
+    limitations = [
+        "仅遵从传入的代码规范",
+        "不要对代码片段之外的内容做出判断",
+    ]
+
+    input = [
+        "代码片段类型为 {kind}（{name}），位于原文件第 {start_line} 至 {end_line} 行",
+        "```go\n{code}\n```",
+    ]
+
+    output_requirements = {
+        "format": "markdown",
+        "language": "中文",
+        "description": "按条展示检查结果，每条以行号开头，并给出详细解释；没有问题时输出“无问题”"
+    }
+    if output_format == OUTPUT_FINDINGS:
+        output_requirements = FINDINGS_OUTPUT
+    elif output_format != OUTPUT_MARKDOWN:
+        raise ValueError(f"Unknown output format: {output_format!r}")
+
+    examples = {}
+
+    prompt = build_chat_prompt(
+        role=role,
+        task=task,
+        context=context,
+        instructions=instructions,
+        limitations=limitations,
+        input_desc=input,
+        output_req=output_requirements,
+        examples=examples,
+        layout=LAYOUT_PREFIX_CACHE,
+    )
+    # Every chunk request must share one system message for prefix caching
+    static_prefix(prompt)
+    return prompt
+
+@lru_cache(maxsize=None)
+def get_code_check_chunk_prompt(output_format: str = OUTPUT_MARKDOWN) -> ChatPromptTemplate:
+    """Return the code check chunk prompt, building it on first use."""
+    return build_code_check_chunk_prompt(output_format)
+
+__all__ = [
+    "OUTPUT_MARKDOWN",
+    "OUTPUT_FINDINGS",
+    "build_code_check_chunk_prompt",
+    "get_code_check_chunk_prompt",
+]
@@ -1,19 +1,26 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 
 from langchain_core.prompts import ChatPromptTemplate
 
-from ..prompt_builder import build_chat_prompt, escape_braces_for_langchain
+from ..prompt_builder import LAYOUT_PREFIX_CACHE, build_chat_prompt, escape_braces_for_langchain
+from ..rule_books import load_llm_rule_book
 
-def read_file_content(file_path: Path) -> str:
-    """Read file content from the given path."""
-    with open(file_path, "r", encoding="utf-8") as file:
-        return file.read()
-
-def build_code_check_small_prompt() -> ChatPromptTemplate:
+def build_code_check_small_prompt(file_kind: str = "resource", output_path: Optional[Path] = None) -> ChatPromptTemplate:
     """Build the code check small prompt template.
     
-    This function reads the checker rules and Go code file, then builds
-    a ChatPromptTemplate for code checking.
+    This function reads the checker rules for the file kind, then builds
+    a ChatPromptTemplate for code checking. The Go source and its docs are
+    invoke-time variables, so one template checks any number of files:
+    
+        code:  Go source to check
+        docs:  documentation of the resource, or a placeholder when absent
+    
+    Args:
+        file_kind: Rule book kind ("resource" or "data_source").
+        output_path: File to write the prompt parameters to for debugging;
+            nothing is written by default.
     
     Returns:
         ChatPromptTemplate: The configured prompt template for code checking.
@@ -21,7 +28,7 @@ def build_code_check_small_prompt() -> ChatPromptTemplate:
     role = "code checker"
     task = "检查代码是否代码规范"
 
-    checker_rules = read_file_content(Path(__file__).parent / "resource-auto-gen.md")
+    checker_rules = load_llm_rule_book(file_kind, variant="small")
     checker_rules = escape_braces_for_langchain(checker_rules)
     checker_rules_block = f"```markdown\n{checker_rules}\n```"
     context = checker_rules_block
@@ -31,10 +38,9 @@ def build_code_check_small_prompt() -> ChatPromptTemplate:
         "仅遵从传入的代码规范"
     ]
 
-    go_code_content = read_file_content(Path(__file__).parent / "resource_huaweicloud_aom_application.go")
-    go_code_content = escape_braces_for_langchain(go_code_content)
-    code_block = f"```go\n{go_code_content}\n```"
-    input = [code_block]
+    code_block = "```go\n{code}\n```"
+    docs_block = "资源文档：\n```markdown\n{docs}\n```"
+    input = [code_block, docs_block]
     
     output_requirements = {
         "format": "markdown",
@@ -44,33 +50,30 @@ def build_code_check_small_prompt() -> ChatPromptTemplate:
 
     examples = {}
     
-    # Write parameters to output.txt before building the prompt
-    output_path = Path(__file__).parent / "output.txt"
-    # Clear the file before writing
-    output_path.write_text("", encoding="utf-8")
+    # Write parameters to output_path before building the prompt
+    if output_path is not None:
+        output_content = []
+        output_content.append("=== Prompt Parameters ===")
+        output_content.append("")
+        output_content.append(f"role: {role}")
+        output_content.append("")
+        output_content.append(f"task: {task}")
+        output_content.append("")
+        output_content.append(f"context:\n{context}")
+        output_content.append("")
+        output_content.append(f"instructions: {instructions}")
+        output_content.append("")
+        output_content.append(f"limitations: {limitations}")
+        output_content.append("")
+        output_content.append(f"input_desc:\n" + "\n".join(input))
+        output_content.append("")
+        output_content.append(f"output_req: {output_requirements}")
+        output_content.append("")
+        output_content.append(f"examples: {examples}")
+        output_content.append("")
     
-    output_content = []
-    output_content.append("=== Prompt Parameters ===")
-    output_content.append("")
-    output_content.append(f"role: {role}")
-    output_content.append("")
-    output_content.append(f"task: {task}")
-    output_content.append("")
-    output_content.append(f"context:\n{context}")
-    output_content.append("")
-    output_content.append(f"instructions: {instructions}")
-    output_content.append("")
-    output_content.append(f"limitations: {limitations}")
-    output_content.append("")
-    output_content.append(f"input_desc:\n" + "\n".join(input))
-    output_content.append("")
-    output_content.append(f"output_req: {output_requirements}")
-    output_content.append("")
-    output_content.append(f"examples: {examples}")
-    output_content.append("")
-    
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(output_content))
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(output_content))
     
     return build_chat_prompt(
         role=role,
@@ -81,9 +84,23 @@ def build_code_check_small_prompt() -> ChatPromptTemplate:
         input_desc=input,
         output_req=output_requirements,
         examples=examples,
+        layout=LAYOUT_PREFIX_CACHE,
     )
 
-# Export the prompt as an object (not a function) for use in LCEL chains
-code_check_small_prompt = build_code_check_small_prompt()
+@lru_cache(maxsize=None)
+def get_code_check_small_prompt(file_kind: str = "resource") -> ChatPromptTemplate:
+    """Return the code check small prompt for a file kind, building it on first use."""
+    return build_code_check_small_prompt(file_kind)
+
+def __getattr__(name: str):
+    # `code_check_small_prompt` is resolved lazily so importing this module
+    # does not read the rule book.
+    if name == "code_check_small_prompt":
+        return get_code_check_small_prompt()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ["code_check_small_prompt"]
\ No newline at end of file
+__all__ = [
+    "build_code_check_small_prompt",
+    "get_code_check_small_prompt",
+    "code_check_small_prompt",
+]
\ No newline at end of file
@@ -0,0 +1,68 @@
+from functools import lru_cache
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from ..prompt_builder import LAYOUT_PREFIX_CACHE, build_chat_prompt
+
+def build_code_check_triage_prompt() -> ChatPromptTemplate:
+    """Build the short yes/no prompt a cheap model uses to screen a chunk.
+    
+    Takes the same variables as the chunk check prompt, with `rules`
+    holding only the few most relevant rule sections:
+    
+        rules:       rule book excerpt (markdown)
+        kind:        chunk kind (header, declarations, schema, crud, helper)
+        name:        chunk name, e.g. the function name
+        start_line:  first line of the chunk in the original file
+        end_line:    last line of the chunk in the original file
+        code:        chunk source, each line prefixed with its line number
+    
+    Returns:
+        ChatPromptTemplate: The configured prompt template for chunk triage.
+    """
+    role = "code reviewer"
+    task = "快速判断代码片段是否可能违反代码规范"
+
+    context = "```markdown\n{rules}\n```"
+
+    instructions = [
+        "只要存在可能违反规范之处就回答 YES",
+        "确定没有任何问题时才回答 NO",
+    ]
+    limitations = [
+        "不要解释原因",
+    ]
+
+    input = [
+        "代码片段类型为 {kind}（{name}），位于原文件第 {start_line} 至 {end_line} 行",
+        "```go\n{code}\n```",
+    ]
+
+    output_requirements = {
+        "format": "text",
+        "description": "只输出 YES 或 NO"
+    }
+
+    examples = {}
+
+    return build_chat_prompt(
+        role=role,
+        task=task,
+        context=context,
+        instructions=instructions,
+        limitations=limitations,
+        input_desc=input,
+        output_req=output_requirements,
+        examples=examples,
+        layout=LAYOUT_PREFIX_CACHE,
+    )
+
+@lru_cache(maxsize=None)
+def get_code_check_triage_prompt() -> ChatPromptTemplate:
+    """Return the code check triage prompt, building it on first use."""
+    return build_code_check_triage_prompt()
+
+__all__ = [
+    "build_code_check_triage_prompt",
+    "get_code_check_triage_prompt",
+]
@@ -1,7 +1,20 @@
+from functools import lru_cache
+from pathlib import Path
+
+from langchain_core.prompts import ChatPromptTemplate
+
 from ..prompt_builder import build_chat_prompt_from_json_template, load_json_template
 
-fibonacci_prompt = build_chat_prompt_from_json_template(
-    load_json_template("code_checker/prompt_template/fibonacci/fibonacci_example.json")
-)
+@lru_cache(maxsize=None)
+def get_fibonacci_prompt() -> ChatPromptTemplate:
+    """Return the fibonacci prompt, building it on first use."""
+    return build_chat_prompt_from_json_template(
+        load_json_template(Path(__file__).parent / "fibonacci_example.json")
+    )
+
+def __getattr__(name: str):
+    if name == "fibonacci_prompt":
+        return get_fibonacci_prompt()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ["fibonacci_prompt"]
\ No newline at end of file
+__all__ = ["get_fibonacci_prompt", "fibonacci_prompt"]
@@ -9,6 +9,7 @@ from __future__ import annotations
 import json
 import re
 from pathlib import Path
+from string import Formatter
 from typing import Any, Mapping
 
 from langchain_core.prompts import ChatPromptTemplate
@@ -38,10 +39,37 @@ def escape_braces_for_langchain(text: str) -> str:
         return text
     return text.replace("{", "{{").replace("}", "}}")
 
+LAYOUT_INLINE = "inline"
+LAYOUT_PREFIX_CACHE = "prefix_cache"
+LAYOUTS = (LAYOUT_INLINE, LAYOUT_PREFIX_CACHE)
+
+
+def template_variables(text: str) -> list[str]:
+    """Return the names of the `{variables}` in a prompt template string."""
+
+    return [name for _, name, _, _ in Formatter().parse(text) if name]
+
+
 def build_chat_prompt_from_json_template(
     template: Mapping[str, Any],
+    layout: str = LAYOUT_INLINE,
 ) -> ChatPromptTemplate:
-    """Build a ChatPromptTemplate from a JSON template dict."""
+    """
+    Build a ChatPromptTemplate from a JSON template dict.
+
+    Layouts:
+        inline:        every section in the system message, in template
+                       order; the user message only repeats the task.
+        prefix_cache:  the system message holds only static sections (role,
+                       task, rules, instructions, limitations, output
+                       requirements, examples) so it is byte-identical
+                       across requests and providers can reuse the cached
+                       prefix. Input, and a context that contains template
+                       variables, go last in the user message.
+    """
+
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown prompt layout: {layout!r}")
 
     role = str(template.get("role", "")).strip()
     task = str(template.get("task", "")).strip()
@@ -60,68 +88,94 @@ def build_chat_prompt_from_json_template(
             return [f"- {str(v).strip()}" for v in value if str(v).strip()]
         return [f"- {str(value).strip()}"]
 
-    system_lines: list[str] = []
+    # Each section is a list of lines ending with a blank separator line.
+    blocks: dict[str, list[str]] = {}
     if role:
-        system_lines.append(role)
-        system_lines.append("")
+        blocks["role"] = [role, ""]
     if task:
-        system_lines.append(f"Task: {task}")
-        system_lines.append("")
+        blocks["task"] = [f"Task: {task}", ""]
     if context:
-        system_lines.append("Context:")
-        system_lines.append(context)
-        system_lines.append("")
+        blocks["context"] = ["Context:", context, ""]
 
     if instructions:
-        system_lines.append("Instructions:")
-        system_lines.extend(_as_bullets(instructions))
-        system_lines.append("")
+        blocks["instructions"] = ["Instructions:", *_as_bullets(instructions), ""]
 
     if limitations:
-        system_lines.append("Limitations:")
-        system_lines.extend(_as_bullets(limitations))
-        system_lines.append("")
+        blocks["limitations"] = ["Limitations:", *_as_bullets(limitations), ""]
 
     if input_desc:
-        system_lines.append("Input:")
-        system_lines.extend(_as_bullets(input_desc))
-        system_lines.append("")
+        blocks["input"] = ["Input:", *_as_bullets(input_desc), ""]
 
     if output_req:
-        system_lines.append("Output requirements:")
+        lines = ["Output requirements:"]
         for key, value in output_req.items():
             value_str = str(value).strip()
             if value_str:
                 # Capitalize the key for better readability
                 key_display = key.replace("_", " ").title()
-                system_lines.append(f"- {key_display}: {value_str}")
-        system_lines.append("")
+                lines.append(f"- {key_display}: {value_str}")
+        blocks["output_requirements"] = lines + [""]
 
     ex_in = str(examples.get("input", "")).strip()
     ex_out = str(examples.get("output", "")).strip()
     if ex_in or ex_out:
-        system_lines.append("Examples:")
+        lines = ["Examples:"]
         if ex_in:
-            system_lines.append("Input:")
-            system_lines.append(ex_in)
+            lines.append("Input:")
+            lines.append(ex_in)
         if ex_out:
-            system_lines.append("Output:")
-            system_lines.append(ex_out)
-        system_lines.append("")
-
-    user_lines: list[str] = []
+            lines.append("Output:")
+            lines.append(ex_out)
+        blocks["examples"] = lines + [""]
+
+    if layout == LAYOUT_PREFIX_CACHE:
+        variable = {"input"}
+        if context and template_variables(context):
+            variable.add("context")
+        system_names = [name for name in blocks if name not in variable]
+        user_names = [name for name in ("context", "input") if name in blocks and name in variable]
+    else:
+        system_names = list(blocks)
+        user_names = []
+
+    system_lines = [line for name in system_names for line in blocks[name]]
+    user_lines = [line for name in user_names for line in blocks[name]]
     if task:
         user_lines.append(task)
 
     system_message = "\n".join(system_lines).strip()
     user_message = "\n".join(user_lines).strip() or "Please follow the task above."
 
-    return ChatPromptTemplate.from_messages(
+    sections = {name: "\n".join(block).strip() for name, block in blocks.items()}
+    sections["user"] = user_message if layout == LAYOUT_INLINE else task
+
+    prompt = ChatPromptTemplate.from_messages(
         [
             ("system", system_message),
             ("user", user_message),
         ]
     )
+    # Section texts (still template-escaped) let `chains.budget` report
+    # per-section token counts without re-parsing the messages.
+    prompt.metadata = {"layout": layout, "sections": sections}
+    return prompt
+
+
+def static_prefix(prompt: ChatPromptTemplate) -> str:
+    """
+    Return the system message of `prompt` if it is static.
+
+    Raises:
+        ValueError: If the system message depends on input variables, which
+                    would change the prefix on every request.
+    """
+
+    system = prompt.messages[0]
+    variables = list(getattr(system, "input_variables", []))
+    if variables:
+        raise ValueError(f"System message depends on input variables: {variables}")
+    return system.format().content
+
 
 def build_chat_prompt(
     role: str,
@@ -132,6 +186,7 @@ def build_chat_prompt(
     input_desc: list[str],
     output_req: dict[str, Any],
     examples: dict[str, Any],
+    layout: str = LAYOUT_INLINE,
 ) -> ChatPromptTemplate:
     """Build a ChatPromptTemplate from a JSON template dict with dynamic parameters."""
     template = {
@@ -144,9 +199,13 @@ def build_chat_prompt(
         "output_requirements": output_req,
         "examples": examples,
     }
-    return build_chat_prompt_from_json_template(template)
+    return build_chat_prompt_from_json_template(template, layout=layout)
 
 __all__ = [
+    "LAYOUT_INLINE",
+    "LAYOUT_PREFIX_CACHE",
+    "template_variables",
+    "static_prefix",
     "build_chat_prompt_from_json_template",
     "build_chat_prompt",
     "load_json_template",
@@ -0,0 +1,98 @@
+"""
+Rule books for Go code checks.
+
+The rule books are long markdown documents; each is read once per process
+and cached.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from pathlib import Path
+
+RULE_BOOK_DIR = Path(__file__).parent / "code_check_full"
+SMALL_RULE_BOOK_DIR = Path(__file__).parent / "code_check_small"
+
+RULE_BOOKS = {
+    "resource": RULE_BOOK_DIR / "resource-auto-gen.md",
+    "data_source": RULE_BOOK_DIR / "data-source-auto-gen.md",
+}
+
+# The "small" variant is a trimmed resource rule book for quick experiments.
+# There is no trimmed data source book, so data sources use the full one.
+RULE_BOOK_VARIANTS = {
+    "full": RULE_BOOKS,
+    "small": {
+        "resource": SMALL_RULE_BOOK_DIR / "resource-auto-gen.md",
+        "data_source": RULE_BOOKS["data_source"],
+    },
+}
+
+DATA_SOURCE_FUNC_RE = re.compile(r"^func\s+DataSource\w*\s*\(", re.M)
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+
+# Sections enforced locally by `go_check.prechecks`; they are left out of
+# the rule text sent to the model.
+DETERMINISTIC_SECTIONS = (
+    "导入部分的代码格式",
+    "自定义类型、全局变量、常量的声明",
+)
+
+
+@lru_cache(maxsize=None)
+def load_rule_book(kind: str = "resource", variant: str = "full") -> str:
+    """Return the rule book for a file kind ("resource" or "data_source")."""
+
+    books = RULE_BOOK_VARIANTS.get(variant)
+    if books is None:
+        raise ValueError(f"Unknown rule book variant: {variant!r}")
+    if kind not in books:
+        raise ValueError(f"Unknown rule book kind for {variant!r} variant: {kind!r}")
+    return books[kind].read_text(encoding="utf-8")
+
+
+def strip_rule_sections(markdown: str, titles) -> str:
+    """Remove the sections whose heading title is in `titles`, subsections included."""
+
+    titles = set(titles)
+    kept = []
+    skip_level = 0
+    in_fence = False
+    for line in markdown.splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_RE.match(line)
+        if match:
+            level = len(match.group(1))
+            if skip_level and level <= skip_level:
+                skip_level = 0
+            if not skip_level and match.group(2) in titles:
+                skip_level = level
+        if not skip_level:
+            kept.append(line)
+    return "".join(kept)
+
+
+@lru_cache(maxsize=None)
+def load_llm_rule_book(kind: str = "resource", variant: str = "full") -> str:
+    """Return the rule book without the sections covered by the local pre-checks."""
+
+    return strip_rule_sections(load_rule_book(kind, variant), DETERMINISTIC_SECTIONS)
+
+
+def detect_file_kind(source: str) -> str:
+    """Guess the rule book kind of a Go file from its schema function."""
+
+    return "data_source" if DATA_SOURCE_FUNC_RE.search(source) else "resource"
+
+
+__all__ = [
+    "RULE_BOOKS",
+    "RULE_BOOK_VARIANTS",
+    "DETERMINISTIC_SECTIONS",
+    "load_rule_book",
+    "load_llm_rule_book",
+    "strip_rule_sections",
+    "detect_file_kind",
+]
@@ -1,4 +1,4 @@
-"""FastAPI router exposing the translation chain via LangServe."""
+"""FastAPI router exposing the translation and code check chains via LangServe."""
 
 from .server import app
 
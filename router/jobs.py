@@ -0,0 +1,290 @@
+"""
+In-process batch job queue for checking many Go files.
+
+A batch job holds one item per file. Items of all jobs share one queue
+drained by a fixed pool of worker tasks, so at most `workers` files are
+checked at a time. In "full" mode that is one upstream call per worker;
+in "chunked" mode each file fans out into up to
+CODE_CHECKER_CHUNK_CONCURRENCY chunk calls, all of them still subject to
+the shared model rate limiter. Jobs expose progress and partial results
+while they run and can be cancelled; they live in memory and do not
+survive a restart.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import io
+import tarfile
+import time
+import uuid
+import zipfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..chains import get_chain
+from ..config import settings
+from ..go_check import acheck_go_source, format_reports, prepend_findings
+from ..prompt_template import detect_file_kind
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+MODES = ("full", "chunked")
+
+
+@dataclass
+class FileResult:
+    """Outcome of checking one file of a batch job."""
+
+    path: str
+    status: str = QUEUED
+    report: Optional[str] = None
+    error: Optional[str] = None
+    elapsed: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "status": self.status,
+            "report": self.report,
+            "error": self.error,
+            "elapsed": self.elapsed,
+        }
+
+
+@dataclass
+class BatchJob:
+    """A set of files checked in the background."""
+
+    id: str
+    mode: str
+    file_kind: Optional[str]
+    files: Dict[str, FileResult]
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    cancelled: bool = False
+
+    def count(self, status: str) -> int:
+        return sum(1 for item in self.files.values() if item.status == status)
+
+    @property
+    def status(self) -> str:
+        if self.cancelled:
+            return CANCELLED
+        pending = self.count(QUEUED) + self.count(RUNNING)
+        if pending == len(self.files):
+            return RUNNING if self.count(RUNNING) else QUEUED
+        return RUNNING if pending else DONE
+
+    def progress(self) -> dict:
+        """Return the job status and per-status file counts."""
+
+        return {
+            "id": self.id,
+            "status": self.status,
+            "mode": self.mode,
+            "total": len(self.files),
+            "queued": self.count(QUEUED),
+            "running": self.count(RUNNING),
+            "done": self.count(DONE),
+            "failed": self.count(FAILED),
+            "cancelled": self.count(CANCELLED),
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+    def results(self, offset: int = 0, limit: Optional[int] = None, finished_only: bool = True) -> List[dict]:
+        """Return file results in submission order, optionally only finished ones."""
+
+        items = [
+            item for item in self.files.values()
+            if not finished_only or item.status in (DONE, FAILED)
+        ]
+        end = None if limit is None else offset + limit
+        return [item.to_dict() for item in items[offset:end]]
+
+
+def extract_go_files(archive: bytes, include_tests: bool = False) -> List[Tuple[str, str]]:
+    """
+    Return `(path, source)` for every Go file in a zip or tar(.gz) archive.
+
+    `_test.go` files are skipped unless `include_tests` is set.
+    """
+
+    def wanted(name: str) -> bool:
+        return name.endswith(".go") and (include_tests or not name.endswith("_test.go"))
+
+    files: List[Tuple[str, str]] = []
+    if zipfile.is_zipfile(io.BytesIO(archive)):
+        with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and wanted(info.filename):
+                    files.append((info.filename, zf.read(info).decode("utf-8")))
+        return files
+
+    try:
+        with tarfile.open(fileobj=io.BytesIO(archive), mode="r:*") as tf:
+            for member in tf.getmembers():
+                if member.isfile() and wanted(member.name):
+                    handle = tf.extractfile(member)
+                    if handle is not None:
+                        files.append((member.name, handle.read().decode("utf-8")))
+    except tarfile.TarError as exc:
+        raise ValueError("Archive is neither zip nor tar") from exc
+    return files
+
+
+def decode_archive(data: str) -> bytes:
+    """Decode a base64 archive payload."""
+
+    return base64.b64decode(data, validate=True)
+
+
+class JobManager:
+    """Bounded worker pool over a shared queue of per-file work items."""
+
+    def __init__(self, workers: Optional[int] = None, max_jobs: Optional[int] = None):
+        self.workers = workers or settings.batch_workers
+        self.max_jobs = max_jobs or settings.batch_max_jobs
+        self.jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._sources: Dict[Tuple[str, str], str] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, Set[asyncio.Task]] = {}
+
+    def _ensure_workers(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._work(), name=f"batch-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    def submit(
+        self,
+        files: Iterable[Tuple[str, str]],
+        mode: str = "full",
+        file_kind: Optional[str] = None,
+    ) -> BatchJob:
+        """Create a job for `(path, source)` pairs and enqueue its files."""
+
+        if mode not in MODES:
+            raise ValueError(f"Unknown batch mode: {mode!r}")
+        files = list(files)
+        if not files:
+            raise ValueError("Batch contains no Go files")
+        if len({path for path, _ in files}) != len(files):
+            raise ValueError("Batch contains duplicate file paths")
+
+        self._ensure_workers()
+        job = BatchJob(
+            id=uuid.uuid4().hex,
+            mode=mode,
+            file_kind=file_kind,
+            files={path: FileResult(path) for path, _ in files},
+        )
+        self.jobs[job.id] = job
+        self._forget_old_jobs()
+        for path, source in files:
+            self._sources[(job.id, path)] = source
+            self._queue.put_nowait((job.id, path))
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[BatchJob]:
+        """Cancel a job: drop its queued files and abort those in flight."""
+
+        job = self.jobs.get(job_id)
+        if job is None or job.status in (DONE, CANCELLED):
+            return job
+        job.cancelled = True
+        job.finished_at = time.time()
+        for item in job.files.values():
+            if item.status == QUEUED:
+                item.status = CANCELLED
+                self._sources.pop((job_id, item.path), None)
+        for task in self._running.get(job_id, ()):
+            task.cancel()
+        return job
+
+    async def close(self) -> None:
+        """Stop the workers; unfinished jobs stay in their current state."""
+
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def _forget_old_jobs(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in (DONE, CANCELLED)]
+        while len(self.jobs) > self.max_jobs and finished:
+            job_id = finished.pop(0)
+            del self.jobs[job_id]
+
+    async def _check(self, job: BatchJob, source: str) -> str:
+        if job.mode == "chunked":
+            reports = await acheck_go_source(source, rule_book=job.file_kind or detect_file_kind(source))
+            report = format_reports(reports)
+        else:
+            report = await get_chain("code_check_full").ainvoke({"code": source, "file_kind": job.file_kind})
+        return prepend_findings(source, report)
+
+    async def _work(self) -> None:
+        while True:
+            job_id, path = await self._queue.get()
+            try:
+                source = self._sources.pop((job_id, path), None)
+                job = self.jobs.get(job_id)
+                if job is None or source is None or job.cancelled:
+                    continue
+                await self._run_item(job, job.files[path], source)
+            finally:
+                self._queue.task_done()
+
+    async def _run_item(self, job: BatchJob, item: FileResult, source: str) -> None:
+        item.status = RUNNING
+        started = time.perf_counter()
+        task = asyncio.create_task(self._check(job, source))
+        running = self._running.setdefault(job.id, set())
+        running.add(task)
+        try:
+            item.report = await task
+            item.status = DONE
+        except asyncio.CancelledError:
+            item.status = CANCELLED
+            if not task.cancelled():
+                # The worker itself is being stopped
+                task.cancel()
+                raise
+        except Exception as exc:
+            item.status = FAILED
+            item.error = f"{type(exc).__name__}: {exc}"
+        finally:
+            item.elapsed = time.perf_counter() - started
+            running.discard(task)
+            if not running:
+                self._running.pop(job.id, None)
+            if job.status in (DONE, CANCELLED) and job.finished_at is None:
+                job.finished_at = time.time()
+
+
+job_manager = JobManager()
+
+
+__all__ = [
+    "FileResult",
+    "BatchJob",
+    "JobManager",
+    "job_manager",
+    "extract_go_files",
+    "decode_archive",
+]
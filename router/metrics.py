@@ -0,0 +1,48 @@
+"""
+ASGI middleware recording HTTP request counts and durations.
+
+Requests are labelled by route template (`/batch/{job_id}`), not by raw
+path, so job ids do not create new series. Durations run until the last
+body chunk is sent, which covers streamed (SSE) responses.
+"""
+
+from __future__ import annotations
+
+import time
+
+from ..chains.metrics import metrics_registry
+
+UNMATCHED = "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware; adds no per-request task or response buffering."""
+
+    def __init__(self, app, registry=metrics_registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def _send(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED
+            labels = (("method", scope["method"]), ("route", route))
+            self.registry.inc("http_requests_total", labels + (("status", str(status)),))
+            self.registry.observe("http_request_duration_seconds", labels, time.perf_counter() - started)
+
+
+__all__ = ["MetricsMiddleware"]
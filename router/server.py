@@ -1,21 +1,182 @@
-"""FastAPI server exposing the translation chain."""
+"""FastAPI server exposing the translation and code check chains."""
 
-from fastapi import FastAPI
+import json
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
 from langserve import add_routes
+from pydantic import BaseModel
+from sse_starlette.sse import EventSourceResponse
 import uvicorn
 
-from ..chains import translation_chain
+from ..chains import get_chain, translation_chain, aclose_chat_models
+from ..chains.metrics import metrics_registry
+from ..chains.routing import routing_stats
 from ..config import settings
+from ..go_check import astream_go_source
+from .jobs import decode_archive, extract_go_files, job_manager
+from .metrics import MetricsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Stop batch workers and close pooled model connections on shutdown."""
+
+    yield
+    await job_manager.close()
+    await aclose_chat_models()
+
 
 app = FastAPI(
     title="LangChain Translation Server",
     version="1.0.0",
     description="A simple API server using LangChain's Runnable interfaces.",
+    lifespan=lifespan,
 )
+if settings.metrics:
+    app.add_middleware(MetricsMiddleware)
 
 # Add the LCEL chain as a REST endpoint at /chain.
 add_routes(app, translation_chain, path="/chain")
 
+# Code check chains; LangServe serves token streaming at `<path>/stream` (SSE).
+add_routes(app, get_chain("code_check_full"), path="/code-check/full")
+add_routes(app, get_chain("code_check_small"), path="/code-check/small")
+add_routes(app, get_chain("code_check_chunk"), path="/code-check/chunk")
+
+
+class GoCheckRequest(BaseModel):
+    """Body of a chunked Go file check."""
+
+    source: str
+    rule_book: str = "resource"
+    kinds: Optional[List[str]] = None
+    tiered: Optional[bool] = None
+
+
+async def _go_check_events(request: GoCheckRequest) -> AsyncIterator[dict]:
+    """Translate chunk deltas into SSE events, forwarding each as it arrives."""
+
+    try:
+        async for delta in astream_go_source(
+            request.source, request.rule_book, request.kinds, tiered=request.tiered
+        ):
+            chunk = delta.chunk
+            payload = {
+                "index": delta.index,
+                "name": chunk.name,
+                "kind": chunk.kind,
+                "start_line": chunk.start_line,
+                "end_line": chunk.end_line,
+            }
+            if delta.done:
+                yield {"event": "chunk_end", "data": json.dumps(payload, ensure_ascii=False)}
+            else:
+                payload["text"] = delta.text
+                yield {"event": "data", "data": json.dumps(payload, ensure_ascii=False)}
+    except Exception as exc:
+        yield {"event": "error", "data": json.dumps({"message": str(exc)}, ensure_ascii=False)}
+        return
+    yield {"event": "end", "data": "{}"}
+
+
+@app.post("/code-check/go/stream")
+async def stream_go_check(request: GoCheckRequest) -> EventSourceResponse:
+    """
+    Check a Go file chunk by chunk, streaming model output as SSE.
+
+    Events: `data` (a text delta of one chunk), `chunk_end` (a chunk is
+    complete), `error` and a final `end`.
+    """
+
+    return EventSourceResponse(_go_check_events(request))
+
+
+@app.get("/code-check/routing")
+async def routing_summary() -> dict:
+    """Return triage / escalation counts and rates since startup."""
+
+    return routing_stats.snapshot()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Return request, latency, token, retry and cache metrics in Prometheus format."""
+
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/metrics/summary")
+async def metrics_summary() -> dict:
+    """Return the same metrics as a JSON summary per chain."""
+
+    return metrics_registry.summary()
+
+
+class BatchFile(BaseModel):
+    """One Go file of a batch request."""
+
+    path: str
+    source: str
+
+
+class BatchRequest(BaseModel):
+    """
+    Body of a batch check: a list of files and/or a base64 zip or tar(.gz)
+    archive whose `.go` files (tests excluded) are checked.
+    """
+
+    files: List[BatchFile] = []
+    archive: Optional[str] = None
+    mode: str = "full"
+    file_kind: Optional[str] = None
+
+
+def _get_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
+
+
+@app.post("/batch", status_code=202)
+async def submit_batch(request: BatchRequest) -> dict:
+    """Enqueue one check per file and return the job id at once."""
+
+    files = [(item.path, item.source) for item in request.files]
+    try:
+        if request.archive:
+            files.extend(extract_go_files(decode_archive(request.archive)))
+        job = job_manager.submit(files, mode=request.mode, file_kind=request.file_kind)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return job.progress()
+
+
+@app.get("/batch/{job_id}")
+async def batch_progress(job_id: str) -> dict:
+    """Return the status and per-status file counts of a job."""
+
+    return _get_job(job_id).progress()
+
+
+@app.get("/batch/{job_id}/results")
+async def batch_results(job_id: str, offset: int = 0, limit: Optional[int] = None) -> dict:
+    """Return the results of finished files so far (partial while running)."""
+
+    job = _get_job(job_id)
+    return {**job.progress(), "results": job.results(offset, limit)}
+
+
+@app.delete("/batch/{job_id}")
+async def cancel_batch(job_id: str) -> dict:
+    """Cancel a job; finished results are kept."""
+
+    job_manager.cancel(job_id)
+    return _get_job(job_id).progress()
+
 
 def run() -> None:
     """Launch the FastAPI app with uvicorn."""
@@ -24,4 +185,4 @@ def run() -> None:
 
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
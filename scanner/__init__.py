@@ -0,0 +1,25 @@
+"""
+Incremental scanner for a terraform-provider-huaweicloud checkout.
+
+Discovers resource and data source Go files (with their docs), and keeps
+a manifest of content hash -> last findings so repeated scans only check
+files whose content, rule books or model changed. Structured findings can
+be recorded per run in an indexed `FindingsStore` for cross-run diffs.
+"""
+
+from .discovery import ScanTarget, discover
+from .manifest import Manifest, ManifestEntry
+from .scan import ScanSummary, ascan_repository, scan_repository
+from .store import FindingsStore, StoredFinding
+
+__all__ = [
+    "ScanTarget",
+    "discover",
+    "Manifest",
+    "ManifestEntry",
+    "ScanSummary",
+    "ascan_repository",
+    "scan_repository",
+    "FindingsStore",
+    "StoredFinding",
+]
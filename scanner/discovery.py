@@ -0,0 +1,86 @@
+"""Discover checkable files in a provider checkout."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+GO_PREFIXES = {
+    "resource_": "resource",
+    "data_source_": "data_source",
+}
+DOCS_DIRS = {
+    "resource": "docs/resources",
+    "data_source": "docs/data-sources",
+}
+PROVIDER_PREFIX = "huaweicloud_"
+SKIPPED_DIRS = {".git", "vendor", "node_modules", "testdata"}
+
+
+@dataclass(frozen=True)
+class ScanTarget:
+    """A Go file to check, with the docs page describing it if one exists."""
+
+    path: str  # posix path relative to the checkout root
+    kind: str  # "resource" or "data_source"
+    docs_path: Optional[str] = None
+
+
+def _go_kind(name: str) -> Optional[str]:
+    if not name.endswith(".go") or name.endswith("_test.go"):
+        return None
+    for prefix, kind in GO_PREFIXES.items():
+        if name.startswith(prefix):
+            return kind
+    return None
+
+
+def _docs_name(name: str, kind: str) -> str:
+    """`resource_huaweicloud_aom_application.go` -> `aom_application.md`."""
+
+    stem = name[len(next(p for p, k in GO_PREFIXES.items() if k == kind)):-len(".go")]
+    if stem.startswith(PROVIDER_PREFIX):
+        stem = stem[len(PROVIDER_PREFIX):]
+    return f"{stem}.md"
+
+
+def _docs_index(root: Path) -> Dict[str, Dict[str, str]]:
+    index: Dict[str, Dict[str, str]] = {}
+    for kind, docs_dir in DOCS_DIRS.items():
+        directory = root / docs_dir
+        if directory.is_dir():
+            index[kind] = {
+                entry.name: f"{docs_dir}/{entry.name}"
+                for entry in directory.iterdir()
+                if entry.suffix == ".md"
+            }
+    return index
+
+
+def discover(root: Path) -> List[ScanTarget]:
+    """
+    Return every `resource_*.go` / `data_source_*.go` under `root`, sorted.
+
+    Test files and vendored or hidden directories are skipped. Each target
+    is paired with its page under `docs/resources` or `docs/data-sources`.
+    """
+
+    root = Path(root)
+    docs = _docs_index(root)
+    targets: List[ScanTarget] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIPPED_DIRS and not d.startswith(".")]
+        for name in filenames:
+            kind = _go_kind(name)
+            if kind is None:
+                continue
+            path = Path(dirpath, name).relative_to(root).as_posix()
+            docs_path = docs.get(kind, {}).get(_docs_name(name, kind))
+            targets.append(ScanTarget(path, kind, docs_path))
+    targets.sort(key=lambda target: target.path)
+    return targets
+
+
+__all__ = ["ScanTarget", "discover"]
@@ -0,0 +1,100 @@
+"""Content-hash manifest of the last findings per file."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    """The last check of one file and everything its findings depend on."""
+
+    content_hash: str
+    rule_book_version: str
+    model: str
+    mode: str
+    findings: str
+    checked_at: float
+
+    def matches(self, content_hash: str, rule_book_version: str, model: str, mode: str) -> bool:
+        return (
+            self.content_hash == content_hash
+            and self.rule_book_version == rule_book_version
+            and self.model == model
+            and self.mode == mode
+        )
+
+
+class Manifest:
+    """JSON manifest mapping file path -> ManifestEntry."""
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, ManifestEntry]] = None):
+        self.path = Path(path)
+        self.entries: Dict[str, ManifestEntry] = entries or {}
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        """Load a manifest; a missing or unreadable file gives an empty one."""
+
+        path = Path(path)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cls(path)
+        if payload.get("version") != MANIFEST_VERSION:
+            return cls(path)
+        entries = {name: ManifestEntry(**entry) for name, entry in payload.get("files", {}).items()}
+        return cls(path, entries)
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+
+        payload = {
+            "version": MANIFEST_VERSION,
+            "files": {name: asdict(entry) for name, entry in sorted(self.entries.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+    def is_fresh(self, name: str, content_hash: str, rule_book_version: str, model: str, mode: str) -> bool:
+        entry = self.entries.get(name)
+        return entry is not None and entry.matches(content_hash, rule_book_version, model, mode)
+
+    def record(
+        self,
+        name: str,
+        content_hash: str,
+        rule_book_version: str,
+        model: str,
+        mode: str,
+        findings: str,
+    ) -> None:
+        self.entries[name] = ManifestEntry(
+            content_hash=content_hash,
+            rule_book_version=rule_book_version,
+            model=model,
+            mode=mode,
+            findings=findings,
+            checked_at=time.time(),
+        )
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """Drop entries of files that no longer exist; return how many."""
+
+        keep = set(keep)
+        stale = [name for name in self.entries if name not in keep]
+        for name in stale:
+            del self.entries[name]
+        return len(stale)
+
+
+__all__ = ["MANIFEST_VERSION", "ManifestEntry", "Manifest"]
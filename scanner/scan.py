@@ -0,0 +1,294 @@
+"""Scan a checkout, checking only files that changed since the last scan."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from ..chains import get_chain, run_async
+from ..chains.cache import rule_book_version
+from ..chains.routing import ESCALATION, TRIAGE, tier_model, tiered_enabled
+from ..config import settings
+from ..go_check import acheck_go_findings, acheck_go_source, format_findings, format_reports, precheck_go_source
+from ..findings import CheckResult
+from .discovery import ScanTarget, discover
+from .manifest import Manifest
+from .store import LOCAL, MODEL, FindingsStore
+
+MODES = ("full", "chunked", "findings")
+
+# Save the manifest after this many checked files so an interrupted scan
+# keeps its progress.
+SAVE_EVERY = 20
+
+T = TypeVar("T")
+
+
+@dataclass
+class ScanSummary:
+    """Outcome of one scan."""
+
+    discovered: int = 0
+    unchanged: int = 0
+    checked: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    removed: int = 0
+    elapsed: float = 0.0
+    run_id: Optional[int] = None  # findings store run, if a store was used
+    new_findings: int = 0
+    fixed_findings: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "discovered": self.discovered,
+            "unchanged": self.unchanged,
+            "checked": len(self.checked),
+            "failed": len(self.failed),
+            "removed": self.removed,
+            "elapsed": round(self.elapsed, 3),
+            "run_id": self.run_id,
+            "new_findings": self.new_findings,
+            "fixed_findings": self.fixed_findings,
+        }
+
+
+def hash_target(root: str, target: ScanTarget) -> Tuple[str, str]:
+    """Return `(path, sha256 of the Go source and its docs)`; runs in worker processes."""
+
+    digest = hashlib.sha256()
+    for name in (target.path, target.docs_path):
+        digest.update(b"\0")
+        if name:
+            digest.update(Path(root, name).read_bytes())
+    return target.path, digest.hexdigest()
+
+
+def precheck_target(root: str, target: ScanTarget) -> Tuple[str, Optional[List[CheckResult]]]:
+    """
+    Return `(path, local pre-check results)`; runs in worker processes.
+
+    Results are None when the file could not be pre-checked; the check of
+    the file then runs the pre-checks again and reports the error.
+    """
+
+    try:
+        source = Path(root, target.path).read_text(encoding="utf-8")
+        return target.path, precheck_go_source(source)
+    except Exception:
+        return target.path, None
+
+
+def _map_targets(
+    function: Callable[[str, ScanTarget], Tuple[str, T]],
+    root: Path,
+    targets: List[ScanTarget],
+    processes: Optional[int] = None,
+) -> Dict[str, T]:
+    """Run `function` over all targets, in a process pool unless `processes` is 1."""
+
+    processes = processes or os.cpu_count() or 1
+    roots = [str(root)] * len(targets)
+    if processes <= 1 or len(targets) < 2 * processes:
+        return dict(map(function, roots, targets))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        chunksize = max(1, len(targets) // (processes * 8))
+        return dict(pool.map(function, roots, targets, chunksize=chunksize))
+
+
+def hash_targets(root: Path, targets: List[ScanTarget], processes: Optional[int] = None) -> Dict[str, str]:
+    """Hash all targets, in a process pool unless `processes` is 1."""
+
+    return _map_targets(hash_target, root, targets, processes)
+
+
+def precheck_targets(
+    root: Path,
+    targets: List[ScanTarget],
+    processes: Optional[int] = None,
+) -> Dict[str, Optional[List[CheckResult]]]:
+    """Run the local pre-checks of all targets, in a process pool unless `processes` is 1."""
+
+    return _map_targets(precheck_target, root, targets, processes)
+
+
+def scan_model_key(mode: str) -> str:
+    """
+    Return the models a scan in `mode` runs on, as recorded in the manifest.
+
+    "full" mode uses the default model; the per-chunk modes use the
+    escalation model, screened by the triage model when tiering is on.
+    """
+
+    if mode == "full":
+        return settings.model
+    model = tier_model(ESCALATION)
+    return f"{tier_model(TRIAGE)}>{model}" if tiered_enabled() else model
+
+
+async def check_target_results(
+    root: Path,
+    target: ScanTarget,
+    mode: str,
+    local_results: Optional[List[CheckResult]] = None,
+) -> Tuple[str, Dict[str, List[CheckResult]]]:
+    """
+    Check one file locally and with the LLM.
+
+    Args:
+        local_results: Pre-check results computed beforehand (e.g. by
+                       `precheck_targets`); computed here if omitted
+
+    Returns:
+        The findings as markdown, and the structured findings per source:
+        the local pre-check results, plus the model's findings in
+        "findings" mode (other modes only produce markdown from the model)
+    """
+
+    source = Path(root, target.path).read_text(encoding="utf-8")
+    results = precheck_go_source(source) if local_results is None else local_results
+    local = format_findings(results)
+    if mode == "findings":
+        model_results = await acheck_go_findings(source, rule_book=target.kind)
+        report = format_findings(results + model_results, "检查结果") or "无问题\n"
+        return report, {LOCAL: results, MODEL: model_results}
+    if mode == "chunked":
+        report = format_reports(await acheck_go_source(source, rule_book=target.kind))
+    else:
+        docs = Path(root, target.docs_path).read_text(encoding="utf-8") if target.docs_path else None
+        report = await get_chain("code_check_full").ainvoke(
+            {"code": source, "file_kind": target.kind, "docs": docs}
+        )
+    return (f"{local}\n{report}" if local else report), {LOCAL: results}
+
+
+async def check_target(root: Path, target: ScanTarget, mode: str) -> str:
+    """Check one file locally and with the LLM and return the findings as markdown."""
+
+    report, _ = await check_target_results(root, target, mode)
+    return report
+
+
+async def ascan_repository(
+    root: Path,
+    manifest_path: Optional[Path] = None,
+    mode: str = "chunked",
+    max_concurrency: Optional[int] = None,
+    processes: Optional[int] = None,
+    full: bool = False,
+    dry_run: bool = False,
+    store: Optional[FindingsStore] = None,
+) -> ScanSummary:
+    """
+    Check every changed resource / data source file under `root`.
+
+    A file is re-checked when its content (or docs), the rule-book version,
+    the models (see `scan_model_key`) or the check mode differ from its
+    manifest entry, or when `full` is set. Hashing and the local pre-checks
+    run in a process pool. With `dry_run`, changed files are listed but not
+    checked. With a findings `store`, the scan is recorded as a run holding
+    the structured findings of re-checked files (deltas only). Model
+    findings are only recorded, and closed, by "findings" mode scans.
+
+    Args:
+        root: Provider checkout root
+        manifest_path: Manifest file (default: `<root>/.code_checker_manifest.json`)
+        mode: "chunked" (per-chunk checks), "full" (one request per file)
+              or "findings" (per-chunk checks with structured findings)
+        max_concurrency: Files checked at once (default: CODE_CHECKER_BATCH_WORKERS)
+        processes: Worker processes for hashing and pre-checks (default: CPU count)
+        full: Ignore the manifest and check every file
+        dry_run: Only report which files would be checked
+        store: Findings store to record this scan in
+
+    Returns:
+        ScanSummary; the manifest is updated in place
+    """
+
+    if mode not in MODES:
+        raise ValueError(f"Unknown scan mode: {mode!r}")
+    started = time.perf_counter()
+    root = Path(root)
+    manifest = Manifest.load(manifest_path or root / ".code_checker_manifest.json")
+    version = rule_book_version()
+    model = scan_model_key(mode)
+
+    targets = discover(root)
+    hashes = hash_targets(root, targets, processes)
+    summary = ScanSummary(discovered=len(targets))
+    summary.removed = manifest.prune(hashes)
+
+    stale = [
+        target for target in targets
+        if full or not manifest.is_fresh(target.path, hashes[target.path], version, model, mode)
+    ]
+    summary.unchanged = len(targets) - len(stale)
+    if dry_run:
+        summary.checked = [target.path for target in stale]
+        summary.elapsed = time.perf_counter() - started
+        return summary
+
+    run_id = None
+    if store is not None:
+        run_id = summary.run_id = store.begin_run(str(root), mode, model, version)
+        gone = [path for path in store.open_paths() if path not in hashes]
+        summary.fixed_findings += store.remove_files(run_id, gone)
+
+    local_results = precheck_targets(root, stale, processes)
+    semaphore = asyncio.Semaphore(max_concurrency or settings.batch_workers)
+    unsaved = 0
+
+    async def _check(target: ScanTarget) -> None:
+        nonlocal unsaved
+        async with semaphore:
+            try:
+                findings, results = await check_target_results(root, target, mode, local_results[target.path])
+            except Exception as exc:
+                summary.failed[target.path] = f"{type(exc).__name__}: {exc}"
+                return
+        if store is not None:
+            for source, source_results in results.items():
+                new, fixed = store.record_file(run_id, target.path, hashes[target.path], source_results, source)
+                summary.new_findings += new
+                summary.fixed_findings += fixed
+        manifest.record(target.path, hashes[target.path], version, model, mode, findings)
+        summary.checked.append(target.path)
+        unsaved += 1
+        if unsaved >= SAVE_EVERY:
+            manifest.save()
+            unsaved = 0
+
+    try:
+        await asyncio.gather(*(_check(target) for target in stale))
+    finally:
+        manifest.save()
+        if store is not None:
+            store.finish_run(run_id)
+    summary.checked.sort()
+    summary.elapsed = time.perf_counter() - started
+    return summary
+
+
+def scan_repository(root: Path, **kwargs) -> ScanSummary:
+    """Synchronous wrapper of `ascan_repository`."""
+
+    return run_async(ascan_repository(root, **kwargs))
+
+
+__all__ = [
+    "ScanSummary",
+    "hash_target",
+    "hash_targets",
+    "precheck_target",
+    "precheck_targets",
+    "scan_model_key",
+    "check_target",
+    "check_target_results",
+    "ascan_repository",
+    "scan_repository",
+]
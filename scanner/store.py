@@ -0,0 +1,360 @@
+"""
+Indexed SQLite store of findings across scan runs.
+
+Each finding row lives from the run that first reported it (`first_run`)
+until the run whose re-check no longer reported it (`fixed_run`). A run
+only writes deltas: findings that appeared, findings that disappeared,
+and line moves of findings that persist. Files a run did not re-check
+are not touched. This makes "new since run N", "fixed in run N" and
+"top rules" plain indexed queries instead of re-reading reports.
+
+Findings are matched across runs by a fingerprint of source, file, rule
+and message (digits masked, so a shifted line number in the text does not
+count as a new finding), plus an occurrence index for repeats.
+
+Every finding has a source: "local" for the deterministic pre-checks and
+"model" for LLM findings. A run only closes findings of the sources it
+recorded, so a scan mode that does not ask the model for structured
+findings leaves earlier model findings open.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..findings import CheckResult, CheckSeverity
+
+DIGITS_RE = re.compile(r"\d+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id                INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at        REAL NOT NULL,
+    finished_at       REAL,
+    root              TEXT,
+    mode              TEXT,
+    model             TEXT,
+    rule_book_version TEXT
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    fingerprint  TEXT NOT NULL,
+    path         TEXT NOT NULL,
+    source       TEXT NOT NULL DEFAULT 'model',
+    rule         TEXT NOT NULL,
+    severity     TEXT NOT NULL,
+    line         INTEGER,
+    end_line     INTEGER,
+    message      TEXT NOT NULL,
+    suggestion   TEXT,
+    content_hash TEXT NOT NULL,
+    first_run    INTEGER NOT NULL REFERENCES runs (id),
+    fixed_run    INTEGER REFERENCES runs (id)
+);
+CREATE INDEX IF NOT EXISTS findings_open ON findings (path, source, fixed_run);
+CREATE INDEX IF NOT EXISTS findings_rule ON findings (rule, fixed_run);
+CREATE INDEX IF NOT EXISTS findings_severity ON findings (severity, fixed_run);
+CREATE INDEX IF NOT EXISTS findings_content_hash ON findings (content_hash);
+CREATE INDEX IF NOT EXISTS findings_first_run ON findings (first_run);
+CREATE INDEX IF NOT EXISTS findings_fixed_run ON findings (fixed_run);
+"""
+
+LOCAL = "local"
+MODEL = "model"
+
+_COLUMNS = "id, fingerprint, path, source, rule, severity, line, end_line, message, suggestion, content_hash, first_run, fixed_run"
+
+
+@dataclass
+class StoredFinding:
+    """A finding row with the runs it was first and last reported in."""
+
+    id: int
+    fingerprint: str
+    path: str
+    source: str
+    rule: str
+    severity: str
+    line: Optional[int]
+    end_line: Optional[int]
+    message: str
+    suggestion: Optional[str]
+    content_hash: str
+    first_run: int
+    fixed_run: Optional[int]
+
+    def to_result(self) -> CheckResult:
+        return CheckResult(
+            rule_name=self.rule,
+            severity=CheckSeverity(self.severity),
+            message=self.message,
+            line_number=self.line,
+            end_line_number=self.end_line,
+            suggestion=self.suggestion,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "source": self.source,
+            "rule": self.rule,
+            "severity": self.severity,
+            "line": self.line,
+            "end_line": self.end_line,
+            "message": self.message,
+            "suggestion": self.suggestion,
+            "first_run": self.first_run,
+            "fixed_run": self.fixed_run,
+        }
+
+
+def fingerprints(path: str, results: Iterable[CheckResult], source: str = MODEL) -> List[str]:
+    """Return a stable fingerprint per result; repeats get an occurrence index."""
+
+    seen: Counter = Counter()
+    prints = []
+    for result in results:
+        base = "\0".join((source, path, result.rule_name, DIGITS_RE.sub("#", result.message.strip())))
+        seen[base] += 1
+        digest = hashlib.sha256(f"{base}\0{seen[base]}".encode("utf-8")).hexdigest()
+        prints.append(digest[:32])
+    return prints
+
+
+class FindingsStore:
+    """SQLite findings store; one connection per thread, WAL mode."""
+
+    def __init__(self, path: Path):
+        self.path = str(path)
+        self._local = threading.local()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connection()
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(findings)")}
+        if columns and "source" not in columns:
+            # Stores created before findings had a source held model findings
+            conn.execute("ALTER TABLE findings ADD COLUMN source TEXT NOT NULL DEFAULT 'model'")
+            conn.execute("DROP INDEX IF EXISTS findings_open")
+        conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # Writing
+
+    def begin_run(
+        self,
+        root: str = "",
+        mode: str = "",
+        model: str = "",
+        rule_book_version: str = "",
+    ) -> int:
+        """Start a run and return its id."""
+
+        cursor = self._connection().execute(
+            "INSERT INTO runs (started_at, root, mode, model, rule_book_version) VALUES (?, ?, ?, ?, ?)",
+            (time.time(), root, mode, model, rule_book_version),
+        )
+        return cursor.lastrowid
+
+    def finish_run(self, run_id: int) -> None:
+        self._connection().execute("UPDATE runs SET finished_at = ? WHERE id = ?", (time.time(), run_id))
+
+    def record_file(
+        self,
+        run_id: int,
+        path: str,
+        content_hash: str,
+        results: List[CheckResult],
+        source: str = MODEL,
+    ) -> Tuple[int, int]:
+        """
+        Record the findings of a re-checked file, writing only what changed.
+
+        Only open findings of the same `source` can be closed as fixed.
+
+        Returns:
+            `(new, fixed)` finding counts for the file
+        """
+
+        conn = self._connection()
+        prints = fingerprints(path, results, source)
+        current = dict(zip(prints, results))
+        with _transaction(conn):
+            open_rows = {
+                fingerprint: (row_id, line, end_line)
+                for row_id, fingerprint, line, end_line in conn.execute(
+                    "SELECT id, fingerprint, line, end_line FROM findings"
+                    " WHERE path = ? AND source = ? AND fixed_run IS NULL",
+                    (path, source),
+                )
+            }
+            fixed = [row[0] for fingerprint, row in open_rows.items() if fingerprint not in current]
+            conn.executemany(
+                "UPDATE findings SET fixed_run = ? WHERE id = ?",
+                [(run_id, row_id) for row_id in fixed],
+            )
+            moved = [
+                (result.line_number, result.end_line_number, content_hash, open_rows[fingerprint][0])
+                for fingerprint, result in current.items()
+                if fingerprint in open_rows
+                and open_rows[fingerprint][1:] != (result.line_number, result.end_line_number)
+            ]
+            conn.executemany(
+                "UPDATE findings SET line = ?, end_line = ?, content_hash = ? WHERE id = ?", moved
+            )
+            new = [
+                (
+                    fingerprint, path, source, result.rule_name, result.severity.value,
+                    result.line_number, result.end_line_number, result.message,
+                    result.suggestion, content_hash, run_id,
+                )
+                for fingerprint, result in current.items()
+                if fingerprint not in open_rows
+            ]
+            conn.executemany(
+                "INSERT INTO findings (fingerprint, path, source, rule, severity, line, end_line, message,"
+                " suggestion, content_hash, first_run) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                new,
+            )
+        return len(new), len(fixed)
+
+    def remove_files(self, run_id: int, paths: Iterable[str]) -> int:
+        """Mark every open finding of deleted files as fixed; return how many."""
+
+        conn = self._connection()
+        with _transaction(conn):
+            return sum(
+                conn.execute(
+                    "UPDATE findings SET fixed_run = ? WHERE path = ? AND fixed_run IS NULL",
+                    (run_id, path),
+                ).rowcount
+                for path in paths
+            )
+
+    # Querying
+
+    def _select(self, where: str, params: tuple = (), order: str = "path, line") -> List[StoredFinding]:
+        rows = self._connection().execute(
+            f"SELECT {_COLUMNS} FROM findings WHERE {where} ORDER BY {order}", params
+        )
+        return [StoredFinding(*row) for row in rows]
+
+    def latest_run(self) -> Optional[int]:
+        row = self._connection().execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    def runs(self, limit: int = 20) -> List[dict]:
+        """Return the most recent runs, newest first."""
+
+        rows = self._connection().execute(
+            "SELECT id, started_at, finished_at, root, mode, model, rule_book_version"
+            " FROM runs ORDER BY id DESC LIMIT ?",
+            (limit,),
+        )
+        keys = ("id", "started_at", "finished_at", "root", "mode", "model", "rule_book_version")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def open_paths(self) -> List[str]:
+        """Return the files that have open findings."""
+
+        rows = self._connection().execute("SELECT DISTINCT path FROM findings WHERE fixed_run IS NULL")
+        return [row[0] for row in rows]
+
+    def open_findings(
+        self,
+        path: Optional[str] = None,
+        rule: Optional[str] = None,
+        severity: Optional[str] = None,
+    ) -> List[StoredFinding]:
+        """Return the findings currently open, optionally filtered."""
+
+        where = ["fixed_run IS NULL"]
+        params: list = []
+        for column, value in (("path", path), ("rule", rule), ("severity", severity)):
+            if value is not None:
+                where.append(f"{column} = ?")
+                params.append(value)
+        return self._select(" AND ".join(where), tuple(params))
+
+    def new_findings(self, run_id: Optional[int] = None, since: Optional[int] = None) -> List[StoredFinding]:
+        """
+        Return findings first reported in `run_id` (default: the latest run).
+
+        With `since`, return those first reported after run `since` that are
+        still open, i.e. what is new relative to that run.
+        """
+
+        if since is not None:
+            return self._select("first_run > ? AND fixed_run IS NULL", (since,))
+        run_id = run_id if run_id is not None else self.latest_run()
+        return self._select("first_run = ?", (run_id,))
+
+    def fixed_findings(self, run_id: Optional[int] = None, since: Optional[int] = None) -> List[StoredFinding]:
+        """
+        Return findings that disappeared in `run_id` (default: the latest run).
+
+        With `since`, return those open at run `since` that were fixed after it.
+        """
+
+        if since is not None:
+            return self._select("first_run <= ? AND fixed_run > ?", (since, since))
+        run_id = run_id if run_id is not None else self.latest_run()
+        return self._select("fixed_run = ?", (run_id,))
+
+    def top_rules(self, limit: int = 10, severity: Optional[str] = None) -> List[Tuple[str, int]]:
+        """Return `(rule, open finding count)` for the most frequent rules."""
+
+        where, params = "fixed_run IS NULL", ()
+        if severity is not None:
+            where, params = where + " AND severity = ?", (severity,)
+        rows = self._connection().execute(
+            f"SELECT rule, COUNT(*) AS n FROM findings WHERE {where}"
+            " GROUP BY rule ORDER BY n DESC, rule LIMIT ?",
+            params + (limit,),
+        )
+        return [(rule, count) for rule, count in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Return open finding counts per severity."""
+
+        rows = self._connection().execute(
+            "SELECT severity, COUNT(*) FROM findings WHERE fixed_run IS NULL GROUP BY severity"
+        )
+        return dict(rows.fetchall())
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """BEGIN / COMMIT around a block on an autocommit connection."""
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+__all__ = ["LOCAL", "MODEL", "StoredFinding", "FindingsStore", "fingerprints"]
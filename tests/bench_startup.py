@@ -0,0 +1,107 @@
+"""
+Startup benchmark for the lazy chain registry.
+
+Each run starts a fresh interpreter, imports the chains package and builds
+only the translation chain, then reports timings and verifies that none of
+the code check work (rule book reads, output.txt writes, extra model
+clients) happened.
+
+Run from the directory containing the package:
+    python -m code_checker.tests.bench_startup --runs 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).absolute().parent.parent
+PACKAGE_NAME = PACKAGE_DIR.name
+
+PROBE = """
+import json
+import time
+
+t0 = time.perf_counter()
+import {pkg}.chains as chains
+t1 = time.perf_counter()
+chains.get_chain("translation")
+t2 = time.perf_counter()
+
+from {pkg}.prompt_template import (
+    get_code_check_full_prompt,
+    get_code_check_small_prompt,
+)
+
+print(json.dumps({{
+    "import_s": t1 - t0,
+    "first_chain_s": t2 - t1,
+    "built_chains": chains.built_chains(),
+    "code_check_prompts_built": (
+        get_code_check_full_prompt.cache_info().currsize
+        + get_code_check_small_prompt.cache_info().currsize
+    ),
+}}))
+"""
+
+OUTPUT_FILES = [
+    PACKAGE_DIR / "prompt_template" / "code_check_full" / "output.txt",
+    PACKAGE_DIR / "prompt_template" / "code_check_small" / "output.txt",
+]
+
+
+def run_probe() -> dict:
+    """Run the probe in a fresh interpreter and return its measurements."""
+
+    env = dict(os.environ)
+    # Building a chat model needs a key, but no request is ever sent.
+    env.setdefault("QWEN_API_KEY", "bench")
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE.format(pkg=PACKAGE_NAME)],
+        cwd=PACKAGE_DIR.parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure startup cost of a translation-only process."
+    )
+    parser.add_argument("--runs", "-n", type=int, default=5, help="Number of fresh interpreters.")
+    args = parser.parse_args()
+
+    mtimes_before = [p.stat().st_mtime_ns for p in OUTPUT_FILES if p.exists()]
+    samples = [run_probe() for _ in range(args.runs)]
+    mtimes_after = [p.stat().st_mtime_ns for p in OUTPUT_FILES if p.exists()]
+
+    import_s = [s["import_s"] for s in samples]
+    chain_s = [s["first_chain_s"] for s in samples]
+    print(f"runs:                   {args.runs}")
+    print(f"import chains (median): {statistics.median(import_s) * 1000:.1f} ms")
+    print(f"build translation:      {statistics.median(chain_s) * 1000:.1f} ms")
+
+    failures = []
+    for sample in samples:
+        if sample["built_chains"] != ["translation"]:
+            failures.append(f"unexpected chains built: {sample['built_chains']}")
+        if sample["code_check_prompts_built"]:
+            failures.append("code check prompts were built")
+    if mtimes_before != mtimes_after:
+        failures.append("code check output.txt was rewritten")
+
+    if failures:
+        for failure in sorted(set(failures)):
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: no code check work was done")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,85 @@
 Command-line entrypoint for the LangChain code check example.
 """
 
+import argparse
 from pathlib import Path
+from typing import Optional
 
 from ..chains import code_check_full_chain
 from ..config import ensure_api_key
+from ..go_check import format_findings, precheck_go_source, prepend_findings
 
-def code_check_full() -> str:
+DEFAULT_GO_FILE = (
+    Path(__file__).parent.parent
+    / "prompt_template" / "code_check_full" / "resource_huaweicloud_aom_application.go"
+)
+
+
+def build_input(go_file: Path, file_kind: Optional[str] = None, docs_file: Optional[Path] = None) -> dict:
+    """Return the code check chain input for a Go file and optional docs."""
+
+    return {
+        "code": go_file.read_text(encoding="utf-8"),
+        "file_kind": file_kind,
+        "docs": docs_file.read_text(encoding="utf-8") if docs_file else None,
+    }
+
+
+def code_check_full(inputs: dict) -> str:
     """Run the code check chain for the provided code."""
 
     ensure_api_key()
-    return code_check_full_chain.invoke({})
+    return prepend_findings(inputs["code"], code_check_full_chain.invoke(inputs))
+
+
+def code_check_full_stream(inputs: dict, result_path: Path) -> str:
+    """Run the code check chain, printing and writing output as it streams."""
+
+    ensure_api_key()
+    findings = format_findings(precheck_go_source(inputs["code"]))
+    pieces = [findings + "\n"] if findings else []
+    with open(result_path, "w", encoding="utf-8") as result_file:
+        if findings:
+            print(findings, flush=True)
+            result_file.write(pieces[0])
+        for piece in code_check_full_chain.stream(inputs):
+            print(piece, end="", flush=True)
+            result_file.write(piece)
+            result_file.flush()
+            pieces.append(piece)
+    print()
+    return "".join(pieces)
 
 
 def main() -> None:
-    code_check_full_sequence = code_check_full()
+    parser = argparse.ArgumentParser(description="Check a Go file against the rule book.")
+    parser.add_argument("go_file", nargs="?", type=Path, default=DEFAULT_GO_FILE, help="Go file to check.")
+    parser.add_argument(
+        "--kind",
+        "-k",
+        default=None,
+        choices=["resource", "data_source"],
+        help="Rule book to check against (detected from the code by default).",
+    )
+    parser.add_argument("--docs", "-d", type=Path, default=None, help="Markdown docs of the resource.")
+    parser.add_argument(
+        "--stream",
+        "-s",
+        action="store_true",
+        help="Print and write the report incrementally as it is generated.",
+    )
+    args = parser.parse_args()
+
+    inputs = build_input(args.go_file, args.kind, args.docs)
+    result_path = Path(__file__).parent / "result.txt"
+    if args.stream:
+        code_check_full_stream(inputs, result_path)
+        return
+
+    code_check_full_sequence = code_check_full(inputs)
     print(code_check_full_sequence)
     
     # Write result to result.txt
-    result_path = Path(__file__).parent / "result.txt"
     result_path.write_text(code_check_full_sequence, encoding="utf-8")
 
 if __name__ == "__main__":
@@ -0,0 +1,201 @@
+"""
+Command-line entrypoint for the chunked LangChain code check example.
+"""
+
+import argparse
+from pathlib import Path
+
+from ..chains import run_async
+from ..chains.metrics import write_summary
+from ..config import ensure_api_key
+from ..go_check import (
+    astream_go_findings,
+    astream_go_source,
+    check_go_findings,
+    check_go_source,
+    format_findings,
+    format_report_header,
+    format_reports,
+    format_routing_summary,
+    precheck_go_source,
+    prepend_findings,
+)
+
+DEFAULT_GO_FILE = (
+    Path(__file__).parent.parent
+    / "prompt_template" / "code_check_full" / "resource_huaweicloud_aom_application.go"
+)
+
+
+def code_check_chunked(
+    go_file: Path,
+    rule_book: str,
+    concurrency: int,
+    top_k: int = None,
+    tiered: bool = None,
+) -> str:
+    """Check the Go file chunk by chunk and return a markdown report."""
+
+    ensure_api_key()
+    source = go_file.read_text(encoding="utf-8")
+    reports = check_go_source(
+        source, rule_book=rule_book, max_concurrency=concurrency, top_k=top_k, tiered=tiered
+    )
+    summary = format_routing_summary(reports)
+    if summary:
+        print(summary)
+    return prepend_findings(source, format_reports(reports))
+
+
+def code_check_findings(go_file: Path, rule_book: str, concurrency: int, top_k: int = None, tiered: bool = None) -> str:
+    """Check the Go file for structured findings and return them as markdown."""
+
+    ensure_api_key()
+    source = go_file.read_text(encoding="utf-8")
+    results = check_go_findings(
+        source, rule_book=rule_book, max_concurrency=concurrency, top_k=top_k, tiered=tiered
+    )
+    return prepend_findings(source, format_findings(results, "模型检查") or "无问题\n")
+
+
+async def code_check_findings_stream(
+    go_file: Path,
+    rule_book: str,
+    concurrency: int,
+    top_k: int,
+    result_path: Path,
+    tiered: bool = None,
+) -> None:
+    """Print and write each structured finding as soon as it is decoded."""
+
+    ensure_api_key()
+    source = go_file.read_text(encoding="utf-8")
+    with open(result_path, "w", encoding="utf-8") as result_file:
+        findings = format_findings(precheck_go_source(source))
+        if findings:
+            print(findings, flush=True)
+            result_file.write(findings + "\n")
+        results = astream_go_findings(
+            source, rule_book=rule_book, max_concurrency=concurrency, top_k=top_k, tiered=tiered
+        )
+        async for result in results:
+            line = f"- {result}\n"
+            print(line, end="", flush=True)
+            result_file.write(line)
+            result_file.flush()
+
+
+async def code_check_chunked_stream(
+    go_file: Path,
+    rule_book: str,
+    concurrency: int,
+    top_k: int,
+    result_path: Path,
+    tiered: bool = None,
+) -> None:
+    """Print and write each chunk's report as soon as that chunk completes."""
+
+    ensure_api_key()
+    source = go_file.read_text(encoding="utf-8")
+    pending = {}
+    with open(result_path, "w", encoding="utf-8") as result_file:
+        findings = format_findings(precheck_go_source(source))
+        if findings:
+            print(findings, flush=True)
+            result_file.write(findings + "\n")
+        deltas = astream_go_source(
+            source, rule_book=rule_book, max_concurrency=concurrency, top_k=top_k, tiered=tiered
+        )
+        async for delta in deltas:
+            pending.setdefault(delta.index, []).append(delta.text)
+            if not delta.done:
+                continue
+            section = f"{format_report_header(delta.chunk)}{''.join(pending.pop(delta.index)).strip()}\n\n"
+            print(section, end="", flush=True)
+            result_file.write(section)
+            result_file.flush()
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the check selected by the command-line arguments."""
+
+    result_path = Path(__file__).parent / "result.txt"
+    if args.findings and args.stream:
+        run_async(code_check_findings_stream(
+            args.go_file, args.rule_book, args.concurrency, args.top_k, result_path, args.tiered
+        ))
+        return
+    if args.findings:
+        result = code_check_findings(args.go_file, args.rule_book, args.concurrency, args.top_k, args.tiered)
+        print(result)
+        result_path.write_text(result, encoding="utf-8")
+        return
+    if args.stream:
+        run_async(code_check_chunked_stream(
+            args.go_file, args.rule_book, args.concurrency, args.top_k, result_path, args.tiered
+        ))
+        return
+
+    result = code_check_chunked(args.go_file, args.rule_book, args.concurrency, args.top_k, args.tiered)
+    print(result)
+
+    # Write result to result.txt
+    result_path.write_text(result, encoding="utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Check a Go file chunk by chunk with parallel requests."
+    )
+    parser.add_argument("go_file", nargs="?", type=Path, default=DEFAULT_GO_FILE, help="Go file to check.")
+    parser.add_argument(
+        "--rule-book",
+        "-r",
+        default="resource",
+        choices=["resource", "data_source"],
+        help="Rule book to check against.",
+    )
+    parser.add_argument("--concurrency", "-c", type=int, default=None, help="Requests in flight at once.")
+    parser.add_argument(
+        "--top-k",
+        "-k",
+        type=int,
+        default=None,
+        help="Rule sections sent per chunk; 0 sends the whole rule book (the default for escalated chunks with --tiered).",
+    )
+    parser.add_argument(
+        "--tiered",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Screen chunks with the triage model first (default: CODE_CHECKER_TIERED).",
+    )
+    parser.add_argument(
+        "--findings",
+        "-f",
+        action="store_true",
+        help="Ask for structured JSON findings instead of free-form reports.",
+    )
+    parser.add_argument(
+        "--stream",
+        "-s",
+        action="store_true",
+        help="Print and write each chunk's report as soon as it completes.",
+    )
+    parser.add_argument(
+        "--metrics",
+        "-m",
+        type=Path,
+        default=None,
+        help="Write latency, token, retry and cache metrics of the run to this JSON file.",
+    )
+    args = parser.parse_args()
+
+    try:
+        run(args)
+    finally:
+        if args.metrics:
+            write_summary(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
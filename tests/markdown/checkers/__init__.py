@@ -7,16 +7,25 @@ structures for different check rules:
 - Tree-based checkers: For complex rules that require context (e.g., structure validation)
 """
 
-from .base import CheckRule, CheckResult
-from .line_checker import LineBasedChecker
+from ....findings import CheckResult
+from .base import CheckRule
+from .document import ParsedDocument
+from .line_checker import LineBasedChecker, BatchedLineChecker
 from .tree_checker import TreeBasedChecker
+from .visitor import TreeVisitor
 from .manager import CheckerManager
+from .incremental import IncrementalChecker, BlockResultStore
 
 __all__ = [
     "CheckRule",
     "CheckResult",
+    "ParsedDocument",
     "LineBasedChecker",
+    "BatchedLineChecker",
     "TreeBasedChecker",
+    "TreeVisitor",
     "CheckerManager",
+    "IncrementalChecker",
+    "BlockResultStore",
 ]
 
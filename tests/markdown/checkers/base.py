@@ -2,48 +2,11 @@
 Base classes for markdown checkers.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
 from typing import List, Optional, Any
-from enum import Enum
 
-
-class CheckSeverity(Enum):
-    """Severity level of a check result."""
-    ERROR = "error"
-    WARNING = "warning"
-    INFO = "info"
-
-
-@dataclass
-class CheckResult:
-    """Result of a single check."""
-    rule_name: str
-    severity: CheckSeverity
-    message: str
-    line_number: Optional[int] = None
-    column_number: Optional[int] = None
-    context: Optional[str] = None
-    suggestion: Optional[str] = None
-
-    def __str__(self) -> str:
-        """String representation of the check result."""
-        location = ""
-        if self.line_number is not None:
-            location = f"Line {self.line_number}"
-            if self.column_number is not None:
-                location += f", Column {self.column_number}"
-            location += ": "
-        
-        result = f"[{self.severity.value.upper()}] {self.rule_name}: {location}{self.message}"
-        
-        if self.suggestion:
-            result += f"\n  Suggestion: {self.suggestion}"
-        
-        if self.context:
-            result += f"\n  Context: {self.context}"
-        
-        return result
+from ....findings import CheckResult
 
 
 class CheckRule(ABC):
@@ -70,3 +33,19 @@ class CheckRule(ABC):
         """
         pass
 
+    async def acheck(self, *args, semaphore: Optional[asyncio.Semaphore] = None, **kwargs) -> List[CheckResult]:
+        """
+        Async variant of `check`.
+
+        The default implementation runs `check` in a worker thread, holding
+        one slot of `semaphore` (if given) while it runs. Subclasses with
+        async-capable check functions override this to run concurrently.
+
+        Returns:
+            List of CheckResult objects
+        """
+        if semaphore is None:
+            return await asyncio.to_thread(self.check, *args, **kwargs)
+        async with semaphore:
+            return await asyncio.to_thread(self.check, *args, **kwargs)
+
@@ -0,0 +1,108 @@
+"""
+Parsed markdown document shared by all checkers.
+
+The manager parses the content once and hands the same `ParsedDocument` to
+every registered checker, so adding rules does not add parses. The AST is
+built on first access, so runs with only line-based checkers never parse.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple, Union
+
+from marko.block import Document
+from marko.element import Element
+
+from .positions import SourceSpan, normalize_line_endings, parse_with_positions
+from ..utils.tree_viewer import NodeTextCache
+
+
+@dataclass
+class ParsedDocument:
+    """Markdown content together with its AST, lines and line offsets."""
+    content: str
+    lines: List[str]
+    line_offsets: List[int]
+    _ast: Optional[Document] = field(default=None, repr=False)
+    text_cache: NodeTextCache = field(default_factory=NodeTextCache, repr=False)
+
+    @classmethod
+    def parse(cls, content: str) -> "ParsedDocument":
+        """
+        Parse markdown content into a shared document.
+        
+        Args:
+            content: The markdown content to parse
+            
+        Returns:
+            ParsedDocument holding the lines and the offset of the first
+            character of each line; the AST is parsed on first access
+        """
+        lines = content.split('\n')
+        # Offsets follow marko's normalized text so node spans map onto them
+        offsets = []
+        offset = 0
+        for line in normalize_line_endings(content).split('\n'):
+            offsets.append(offset)
+            offset += len(line) + 1
+        return cls(content=content, lines=lines, line_offsets=offsets)
+
+    @property
+    def ast(self) -> Document:
+        """The marko AST with source spans, parsed on first access and shared afterwards."""
+        if self._ast is None:
+            self._ast = parse_with_positions(self.content)
+        return self._ast
+
+    def text_of(self, node: Element) -> str:
+        """Return the extracted text of `node`, memoized for this document."""
+        return self.text_cache.text(node)
+
+    @classmethod
+    def of(cls, document: Union[str, "ParsedDocument"]) -> "ParsedDocument":
+        """Return `document` as a ParsedDocument, parsing it if it is a string."""
+        if isinstance(document, ParsedDocument):
+            return document
+        return cls.parse(document)
+
+    def line_of_offset(self, offset: int) -> int:
+        """Return the 1-based line number containing character `offset`."""
+        return bisect_right(self.line_offsets, offset)
+
+    def position_of(self, offset: int) -> Tuple[int, int]:
+        """Return the 1-based (line, column) of character `offset` in O(log n)."""
+        line = self.line_of_offset(offset)
+        return line, offset - self.line_offsets[line - 1] + 1
+
+    def span_of(self, node: Element) -> Optional[SourceSpan]:
+        """
+        Return the source span recorded for `node`, or None if it has none.
+        
+        The end position is that of the last character of the node; a
+        trailing newline belongs to the line it terminates, so a block does
+        not spill onto the next line.
+        """
+        offsets = getattr(node, 'source_span', None)
+        if not offsets:
+            return None
+        start, end = offsets
+        start_line, start_column = self.position_of(start)
+        end_line, end_column = self.position_of(max(start, end - 1))
+        return SourceSpan(start_line, start_column, end_line, end_column)
+
+    def locate(self, node: Element, ancestors: Iterable[Element] = ()) -> Optional[SourceSpan]:
+        """
+        Return the span of `node`, falling back to its nearest ancestor with one.
+        
+        Args:
+            node: The node to locate
+            ancestors: Nodes from the root down to the node's parent
+        """
+        span = self.span_of(node)
+        if span is not None:
+            return span
+        for ancestor in reversed(list(ancestors)):
+            span = self.span_of(ancestor)
+            if span is not None:
+                return span
+        return None
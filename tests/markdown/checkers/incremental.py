@@ -0,0 +1,316 @@
+"""
+Incremental checking at block granularity.
+
+The document is split into top-level blocks, with each list item a block
+of its own (a block owns the blank lines that follow it, so blocks cover
+every line). Each block is hashed together
+with its heading path, and the results of every line-based rule are stored
+per block with line numbers relative to the block start. On the next run
+only blocks whose hash changed are re-checked; results of unchanged blocks
+are reused with their line numbers shifted to the block's new position.
+
+Tree-based rules look across blocks (e.g. heading levels), so they still
+run over the whole document, in one cheap traversal without LLM calls.
+"""
+
+import asyncio
+import hashlib
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Set, Tuple
+
+from marko.block import Heading, List as MarkoList
+
+from ....findings import CheckResult
+from .document import ParsedDocument
+from .manager import CheckerManager
+
+# (rule name, block hash)
+BlockKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class Block:
+    """A top-level block of a document and the context it is hashed with."""
+    index: int
+    start_line: int  # 1-based, inclusive
+    end_line: int  # 1-based, inclusive; trailing blank lines included
+    heading_path: Tuple[str, ...]
+    digest: str
+
+    @property
+    def line_count(self) -> int:
+        return self.end_line - self.start_line + 1
+
+
+def _top_level_nodes(document: ParsedDocument):
+    """Yield top-level blocks; a list yields its items, which are edited one by one."""
+    for node in document.ast.children:
+        if isinstance(node, MarkoList) and node.children:
+            yield from node.children
+        else:
+            yield node
+
+
+def split_blocks(document: ParsedDocument) -> List[Block]:
+    """
+    Split a document into top-level blocks covering every line.
+    
+    Args:
+        document: The parsed document
+        
+    Returns:
+        Blocks in document order; lines before the first block form a
+        block of their own
+    """
+    starts: List[Tuple[int, Optional[object]]] = []
+    for node in _top_level_nodes(document):
+        span = document.span_of(node)
+        if span is None:
+            continue
+        if starts and span.start_line <= starts[-1][0]:
+            continue
+        starts.append((span.start_line, node))
+    if not starts or starts[0][0] > 1:
+        starts.insert(0, (1, None))
+
+    blocks: List[Block] = []
+    headings: List[Tuple[int, str]] = []
+    total = len(document.lines)
+    for index, (start, node) in enumerate(starts):
+        end = starts[index + 1][0] - 1 if index + 1 < len(starts) else total
+        if isinstance(node, Heading):
+            while headings and headings[-1][0] >= node.level:
+                headings.pop()
+        path = tuple(text for _, text in headings)
+        digest = hashlib.sha256()
+        digest.update("\x1f".join(path).encode("utf-8"))
+        digest.update(b"\x1e")
+        digest.update("\n".join(document.lines[start - 1:end]).encode("utf-8"))
+        blocks.append(Block(index, start, end, path, digest.hexdigest()))
+        if isinstance(node, Heading):
+            headings.append((node.level, document.text_of(node).strip()))
+    return blocks
+
+
+def _shift(result: CheckResult, delta: int) -> CheckResult:
+    """Return `result` with its line numbers moved by `delta`."""
+    if result.line_number is None or delta == 0:
+        return result
+    end = result.end_line_number + delta if result.end_line_number is not None else None
+    return replace(result, line_number=result.line_number + delta, end_line_number=end)
+
+
+class BlockResultStore:
+    """
+    Results of line-based rules per (rule, block hash), with relative lines.
+    
+    Line numbers are stored relative to the block start (0 = first line of
+    the block) so they can be moved when the block moves. The store keeps
+    at most `max_entries` entries, evicting the least recently used.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[BlockKey, List[CheckResult]]" = OrderedDict()
+
+    def get(self, rule_name: str, block: Block) -> Optional[List[CheckResult]]:
+        """Return the stored results of `rule_name` for `block`, placed at its lines."""
+        key = (rule_name, block.digest)
+        results = self._entries.get(key)
+        if results is None:
+            return None
+        self._entries.move_to_end(key)
+        return [_shift(result, block.start_line) for result in results]
+
+    def put(self, rule_name: str, block: Block, results: List[CheckResult]) -> None:
+        """Store the results of `rule_name` for `block` (absolute line numbers)."""
+        key = (rule_name, block.digest)
+        self._entries[key] = [_shift(result, -block.start_line) for result in results]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass
+class IncrementalStats:
+    """What the last incremental run re-evaluated."""
+    blocks: int = 0
+    reused: int = 0  # (rule, block) pairs served from the store
+    evaluated: int = 0  # (rule, block) pairs checked again
+
+
+class IncrementalChecker:
+    """
+    Run a manager's checkers, re-checking only blocks that changed.
+    
+    Changed blocks of a rule are checked together as one excerpt document,
+    so a batched LLM rule still makes one call for a one-paragraph edit.
+    """
+
+    def __init__(self, manager: CheckerManager, store: Optional[BlockResultStore] = None):
+        """
+        Initialize an incremental checker.
+        
+        Args:
+            manager: Manager holding the registered checkers
+            store: Block result store; keep it across runs (a new one is
+                   created if omitted)
+        """
+        self.manager = manager
+        self.store = store or BlockResultStore()
+        self.stats = IncrementalStats()
+
+    def check(self, content: str, checker_names: List[str] = None) -> List[CheckResult]:
+        """
+        Check `content`, reusing stored results of unchanged blocks.
+        
+        Args:
+            content: The markdown content to check
+            checker_names: Optional list of checker names to run
+            
+        Returns:
+            The same results, in the same order, as `CheckerManager.check`
+        """
+        document, blocks, line_checkers = self._prepare(content, checker_names)
+        all_results: List[CheckResult] = []
+        for checker in line_checkers:
+            cached, stale = self._lookup(checker.name, blocks)
+            fresh: List[CheckResult] = []
+            excerpt, line_map = self._excerpt(document, stale)
+            if stale:
+                fresh = checker.check(excerpt)
+            all_results.extend(self._merge(checker.name, blocks, cached, stale, fresh, line_map))
+        for results in self.manager._tree_visitor(checker_names).visit(document):
+            all_results.extend(results)
+        return all_results
+
+    async def acheck(
+        self,
+        content: str,
+        checker_names: List[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[CheckResult]:
+        """Async variant of `check`, bounded like `CheckerManager.acheck`."""
+        document, blocks, line_checkers = self._prepare(content, checker_names)
+        semaphore = asyncio.Semaphore(max_concurrency or self.manager.max_concurrency)
+
+        async def run_line_checker(checker) -> List[CheckResult]:
+            cached, stale = self._lookup(checker.name, blocks)
+            excerpt, line_map = self._excerpt(document, stale)
+            fresh = await checker.acheck(excerpt, semaphore=semaphore) if stale else []
+            return self._merge(checker.name, blocks, cached, stale, fresh, line_map)
+
+        async def run_tree_checkers() -> List[List[CheckResult]]:
+            visitor = self.manager._tree_visitor(checker_names)
+            if not visitor.checkers:
+                return []
+            async with semaphore:
+                return await asyncio.to_thread(visitor.visit, document)
+
+        *line_results, tree_results = await asyncio.gather(
+            *(run_line_checker(checker) for checker in line_checkers),
+            run_tree_checkers(),
+        )
+        return [result for results in [*line_results, *tree_results] for result in results]
+
+    def _prepare(self, content: str, checker_names: Optional[List[str]]):
+        document = ParsedDocument.parse(content)
+        blocks = split_blocks(document)
+        line_checkers = [
+            checker
+            for checker in self.manager.line_checkers
+            if checker_names is None or checker.name in checker_names
+        ]
+        self.stats = IncrementalStats(blocks=len(blocks))
+        return document, blocks, line_checkers
+
+    def _lookup(self, rule_name: str, blocks: List[Block]):
+        """Split blocks into stored results and blocks that need a check."""
+        cached: Dict[int, List[CheckResult]] = {}
+        stale: List[Block] = []
+        for block in blocks:
+            results = self.store.get(rule_name, block)
+            if results is None:
+                stale.append(block)
+            else:
+                cached[block.index] = results
+        self.stats.reused += len(cached)
+        self.stats.evaluated += len(stale)
+        return cached, stale
+
+    @staticmethod
+    def _excerpt(document: ParsedDocument, blocks: List[Block]) -> Tuple[ParsedDocument, List[int]]:
+        """
+        Return a document made of the lines of `blocks` only.
+        
+        Returns:
+            The excerpt and, for each of its lines, the original line number
+        """
+        lines: List[str] = []
+        line_map: List[int] = []
+        for block in blocks:
+            lines.extend(document.lines[block.start_line - 1:block.end_line])
+            line_map.extend(range(block.start_line, block.end_line + 1))
+        return ParsedDocument.parse("\n".join(lines)), line_map
+
+    def _merge(
+        self,
+        rule_name: str,
+        blocks: List[Block],
+        cached: Dict[int, List[CheckResult]],
+        stale: List[Block],
+        fresh: List[CheckResult],
+        line_map: List[int],
+    ) -> List[CheckResult]:
+        """
+        Map fresh excerpt results back, store them per block and merge in order.
+
+        Blocks covered by a failed result (e.g. a batch whose model answer
+        did not parse) are not stored, so they are checked again next run.
+        """
+        by_block: Dict[int, List[CheckResult]] = {block.index: [] for block in stale}
+        unplaced: List[CheckResult] = []
+        failed: Set[int] = set()
+        starts = [block.start_line for block in blocks]
+        for result in fresh:
+            if result.line_number is None or not 1 <= result.line_number <= len(line_map):
+                # Not tied to a line: report, never store
+                unplaced.append(result)
+                continue
+            line = line_map[result.line_number - 1]
+            index = _block_index(starts, line)
+            if result.failed:
+                end = min(result.end_line_number or result.line_number, len(line_map))
+                last = line_map[end - 1]
+                failed.update(range(index, _block_index(starts, last) + 1))
+                placed = replace(result, line_number=line, end_line_number=last)
+            else:
+                placed = _shift(result, line - result.line_number)
+            by_block.setdefault(index, []).append(placed)
+        for block in stale:
+            if block.index not in failed:
+                self.store.put(rule_name, block, by_block[block.index])
+
+        merged: List[CheckResult] = []
+        for block in blocks:
+            merged.extend(cached.get(block.index) or by_block.get(block.index, []))
+        return merged + unplaced
+
+
+def _block_index(starts: List[int], line: int) -> int:
+    """Return the index of the block containing `line`."""
+    return bisect_right(starts, line) - 1
+
+
+__all__ = [
+    "Block",
+    "BlockResultStore",
+    "IncrementalChecker",
+    "IncrementalStats",
+    "split_blocks",
+]
@@ -7,8 +7,24 @@ This checker is suitable for rules like:
 - Line-level validation
 """
 
-from typing import List, Callable, Optional
-from .base import CheckRule, CheckResult
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, List, Callable, Optional, Tuple, Union
+from ....findings import CheckResult
+from .base import CheckRule
+from .document import ParsedDocument
+
+# A candidate line as (line_number, line_content).
+NumberedLine = Tuple[int, str]
+
+
+async def _bounded(semaphore: Optional[asyncio.Semaphore], awaitable: Awaitable):
+    """Await `awaitable` while holding one slot of `semaphore` (if given)."""
+    if semaphore is None:
+        return await awaitable
+    async with semaphore:
+        return await awaitable
 
 
 class LineBasedChecker(CheckRule):
@@ -23,7 +39,7 @@ class LineBasedChecker(CheckRule):
         self,
         name: str,
         description: str,
-        check_function: Callable[[str, int], Optional[CheckResult]]
+        check_function: Callable[[str, int], Union[Optional[CheckResult], Awaitable[Optional[CheckResult]]]]
     ):
         """
         Initialize a line-based checker.
@@ -32,23 +48,28 @@ class LineBasedChecker(CheckRule):
             name: Name of the check rule
             description: Description of what this rule checks
             check_function: Function that takes (line_content, line_number) and
-                          returns CheckResult or None
+                          returns CheckResult or None. May be an async
+                          function, in which case lines are checked
+                          concurrently by `acheck`.
         """
         super().__init__(name, description)
         self.check_function = check_function
     
-    def check(self, content: str) -> List[CheckResult]:
+    def check(self, content: Union[str, ParsedDocument]) -> List[CheckResult]:
         """
         Check the content line by line.
         
         Args:
-            content: The markdown content to check
+            content: The markdown content to check, or a parsed document
             
         Returns:
             List of CheckResult objects
         """
+        if inspect.iscoroutinefunction(self.check_function):
+            return asyncio.run(self.acheck(content))
+
         results = []
-        lines = content.split('\n')
+        lines = ParsedDocument.of(content).lines
         
         for line_num, line in enumerate(lines, start=1):
             result = self.check_function(line, line_num)
@@ -57,3 +78,153 @@ class LineBasedChecker(CheckRule):
         
         return results
 
+    async def acheck(
+        self,
+        content: Union[str, ParsedDocument],
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> List[CheckResult]:
+        """
+        Check the content line by line, concurrently for async check functions.
+
+        Args:
+            content: The markdown content to check, or a parsed document
+            semaphore: Optional semaphore bounding concurrent line checks
+
+        Returns:
+            List of CheckResult objects in line order
+        """
+        if not inspect.iscoroutinefunction(self.check_function):
+            return await super().acheck(content, semaphore=semaphore)
+
+        lines = ParsedDocument.of(content).lines
+        results = await asyncio.gather(*(
+            _bounded(semaphore, self.check_function(line, line_num))
+            for line_num, line in enumerate(lines, start=1)
+        ))
+        return [result for result in results if result]
+
+
+class BatchedLineChecker(LineBasedChecker):
+    """
+    Line checker whose candidate lines are judged together in batches.
+
+    Suitable for LLM-backed rules: a cheap `candidate_function` marks the
+    lines worth judging, and `batch_function` judges a whole batch of
+    numbered lines at once (e.g. one prompt covering many lines), so a
+    document costs a handful of calls instead of one per line.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        candidate_function: Callable[[str, int], bool],
+        batch_function: Callable[[List[NumberedLine]], List[CheckResult]],
+        batch_size: int = 40,
+        max_concurrency: int = 4,
+        async_batch_function: Optional[Callable[[List[NumberedLine]], Awaitable[List[CheckResult]]]] = None,
+    ):
+        """
+        Initialize a batched line checker.
+
+        Args:
+            name: Name of the check rule
+            description: Description of what this rule checks
+            candidate_function: Function that takes (line_content, line_number)
+                              and returns True if the line must be judged
+            batch_function: Function that takes a list of (line_number,
+                          line_content) and returns CheckResult objects whose
+                          line_number refers to lines of that batch
+            batch_size: Maximum number of lines judged by one call
+            max_concurrency: Maximum number of batches judged at the same time
+            async_batch_function: Optional async variant of `batch_function`
+                                used by `acheck`
+        """
+        super().__init__(name, description, self._check_single_line)
+        self.candidate_function = candidate_function
+        self.batch_function = batch_function
+        self.async_batch_function = async_batch_function
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+
+    def _check_single_line(self, line: str, line_num: int) -> Optional[CheckResult]:
+        """Judge one line as a batch of one (keeps the per-line API usable)."""
+        if not self.candidate_function(line, line_num):
+            return None
+        results = self.batch_function([(line_num, line)])
+        return results[0] if results else None
+
+    def collect_candidates(self, content: Union[str, ParsedDocument]) -> List[NumberedLine]:
+        """Return the (line_number, line_content) pairs that need judging."""
+        return [
+            (line_num, line)
+            for line_num, line in enumerate(ParsedDocument.of(content).lines, start=1)
+            if self.candidate_function(line, line_num)
+        ]
+
+    def make_batches(self, candidates: List[NumberedLine]) -> List[List[NumberedLine]]:
+        """Split candidate lines into batches of at most `batch_size` lines."""
+        return [
+            candidates[i:i + self.batch_size]
+            for i in range(0, len(candidates), self.batch_size)
+        ]
+
+    @staticmethod
+    def _merge(batch_results: List[List[CheckResult]]) -> List[CheckResult]:
+        """Flatten per-batch results into one list ordered by line number."""
+        results = [result for batch in batch_results for result in batch]
+        results.sort(key=lambda r: r.line_number or 0)
+        return results
+
+    def check(self, content: Union[str, ParsedDocument]) -> List[CheckResult]:
+        """
+        Check the content by judging candidate lines in batches.
+
+        Args:
+            content: The markdown content to check, or a parsed document
+
+        Returns:
+            List of CheckResult objects ordered by line number
+        """
+        batches = self.make_batches(self.collect_candidates(content))
+        if not batches:
+            return []
+
+        workers = min(self.max_concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batch_results = list(executor.map(self.batch_function, batches))
+
+        return self._merge(batch_results)
+
+    async def acheck(
+        self,
+        content: Union[str, ParsedDocument],
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> List[CheckResult]:
+        """
+        Judge candidate batches concurrently on the running event loop.
+
+        Args:
+            content: The markdown content to check, or a parsed document
+            semaphore: Optional semaphore bounding concurrent batch calls;
+                      defaults to one sized by `max_concurrency`
+
+        Returns:
+            List of CheckResult objects ordered by line number
+        """
+        batches = self.make_batches(self.collect_candidates(content))
+        if not batches:
+            return []
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        def judge(batch: List[NumberedLine]) -> Awaitable[List[CheckResult]]:
+            if self.async_batch_function is not None:
+                return self.async_batch_function(batch)
+            return asyncio.to_thread(self.batch_function, batch)
+
+        batch_results = await asyncio.gather(*(
+            _bounded(semaphore, judge(batch)) for batch in batches
+        ))
+        return self._merge(batch_results)
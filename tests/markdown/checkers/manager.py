@@ -2,10 +2,14 @@
 Checker manager for coordinating different types of checkers.
 """
 
-from typing import List, Dict
-from .base import CheckRule, CheckResult
+import asyncio
+from typing import List, Dict, Optional
+from ....findings import CheckResult
+from .base import CheckRule
+from .document import ParsedDocument
 from .line_checker import LineBasedChecker
 from .tree_checker import TreeBasedChecker
+from .visitor import TreeVisitor
 
 
 class CheckerManager:
@@ -17,8 +21,15 @@ class CheckerManager:
     for each checker type.
     """
     
-    def __init__(self):
-        """Initialize the checker manager."""
+    def __init__(self, max_concurrency: int = 8):
+        """
+        Initialize the checker manager.
+        
+        Args:
+            max_concurrency: Default limit of concurrent checker calls
+                           (e.g. LLM requests) made by `acheck`
+        """
+        self.max_concurrency = max_concurrency
         self.line_checkers: List[LineBasedChecker] = []
         self.tree_checkers: List[TreeBasedChecker] = []
         self.all_checkers: Dict[str, CheckRule] = {}
@@ -55,21 +66,72 @@ class CheckerManager:
         Returns:
             List of all CheckResult objects from all checkers
         """
+        # Parse once; every checker shares the same document and AST
+        document = ParsedDocument.parse(content)
         all_results = []
         
         # Run line-based checkers
         for checker in self.line_checkers:
             if checker_names is None or checker.name in checker_names:
-                results = checker.check(content)
+                results = checker.check(document)
                 all_results.extend(results)
         
-        # Run tree-based checkers
-        for checker in self.tree_checkers:
-            if checker_names is None or checker.name in checker_names:
-                results = checker.check(content)
-                all_results.extend(results)
+        # Run tree-based checkers in a single traversal of the shared AST
+        for results in self._tree_visitor(checker_names).visit(document):
+            all_results.extend(results)
         
         return all_results
+
+    async def acheck(
+        self,
+        content: str,
+        checker_names: List[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[CheckResult]:
+        """
+        Run registered checkers concurrently on asyncio.
+        
+        Independent checkers, and the LLM-backed calls inside them, share one
+        semaphore so at most `max_concurrency` calls are in flight. Results
+        are returned in the same order as `check`.
+        
+        Args:
+            content: The markdown content to check
+            checker_names: Optional list of checker names to run.
+                          If None, runs all registered checkers.
+            max_concurrency: Optional override of the manager's limit
+        
+        Returns:
+            List of all CheckResult objects from all checkers
+        """
+        document = ParsedDocument.parse(content)
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        line_checkers = [
+            checker
+            for checker in self.line_checkers
+            if checker_names is None or checker.name in checker_names
+        ]
+        
+        async def run_tree_checkers() -> List[List[CheckResult]]:
+            visitor = self._tree_visitor(checker_names)
+            if not visitor.checkers:
+                return []
+            async with semaphore:
+                return await asyncio.to_thread(visitor.visit, document)
+        
+        *line_results, tree_results = await asyncio.gather(
+            *(checker.acheck(document, semaphore=semaphore) for checker in line_checkers),
+            run_tree_checkers(),
+        )
+        return [result for results in [*line_results, *tree_results] for result in results]
+
+    def _tree_visitor(self, checker_names: Optional[List[str]] = None) -> TreeVisitor:
+        """Build a visitor over the selected tree-based checkers."""
+        return TreeVisitor([
+            checker
+            for checker in self.tree_checkers
+            if checker_names is None or checker.name in checker_names
+        ])
     
     def get_checker_info(self) -> Dict[str, str]:
         """
@@ -3,10 +3,9 @@ Heading hierarchy checking rule.
 """
 
 from ..tree_checker import TreeBasedChecker
-from ..base import CheckResult, CheckSeverity
+from .....findings import CheckResult, CheckSeverity
 from typing import List
-import marko
-from ...utils.tree_viewer import extract_text_from_node
+from marko.element import Element
 
 
 def create_heading_hierarchy_checker() -> TreeBasedChecker:
@@ -15,48 +14,38 @@ def create_heading_hierarchy_checker() -> TreeBasedChecker:
     
     Checks that headings follow a proper hierarchy (h1 -> h2 -> h3, etc.)
     """
-    def check_heading_hierarchy(node: marko.ast.Node, context: dict) -> List[CheckResult]:
-        """Check heading hierarchy."""
+    def check_heading_hierarchy(node: Element, context: dict) -> List[CheckResult]:
+        """Check heading hierarchy against the nearest preceding heading."""
         results = []
-        node_type = type(node).__name__
+        current_level = getattr(node, 'level', None)
+        if not current_level:
+            return results
         
-        if node_type == "Heading":
-            current_level = node.level if hasattr(node, 'level') else None
-            parent = context.get('parent')
-            
-            if current_level and parent:
-                # Check parent heading level
-                parent_level = None
-                if hasattr(parent, 'level'):
-                    parent_level = parent.level
-                else:
-                    # Walk up the tree to find the nearest heading
-                    walk_parent = context.get('parent')
-                    while walk_parent:
-                        if hasattr(walk_parent, 'level'):
-                            parent_level = walk_parent.level
-                            break
-                        # Get parent's parent from context
-                        if 'parent' in context:
-                            walk_parent = context.get('parent')
-                        else:
-                            break
-                
-                if parent_level is not None:
-                    # Heading should not skip levels (e.g., h1 -> h3)
-                    if current_level > parent_level + 1:
-                        results.append(CheckResult(
-                            rule_name="Heading Hierarchy",
-                            severity=CheckSeverity.ERROR,
-                            message=f"Heading level {current_level} should not skip from level {parent_level}",
-                            context=f"Parent: {extract_text_from_node(parent)[:50]}, Current: {extract_text_from_node(node)[:50]}"
-                        ))
+        # Headings are siblings in the AST; walk back to the previous one
+        siblings = context.get('siblings', [])
+        previous = None
+        for index in range(context.get('index', -1) - 1, -1, -1):
+            if type(siblings[index]).__name__ == "Heading":
+                previous = siblings[index]
+                break
+        
+        if previous is not None:
+            text_of = context['document'].text_of
+            previous_level = previous.level
+            # Heading should not skip levels (e.g., h1 -> h3)
+            if current_level > previous_level + 1:
+                results.append(CheckResult(
+                    rule_name="Heading Hierarchy",
+                    severity=CheckSeverity.ERROR,
+                    message=f"Heading level {current_level} should not skip from level {previous_level}",
+                    context=f"Previous: {text_of(previous)[:50]}, Current: {text_of(node)[:50]}"
+                ))
         
         return results
     
     return TreeBasedChecker(
         name="Heading Hierarchy Checker",
         description="Checks that headings follow a proper hierarchy without skipping levels",
-        check_function=check_heading_hierarchy
+        check_function=check_heading_hierarchy,
+        node_types=["Heading"],
     )
-
@@ -2,106 +2,230 @@
 Number format checking rule.
 """
 
-from ..line_checker import LineBasedChecker
-from ..base import CheckResult, CheckSeverity
-from typing import Optional
+from ..line_checker import BatchedLineChecker, NumberedLine
+from .....findings import CheckResult, CheckSeverity
+from typing import List, Optional
 from code_checker.prompt_template import build_chat_prompt
-from code_checker.chains.models import build_chat_model
+from code_checker.chains.budget import make_context_guard
+from code_checker.chains.findings import FindingsStreamDecoder, repair_json
+from code_checker.chains.metrics import instrument
 from code_checker.chains.parsers import default_parser
+from code_checker.chains.routing import ESCALATION, TRIAGE, build_tier_model, routing_stats, tier_model, tiered_enabled
 from code_checker.config import ensure_api_key
+import json
 import re
 
-def create_number_format_checker() -> LineBasedChecker:
+# 搜索特征，当前行含有数字
+NUMBER_PATTERN = re.compile(r'\b([1-9]+)\b')
+
+
+def build_number_format_chain():
+    """
+    Build the chain that judges a batch of numbered lines in one call.
+
+    The prompt takes a single `lines` variable holding lines formatted as
+    `L<line_number>: <content>` and asks for a JSON array of verdicts.
+    """
+    role = "code checker"
+    task = "检查Markdown文本是否符合要求"
+    context = """
+    数字格式化要求：
+      1. 该目标只针对 `数字内容` 进行约束，请结合上下文判断是否需要格式化
+        例如时间戳，版本号，网址IP等不需要格式化
+      2. `数字内容` 需要每3位使用逗号分隔，例如 1234567 应该格式化为 1,234,567
+      3. `数字内容` 需要使用 ` 或 ** 包裹，例如 `123,456` 或 **123,456**
+    """
+    instructions = [
+        "逐行检查输入中的每一行，每行以 `L<行号>:` 开头",
+        "只返回不符合要求的行",
+    ]
+    limitations = [
+        "仅遵从传入的规范"
+    ]
+    input = ["{lines}"]
+    output_requirements = {
+        "format": "json",
+        "description": (
+            "只输出一个 JSON 数组，不要输出其他内容。数组元素格式为 "
+            '{{"line": 行号, "number": "原始数字", "message": "问题说明", "suggestion": "修改建议"}}，'
+            "没有问题时输出 []"
+        ),
+    }
+
+    examples = {}
+
+    prompt = build_chat_prompt(role, task, context, instructions, limitations, input, output_requirements, examples)
+    return prompt | make_context_guard(tier_model(ESCALATION)) | build_tier_model(ESCALATION) | default_parser
+
+
+def build_number_triage_chain():
+    """
+    Build the cheap screening chain for tiered checks.
+
+    The triage model only names the lines that may break the number format
+    rule; those lines alone are then judged by the full chain.
+    """
+    role = "code checker"
+    task = "快速筛选可能需要格式化数字的行"
+    context = "要求：大于 999 的 `数字内容` 需要每3位使用逗号分隔，并使用 ` 或 ** 包裹；时间戳、版本号、网址IP等除外"
+    instructions = ["每行以 `L<行号>:` 开头，只要可能不符合要求就列出该行"]
+    limitations = ["不要解释原因"]
+    input = ["{lines}"]
+    output_requirements = {
+        "format": "json",
+        "description": "只输出行号组成的 JSON 数组，例如 [3, 7]，没有可疑行时输出 []",
+    }
+
+    prompt = build_chat_prompt(role, task, context, instructions, limitations, input, output_requirements, {})
+    return prompt | make_context_guard(tier_model(TRIAGE)) | build_tier_model(TRIAGE) | default_parser
+
+
+def parse_verdicts(response: str) -> Optional[list]:
+    """
+    Parse the JSON verdict array from a model response, or None if malformed.
+
+    When the array as a whole does not parse, each verdict object is
+    decoded (and repaired) on its own, so one broken verdict does not
+    discard the rest of the batch.
+    """
+    text = response.strip()
+    # Models often wrap JSON in a ```json fence
+    fence = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fence:
+        text = fence.group(1).strip()
+    try:
+        verdicts = json.loads(text)
+    except json.JSONDecodeError:
+        decoder = FindingsStreamDecoder()
+        items = [repair_json(raw) for raw in decoder.feed(text) + decoder.close()]
+        verdicts = [item for item in items if item is not None] or None
+    return verdicts if isinstance(verdicts, list) else None
+
+
+def create_number_format_checker(
+    batch_size: int = 40,
+    max_concurrency: int = 4,
+    tiered: Optional[bool] = None,
+) -> BatchedLineChecker:
     """
     Create a checker for number format validation.
     
     Checks that numbers in markdown follow the format: 1,234 (with commas for thousands).
+    Lines containing numbers are judged by the LLM in batches of `batch_size`
+    lines, with at most `max_concurrency` batches in flight. With `tiered`
+    (default: CODE_CHECKER_TIERED) a cheap model screens each batch first
+    and only the lines it flags are judged by the escalation model.
     """
-    def check_number_format(line: str, line_num: int) -> Optional[CheckResult]:
-        """
-        Check if numbers in the line follow the correct format.
-        
-        This is a simple example - you can customize the pattern as needed.
+    chain = None
+    triage_chain = None
+    tiered = tiered_enabled(tiered)
+
+    def get_chain():
+        nonlocal chain
+        if chain is None:
+            ensure_api_key()
+            chain = instrument("number_format", build_number_format_chain())
+        return chain
+
+    def get_triage_chain():
+        nonlocal triage_chain
+        if triage_chain is None:
+            ensure_api_key()
+            triage_chain = instrument("number_format_triage", build_number_triage_chain())
+        return triage_chain
+
+    def has_number(line: str, line_num: int) -> bool:
+        """如果当前行不含有数字，则跳过"""
+        return NUMBER_PATTERN.search(line) is not None
+
+    def to_input(batch: List[NumberedLine]) -> dict:
+        return {"lines": "\n".join(f"L{line_num}: {line}" for line_num, line in batch)}
+
+    def escalate(batch: List[NumberedLine], response: Optional[str]) -> List[NumberedLine]:
+        """Keep the lines the triage model flagged; all of them if its answer is unusable."""
+        flagged = parse_verdicts(response) if response is not None else None
+        failed = flagged is None
+        if not failed:
+            flagged = {item for item in flagged if isinstance(item, int)}
+        kept = [item for item in batch if failed or item[0] in flagged]
+        for line_num, _ in batch:
+            routing_stats.record("markdown_line", failed or line_num in flagged, failed)
+        return kept
+
+    def check_number_format(batch: List[NumberedLine]) -> List[CheckResult]:
+        """Check if numbers in a batch of lines follow the correct format."""
+        if tiered:
+            try:
+                response = get_triage_chain().invoke(to_input(batch))
+            except Exception:
+                response = None
+            batch = escalate(batch, response)
+            if not batch:
+                return []
+        return to_results(batch, get_chain().invoke(to_input(batch)))
+
+    async def acheck_number_format(batch: List[NumberedLine]) -> List[CheckResult]:
+        """Async variant of `check_number_format`."""
+        if tiered:
+            try:
+                response = await get_triage_chain().ainvoke(to_input(batch))
+            except Exception:
+                response = None
+            batch = escalate(batch, response)
+            if not batch:
+                return []
+        return to_results(batch, await get_chain().ainvoke(to_input(batch)))
+
+    def to_results(batch: List[NumberedLine], response: str) -> List[CheckResult]:
         """
+        Map model verdicts back to `line_number`.
         
-        # 搜索特征，当前行含有数字
-        pattern = r'\b([1-9]+)\b'
-        re.compile(pattern)
-        
-        # 如果当前行不含有数字，则跳过
-        if not re.search(pattern, line):
-            return None
-         
-        # 如果含有数字，则检查数字是否符合格式
-        role = "code checker"
-        task = "检查Markdown文本是否符合要求"
-        context = """
-        数字格式化要求：
-          1. 该目标只针对 `数字内容` 进行约束，请结合上下文判断是否需要格式化
-            例如时间戳，版本号，网址IP等不需要格式化
-          2. `数字内容` 需要每3位使用逗号分隔，例如 1234567 应该格式化为 1,234,567
-          3. `数字内容` 需要使用 ` 或 ** 包裹，例如 `123,456` 或 **123,456**
+        Verdicts for lines that are not part of the batch are ignored.
         """
-        instructions = []
-        limitations = [
-            "仅遵从传入的规范"
-        ]
-        input = [line]
-        output_requirements = {
-            "format": "json",
-        }
-
-        examples = {}
-
-        prompt = build_chat_prompt(role, task, context, instructions, limitations, input, output_requirements, examples)
-        chain = prompt | build_chat_model() | default_parser
-
-        ensure_api_key()
-        # 打印检查结果
-        response = chain.invoke({})
-        print("--------------------------------")
-        print(line)
-        print(response)
-        print("--------------------------------")
-        return None
-
-        # matches = re.finditer(pattern, line)
-        # for match in matches:
-        #     number = match.group(1)
-        #     # Skip if it's part of a URL, code block, or other special context
-        #     start_pos = match.start()
-        #     end_pos = match.end()
-            
-        #     # Check if it's in a code span or code block
-        #     before = line[:start_pos]
-        #     after = line[end_pos:]
-            
-        #     # Skip if surrounded by backticks (code)
-        #     if '`' in before[-10:] or '`' in after[:10]:
-        #         continue
-            
-        #     # Skip if it's part of a URL
-        #     if 'http://' in before[-20:] or 'https://' in before[-20:]:
-        #         continue
-            
-        #     # Format the number with commas
-        #     formatted = format(int(number), ',')
-            
-        #     return CheckResult(
-        #         rule_name="Number Format",
-        #         severity=CheckSeverity.WARNING,
-        #         message=f"Number '{number}' should be formatted with commas: '{formatted}'",
-        #         line_number=line_num,
-        #         column_number=start_pos + 1,
-        #         context=line.strip(),
-        #         suggestion=f"Replace '{number}' with '{formatted}'"
-        #     )
-        
-        return None
+        lines = dict(batch)
+        verdicts = parse_verdicts(response)
+        if verdicts is None:
+            return [CheckResult(
+                rule_name="Number Format",
+                severity=CheckSeverity.INFO,
+                message=f"Could not parse model verdicts for lines {batch[0][0]}-{batch[-1][0]}",
+                line_number=batch[0][0],
+                end_line_number=batch[-1][0],
+                context=response.strip()[:200],
+                failed=True,
+            )]
+
+        results = []
+        for verdict in verdicts:
+            if not isinstance(verdict, dict):
+                continue
+            try:
+                line_num = int(verdict.get("line"))
+            except (TypeError, ValueError):
+                continue
+            if line_num not in lines:
+                continue
+
+            line = lines[line_num]
+            number = str(verdict.get("number") or "")
+            column = line.find(number) + 1 if number and number in line else None
+            results.append(CheckResult(
+                rule_name="Number Format",
+                severity=CheckSeverity.WARNING,
+                message=str(verdict.get("message") or f"Number '{number}' is not formatted correctly"),
+                line_number=line_num,
+                column_number=column,
+                context=line.strip(),
+                suggestion=verdict.get("suggestion") or None,
+            ))
+        return results
     
-    return LineBasedChecker(
+    return BatchedLineChecker(
         name="Number Format Checker",
         description="Checks that large numbers are formatted with comma separators",
-        check_function=check_number_format
+        candidate_function=has_number,
+        batch_function=check_number_format,
+        batch_size=batch_size,
+        max_concurrency=max_concurrency,
+        async_batch_function=acheck_number_format,
     )
-
@@ -8,10 +8,12 @@ This checker is suitable for rules like:
 - Context-dependent formatting
 """
 
-import marko
-from typing import List, Callable, Optional, Any
-from .base import CheckRule, CheckResult, CheckSeverity
-from ..utils.tree_viewer import extract_text_from_node
+from marko.element import Element
+from typing import List, Callable, Optional, Any, Sequence, Union
+from ....findings import CheckResult, CheckSeverity
+from .base import CheckRule
+from .document import ParsedDocument
+from .visitor import TreeVisitor
 
 
 class TreeBasedChecker(CheckRule):
@@ -26,7 +28,8 @@ class TreeBasedChecker(CheckRule):
         self,
         name: str,
         description: str,
-        check_function: Callable[[marko.ast.Node, dict], List[CheckResult]]
+        check_function: Callable[[Element, dict], List[CheckResult]],
+        node_types: Optional[Sequence[Union[str, type]]] = None
     ):
         """
         Initialize a tree-based checker.
@@ -37,97 +40,23 @@ class TreeBasedChecker(CheckRule):
             check_function: Function that takes (node, context) and returns
                           a list of CheckResult objects.
                           Context dict can contain parent nodes, siblings, etc.
+            node_types: Node types (names such as "Heading" or marko element
+                       classes) the check function subscribes to. None means
+                       every node is passed to the check function.
         """
         super().__init__(name, description)
         self.check_function = check_function
+        self.node_types = list(node_types) if node_types is not None else None
     
-    def check(self, content: str) -> List[CheckResult]:
+    def check(self, content: Union[str, ParsedDocument]) -> List[CheckResult]:
         """
         Check the content by traversing the AST tree.
         
         Args:
-            content: The markdown content to check
+            content: The markdown content to check, or a document already
+                    parsed by the manager (its AST is shared, not re-parsed)
             
         Returns:
             List of CheckResult objects
         """
-        # Parse markdown to AST
-        doc = marko.parse(content)
-        
-        # Get original lines for line number mapping
-        lines = content.split('\n')
-        
-        # Traverse tree and collect results
-        results = []
-        self._traverse(doc, None, lines, results, {})
-        
-        return results
-    
-    def _traverse(
-        self,
-        node: marko.ast.Node,
-        parent: Optional[marko.ast.Node],
-        lines: List[str],
-        results: List[CheckResult],
-        context: dict
-    ):
-        """
-        Recursively traverse the AST tree and run checks.
-        
-        Args:
-            node: Current AST node
-            parent: Parent node (None for root)
-            lines: Original content lines for line number mapping
-            results: List to accumulate check results
-            context: Context dictionary for passing information between nodes
-        """
-        # Build context for this node
-        node_context = {
-            'parent': parent,
-            'lines': lines,
-            **context
-        }
-        
-        # Run check function on this node
-        node_results = self.check_function(node, node_context)
-        
-        # Add line numbers to results if not already set
-        for result in node_results:
-            if result.line_number is None:
-                # Try to extract line number from node if possible
-                # This is a simplified version - you may need to enhance it
-                result.line_number = self._get_node_line_number(node, lines)
-            results.append(result)
-        
-        # Traverse children
-        if hasattr(node, 'children') and node.children:
-            for child in node.children:
-                if isinstance(child, marko.ast.Node):
-                    # Update context with sibling information
-                    siblings = [c for c in node.children if isinstance(c, marko.ast.Node)]
-                    node_context['siblings'] = siblings
-                    node_context['index'] = siblings.index(child) if child in siblings else -1
-                    
-                    self._traverse(child, node, lines, results, node_context)
-    
-    def _get_node_line_number(self, node: marko.ast.Node, lines: List[str]) -> Optional[int]:
-        """
-        Try to extract line number from node.
-        
-        This is a simplified implementation. You may need to enhance it
-        based on the marko library's capabilities.
-        """
-        # Try to get text from node
-        text = extract_text_from_node(node)
-        if not text:
-            return None
-        
-        # Find the first line containing this text
-        for i, line in enumerate(lines, start=1):
-            if text[:50] in line:  # Match first 50 chars
-                return i
-        
-        return None
-
-
-
+        return TreeVisitor([self]).visit(content)[0]
@@ -0,0 +1,155 @@
+"""
+Single-pass visitor engine for tree-based checkers.
+
+Tree checkers subscribe to node types (`Heading`, `CodeBlock`, `ListItem`,
+...). The engine walks the AST once and calls only the checkers subscribed
+to each node's type, so the cost is O(nodes + matches) instead of
+O(rules x nodes).
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Sequence, Union
+
+from marko.element import Element
+
+from ....findings import CheckResult
+from .document import ParsedDocument
+
+if TYPE_CHECKING:
+    from .tree_checker import TreeBasedChecker
+
+
+def node_type_name(node_type: Union[str, type]) -> str:
+    """Return the type name used for subscriptions (e.g. `Heading`)."""
+    return node_type if isinstance(node_type, str) else node_type.__name__
+
+
+class TreeVisitor:
+    """
+    Walks a parsed document once and dispatches nodes to subscribed checkers.
+    
+    Checkers whose `node_types` is None are called for every node.
+    """
+    
+    def __init__(self, checkers: Sequence["TreeBasedChecker"]):
+        """
+        Initialize the visitor and build the dispatch table.
+        
+        Args:
+            checkers: Tree-based checkers to run, in result order
+        """
+        self.checkers = list(checkers)
+        self.dispatch: Dict[str, List[int]] = {}
+        self.wildcard: List[int] = []
+        
+        for index, checker in enumerate(self.checkers):
+            if checker.node_types is None:
+                self.wildcard.append(index)
+                continue
+            for node_type in checker.node_types:
+                self.dispatch.setdefault(node_type_name(node_type), []).append(index)
+    
+    def visit(self, content: Union[str, ParsedDocument]) -> List[List[CheckResult]]:
+        """
+        Run all checkers over the document in a single traversal.
+        
+        Args:
+            content: The markdown content, or a parsed document
+            
+        Returns:
+            One list of CheckResult objects per checker, in checker order
+        """
+        document = ParsedDocument.of(content)
+        results: List[List[CheckResult]] = [[] for _ in self.checkers]
+        if self.checkers:
+            self._walk(document, results)
+        return results
+    
+    def _handlers(self, node: Element) -> List[int]:
+        """Return indices of the checkers subscribed to `node`'s type."""
+        subscribed = self.dispatch.get(type(node).__name__)
+        if not subscribed:
+            return self.wildcard
+        if not self.wildcard:
+            return subscribed
+        return sorted(subscribed + self.wildcard)
+    
+    @staticmethod
+    def _set_location(
+        result: CheckResult,
+        node: Element,
+        ancestors: List[Element],
+        document: ParsedDocument,
+    ):
+        """Fill in a result's location from the node's recorded source span."""
+        span = document.locate(node, ancestors)
+        if span is None:
+            return
+        result.line_number = span.start_line
+        if result.column_number is None:
+            result.column_number = span.start_column
+        if result.end_line_number is None:
+            result.end_line_number = span.end_line
+    
+    def _walk(self, document: ParsedDocument, results: List[List[CheckResult]]):
+        """
+        Walk the AST iteratively in document order and run subscribed checks.
+        
+        Uses an explicit stack instead of recursion, so deep documents do not
+        hit the recursion limit. Each parent's element children are collected
+        once and shared as `siblings`, indices are assigned when children are
+        pushed, and a single context dict is updated in place for every node.
+        The context (and its `ancestors` list) is only valid during the call
+        to the check function; copy what you need to keep.
+        
+        Context keys:
+            parent: Parent node (None for root)
+            ancestors: Nodes from the root down to the parent
+            siblings: Element children of the parent ([] for root)
+            index: Index of the node among its siblings (-1 for root)
+            lines: Original content lines
+            document: The parsed document being checked
+        
+        Args:
+            document: The parsed document being checked
+            results: Per-checker lists accumulating check results
+        """
+        ancestors: List[Element] = []
+        context = {
+            'parent': None,
+            'ancestors': ancestors,
+            'siblings': [],
+            'index': -1,
+            'lines': document.lines,
+            'document': document,
+        }
+        no_siblings: List[Element] = []
+        # Entries are (node, depth, siblings, index)
+        stack = [(document.ast, 0, no_siblings, -1)]
+        
+        while stack:
+            node, depth, siblings, index = stack.pop()
+            # Drop ancestors of previously visited subtrees
+            del ancestors[depth:]
+            
+            handlers = self._handlers(node)
+            if handlers:
+                context['parent'] = ancestors[-1] if ancestors else None
+                context['siblings'] = siblings
+                context['index'] = index
+                for checker_index in handlers:
+                    checker = self.checkers[checker_index]
+                    for result in checker.check_function(node, context):
+                        if result.line_number is None:
+                            self._set_location(result, node, ancestors, document)
+                        results[checker_index].append(result)
+            
+            children = getattr(node, 'children', None)
+            if not children or isinstance(children, str):
+                continue
+            elements = [c for c in children if isinstance(c, Element)]
+            if not elements:
+                continue
+            ancestors.append(node)
+            # Push in reverse so children are visited in document order
+            for child_index in range(len(elements) - 1, -1, -1):
+                stack.append((elements[child_index], depth + 1, elements, child_index))
@@ -2,8 +2,10 @@
 Utils for markdown processing.
 """
 
-from .tree_viewer import print_ast_tree
+from .tree_viewer import print_ast_tree, extract_text_from_node, NodeTextCache
 
 __all__ = [
     "print_ast_tree",
+    "extract_text_from_node",
+    "NodeTextCache",
 ]
@@ -1,9 +1,10 @@
-def get_node_preview(node) -> str:
+def get_node_preview(node, cache: "NodeTextCache" = None) -> str:
     """
     Get a preview string for a node to display in the tree.
     
     Args:
         node: The AST node
+        cache: Optional text cache shared across the whole tree
         
     Returns:
         str: Preview string
@@ -16,7 +17,7 @@ def get_node_preview(node) -> str:
         if hasattr(node, "level"):
             preview_parts.append(f"level={node.level}")
         if hasattr(node, "children") and node.children:
-            text = extract_text_from_node(node)
+            text = extract_text_from_node(node, cache)
             if text:
                 # preview_parts.append(f'"{text[:40]}"')
                 preview_parts.append(f'"{text}"')
@@ -26,7 +27,7 @@ def get_node_preview(node) -> str:
         if hasattr(node, "lang") and node.lang:
             preview_parts.append(f"lang={node.lang}")
         if hasattr(node, "children") and node.children:
-            text = extract_text_from_node(node)
+            text = extract_text_from_node(node, cache)
             if text:
                 # preview_parts.append(f"({len(text)} chars)")
                 preview_parts.append(f'"{text}"')
@@ -34,14 +35,14 @@ def get_node_preview(node) -> str:
     # For ListItem, show marker if available
     elif node_type == "ListItem":
         if hasattr(node, "children") and node.children:
-            text = extract_text_from_node(node)
+            text = extract_text_from_node(node, cache)
             if text:
                 # preview_parts.append(f'"{text[:30]}"')
                 preview_parts.append(f'"{text}"')
     
     # For Paragraph and other text nodes
     elif hasattr(node, "children") and node.children:
-        text = extract_text_from_node(node)
+        text = extract_text_from_node(node, cache)
         if text:
             # preview = text[:50].replace("\n", " ").strip()
             # if len(text) > 50:
@@ -61,19 +62,62 @@ def get_node_preview(node) -> str:
         preview_parts.append(f"({len(node.children)} children)")
     
     return ": " + ", ".join(preview_parts) if preview_parts else ""
-    return ": " + ", ".join(preview_parts) if preview_parts else ""
 
 
-def extract_text_from_node(node) -> str:
+class NodeTextCache:
     """
-    Recursively extract text content from a node and its children.
+    Per-document cache of node text, keyed by node identity.
     
-    Args:
-        node: The AST node
-        
-    Returns:
-        str: Extracted text content
+    Text is computed bottom-up once for a whole subtree, so every node's
+    text costs O(size of its own children) instead of a full subtree walk
+    per call. The cache keeps its roots alive so identities stay valid;
+    drop the cache (e.g. with its document) to free it.
     """
+    
+    def __init__(self):
+        self._texts = {}
+        self._roots = []
+    
+    def text(self, node) -> str:
+        """Return the extracted text of `node`, filling the cache if needed."""
+        text = self._texts.get(id(node))
+        if text is None:
+            self._fill(node)
+            text = self._texts[id(node)]
+        return text
+    
+    def _fill(self, root) -> None:
+        """Compute the text of `root` and all uncached descendants, bottom-up."""
+        self._roots.append(root)
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in self._texts:
+                continue
+            if not expanded:
+                stack.append((node, True))
+                for child in _text_children(node):
+                    if id(child) not in self._texts:
+                        stack.append((child, False))
+                continue
+            self._texts[id(node)] = _join_text(node, self._texts)
+
+
+def _text_children(node) -> list:
+    """Children whose own extracted text is needed to build `node`'s text."""
+    children = getattr(node, "children", None)
+    if not children or isinstance(children, str):
+        return []
+    return [
+        child for child in children
+        if not isinstance(child, str)
+        and hasattr(child, "children")
+        and type(child).__name__ != "RawText"
+    ]
+
+
+def _join_text(node, texts: dict) -> str:
+    """Build the text of `node` from the already extracted text of its children."""
     if not hasattr(node, "children"):
         return ""
     
@@ -87,15 +131,31 @@ def extract_text_from_node(node) -> str:
                 if child.children:
                     text_parts.extend(str(c) for c in child.children if isinstance(c, str))
             else:
-                # Recursively extract from other nodes
-                text_parts.append(extract_text_from_node(child))
+                text_parts.append(texts[id(child)])
         elif hasattr(child, "__str__"):
             text_parts.append(str(child))
     
     return "".join(text_parts).strip()
 
 
-def print_ast_tree(node, prefix: str = "", is_last: bool = True, file=None) -> None:
+def extract_text_from_node(node, cache: NodeTextCache = None) -> str:
+    """
+    Extract text content from a node and its children.
+    
+    Args:
+        node: The AST node
+        cache: Optional per-document text cache; pass the document's cache
+               to share extracted text between checkers and the tree viewer
+        
+    Returns:
+        str: Extracted text content
+    """
+    if cache is None:
+        cache = NodeTextCache()
+    return cache.text(node)
+
+
+def print_ast_tree(node, prefix: str = "", is_last: bool = True, file=None, cache: NodeTextCache = None) -> None:
     """
     Recursively print AST tree structure in a tree-like format.
     
@@ -103,7 +163,11 @@ def print_ast_tree(node, prefix: str = "", is_last: bool = True, file=None) -> N
         node: The AST node to print
         prefix: Current prefix string for tree visualization
         is_last: Whether this is the last child of its parent
+        cache: Optional text cache; one is created for the whole tree if omitted
     """
+    if cache is None:
+        cache = NodeTextCache()
+
     # Determine the connector symbol
     connector = "└── " if is_last else "├── "
     
@@ -111,7 +175,7 @@ def print_ast_tree(node, prefix: str = "", is_last: bool = True, file=None) -> N
     node_type = type(node).__name__
     
     # Get preview information
-    content_preview = get_node_preview(node)
+    content_preview = get_node_preview(node, cache)
     
     # Print current node
     if file:
@@ -131,7 +195,7 @@ def print_ast_tree(node, prefix: str = "", is_last: bool = True, file=None) -> N
             if node_type == "str":
                 continue
             is_last_child = (i == len(children) - 1)
-            print_ast_tree(child, new_prefix, is_last_child, file)
+            print_ast_tree(child, new_prefix, is_last_child, file, cache)
 
-__all__ = ["print_ast_tree"]
+__all__ = ["print_ast_tree", "extract_text_from_node", "NodeTextCache"]
 
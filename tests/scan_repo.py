@@ -0,0 +1,97 @@
+"""
+Command-line entrypoint for scanning a terraform-provider-huaweicloud checkout.
+
+Only files whose content, docs, rule books, model or mode changed since the
+last scan are sent to the model; the rest reuse findings from the manifest.
+Structured findings of each run go to a SQLite findings store, which can be
+queried for new / fixed findings and the most frequent rules.
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from ..chains.metrics import write_summary
+from ..config import ensure_api_key
+from ..scanner import FindingsStore, Manifest, scan_repository
+
+
+def write_findings(manifest_path: Path, paths, output: Path) -> None:
+    """Write the findings of `paths` from the manifest as one markdown file."""
+
+    manifest = Manifest.load(manifest_path)
+    sections = [
+        f"# {path}\n\n{manifest.entries[path].findings.strip()}\n"
+        for path in paths
+        if path in manifest.entries
+    ]
+    output.write_text("\n".join(sections), encoding="utf-8")
+
+
+def report_store(store: FindingsStore, run_id: int, args: argparse.Namespace) -> None:
+    """Print the new / fixed findings of `run_id` and the top rules, as requested."""
+
+    findings = []
+    if args.new:
+        findings += [("NEW", finding) for finding in store.new_findings(run_id)]
+    if args.fixed:
+        findings += [("FIXED", finding) for finding in store.fixed_findings(run_id)]
+    for label, finding in findings:
+        print(f"{label} {finding.path}:{finding.line or '-'} [{finding.severity}] {finding.rule}: {finding.message}")
+    if args.top_rules:
+        for rule, count in store.top_rules(args.top_rules):
+            print(f"{count:6d}  {rule}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Incrementally check resource and data source files of a provider checkout."
+    )
+    parser.add_argument("root", type=Path, help="Provider checkout root.")
+    parser.add_argument("--manifest", "-m", type=Path, default=None, help="Manifest file (default: <root>/.code_checker_manifest.json).")
+    parser.add_argument("--mode", default="chunked", choices=["chunked", "full", "findings"], help="Check per chunk, one request per file, or per chunk with structured findings.")
+    parser.add_argument("--concurrency", "-c", type=int, default=None, help="Files checked at once.")
+    parser.add_argument("--processes", "-p", type=int, default=None, help="Worker processes for hashing.")
+    parser.add_argument("--full", action="store_true", help="Ignore the manifest and check every file.")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the files that would be checked.")
+    parser.add_argument("--output", "-o", type=Path, default=None, help="Write findings of checked files to this markdown file.")
+    parser.add_argument("--store", "-s", type=Path, default=None, help="Findings store (default: <root>/.code_checker_findings.sqlite3).")
+    parser.add_argument("--new", action="store_true", help="Print findings new in this run.")
+    parser.add_argument("--fixed", action="store_true", help="Print findings fixed in this run.")
+    parser.add_argument("--top-rules", type=int, default=0, help="Print the N rules with the most open findings.")
+    parser.add_argument("--metrics", type=Path, default=None, help="Write latency, token, retry and cache metrics of the run to this JSON file.")
+    args = parser.parse_args()
+
+    if not args.dry_run:
+        ensure_api_key()
+    manifest_path = args.manifest or args.root / ".code_checker_manifest.json"
+    store = None if args.dry_run else FindingsStore(args.store or args.root / ".code_checker_findings.sqlite3")
+    summary = scan_repository(
+        args.root,
+        manifest_path=manifest_path,
+        mode=args.mode,
+        max_concurrency=args.concurrency,
+        processes=args.processes,
+        full=args.full,
+        dry_run=args.dry_run,
+        store=store,
+    )
+
+    if args.dry_run:
+        print("\n".join(summary.checked))
+    for path, error in sorted(summary.failed.items()):
+        print(f"FAILED {path}: {error}")
+    print(json.dumps(summary.to_dict(), ensure_ascii=False))
+
+    if args.output and not args.dry_run:
+        write_findings(manifest_path, summary.checked, args.output)
+
+    if store is not None:
+        report_store(store, summary.run_id, args)
+        store.close()
+    if args.metrics and not args.dry_run:
+        write_summary(args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Tests of the context guard and window fitting."""
+
+from pathlib import Path
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+
+from ..chains import budget
+from ..chains.budget import ContextBudgetExceeded, make_context_guard
+from ..config import settings
+from ..go_check import runner
+from ..go_check.chunker import chunk_go_source
+from ..prompt_template import get_code_check_chunk_prompt
+
+SAMPLE = Path(__file__).resolve().parent.parent / "prompt_template" / "code_check_full" / "resource_huaweicloud_aom_application.go"
+PROMPT = ChatPromptTemplate.from_messages([("system", "Check the text."), ("user", "{text}")])
+
+
+def test_guard_uses_the_window_of_its_model():
+    # Fits qwen-plus (128k) but not qwen-max (32k)
+    value = PROMPT.invoke({"text": " word" * 40000})
+    assert make_context_guard("qwen-plus").invoke(value) is value
+    with pytest.raises(ContextBudgetExceeded) as exc_info:
+        make_context_guard("qwen-max").invoke(value)
+    assert exc_info.value.budget.window == 32768
+
+
+def test_guard_passes_small_prompts():
+    value = PROMPT.invoke({"text": "hello"})
+    assert make_context_guard("qwen-max").invoke(value) is value
+
+
+def test_fit_chunk_splits_oversized_chunks(monkeypatch):
+    monkeypatch.setattr(runner, "rules_for_chunk", lambda chunk, rule_book="resource", top_k=None: "rules")
+    monkeypatch.setattr(budget, "context_window", lambda model=None: settings.reserved_output_tokens + 700)
+    chunk = chunk_go_source(SAMPLE.read_text(encoding="utf-8"))[1]
+
+    pairs = runner.fit_chunk(chunk)
+    parts = [part for part, _ in pairs]
+    assert len(parts) > 1
+    assert parts[0].start_line == chunk.start_line and parts[-1].end_line == chunk.end_line
+    assert all(a.end_line + 1 == b.start_line for a, b in zip(parts, parts[1:]))
+    for part, inputs in pairs:
+        assert budget.prompt_budget(get_code_check_chunk_prompt(), inputs).fits or part.line_count == 1
@@ -0,0 +1,39 @@
+"""Tests of the Go chunker."""
+
+from pathlib import Path
+
+from ..go_check.chunker import chunk_go_source, split_chunk
+
+SAMPLE = Path(__file__).resolve().parent.parent / "prompt_template" / "code_check_full" / "resource_huaweicloud_aom_application.go"
+
+
+def test_sample_file_spans():
+    chunks = chunk_go_source(SAMPLE.read_text(encoding="utf-8"))
+    assert [(chunk.kind, chunk.name, chunk.start_line, chunk.end_line) for chunk in chunks] == [
+        ("header", "package and imports", 1, 17),
+        ("schema", "ResourceAomApplication", 19, 98),
+        ("crud", "ResourceAomApplicationCreate", 100, 142),
+        ("crud", "ResourceAomApplicationRead", 144, 183),
+        ("crud", "ResourceAomApplicationUpdate", 185, 215),
+        ("crud", "ResourceAomApplicationDelete", 217, 242),
+        ("helper", "getAppByName", 244, 287),
+    ]
+
+
+def test_chunk_text_matches_its_span():
+    source = SAMPLE.read_text(encoding="utf-8")
+    lines = source.split("\n")
+    for chunk in chunk_go_source(source):
+        assert chunk.text == "\n".join(lines[chunk.start_line - 1:chunk.end_line])
+    schema = chunk_go_source(source)[1]
+    # The @API doc comments belong to the schema function
+    assert schema.text.startswith("// @API CMDB POST /v1/applications")
+    assert schema.numbered_text().split("\n")[0] == "  19 | // @API CMDB POST /v1/applications"
+
+
+def test_split_chunk_halves_keep_lines():
+    chunk = chunk_go_source(SAMPLE.read_text(encoding="utf-8"))[2]
+    parts = split_chunk(chunk)
+    assert parts[0].start_line == chunk.start_line and parts[-1].end_line == chunk.end_line
+    assert all(a.end_line + 1 == b.start_line for a, b in zip(parts, parts[1:]))
+    assert "\n".join(part.text for part in parts) == chunk.text
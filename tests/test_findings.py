@@ -0,0 +1,13 @@
+"""Tests of structured findings parsing."""
+
+from ..chains.findings import parse_findings
+
+
+def test_empty_wrapper_has_no_findings():
+    assert parse_findings('{"findings": []}') == []
+    assert parse_findings('```json\n{"findings": [\n]}\n```') == []
+
+
+def test_wrapper_yields_its_findings():
+    results = parse_findings('{"findings": [{"rule": "r", "message": "m", "line": [3, 5]}]}')
+    assert [(r.rule_name, r.line_number, r.end_line_number) for r in results] == [("r", 3, 5)]
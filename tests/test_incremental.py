@@ -0,0 +1,116 @@
+"""Tests of incremental markdown checking."""
+
+import asyncio
+
+from ..findings import CheckResult, CheckSeverity
+from ..tests.markdown.checkers.incremental import IncrementalChecker
+from ..tests.markdown.checkers.line_checker import BatchedLineChecker
+from ..tests.markdown.checkers.manager import CheckerManager
+from ..tests.markdown.checkers.tree_checker import TreeBasedChecker
+
+CONTENT = "# Title\n\nSold 1234 units.\n\nKept 99 units.\n\n## Part\n\nMoved 5678 units.\n"
+
+
+def _number_checker(calls, fail_first=False):
+    def judge(batch):
+        calls.append([line_num for line_num, _ in batch])
+        if fail_first and len(calls) == 1:
+            return [CheckResult(
+                rule_name="Numbers",
+                severity=CheckSeverity.INFO,
+                message="Could not parse model verdicts",
+                line_number=batch[0][0],
+                end_line_number=batch[-1][0],
+                failed=True,
+            )]
+        return [
+            CheckResult(rule_name="Numbers", severity=CheckSeverity.WARNING, message=line, line_number=line_num)
+            for line_num, line in batch
+            if any(len(word) > 3 and word.isdigit() for word in line.split())
+        ]
+
+    return BatchedLineChecker(
+        name="Numbers",
+        description="Flags unformatted large numbers",
+        candidate_function=lambda line, line_num: any(char.isdigit() for char in line),
+        batch_function=judge,
+    )
+
+
+def _manager(checker):
+    manager = CheckerManager()
+    manager.register_line_checker(checker)
+    return manager
+
+
+def _lines(results):
+    return [(result.line_number, result.message) for result in results]
+
+
+def test_failed_batch_is_reported_and_not_stored():
+    calls = []
+    checker = IncrementalChecker(_manager(_number_checker(calls, fail_first=True)))
+
+    failed = checker.check(CONTENT)
+    assert [(r.line_number, r.end_line_number, r.failed) for r in failed] == [(3, 9, True)]
+    assert len(checker.store) == 2  # only the blocks the batch did not cover
+
+    results = checker.check(CONTENT)
+    assert _lines(results) == [(3, "Sold 1234 units."), (9, "Moved 5678 units.")]
+    assert len(calls) == 2 and len(calls[1]) == 3  # the failed lines, judged again
+    assert 0 < checker.stats.evaluated < checker.stats.blocks
+
+    assert _lines(checker.check(CONTENT)) == _lines(results)
+    assert len(calls) == 2 and checker.stats.evaluated == 0
+
+
+def _heading_jumps(node, context):
+    previous = [sibling for sibling in context["siblings"][:context["index"]] if type(sibling).__name__ == "Heading"]
+    if previous and node.level > previous[-1].level + 1:
+        return [CheckResult(rule_name="Headings", severity=CheckSeverity.WARNING, message=f"h{node.level}")]
+    return []
+
+
+def _full_manager(calls):
+    manager = _manager(_number_checker(calls))
+    manager.register_tree_checker(TreeBasedChecker("Headings", "heading jumps", _heading_jumps, node_types=["Heading"]))
+    return manager
+
+
+def _located(results):
+    return [(result.rule_name, result.line_number, result.end_line_number, result.message) for result in results]
+
+
+EDITS = [
+    # A new paragraph on top moves every block down
+    lambda text: "Added 4321 lines.\n\n" + text,
+    # An edited paragraph and a heading jump
+    lambda text: text.replace("Kept 99 units.", "Kept 9999 units.").replace("## Part", "#### Part"),
+    # A removed block
+    lambda text: text.replace("Sold 1234 units.\n\n", ""),
+]
+
+
+def test_incremental_results_match_a_full_check_after_edits():
+    calls = []
+    manager = _full_manager(calls)
+    checker = IncrementalChecker(manager)
+    content = CONTENT + "\n- item 5555\n- item 6\n"
+    assert _located(checker.check(content)) == _located(manager.check(content))
+    for edit in EDITS:
+        content = edit(content)
+        before = len(calls)
+        incremental = checker.check(content)
+        assert len(calls) - before <= 1  # changed blocks only, in at most one batch
+        assert checker.stats.reused > 0
+        assert _located(incremental) == _located(manager.check(content))
+
+
+def test_async_incremental_results_match_a_full_check():
+    manager = _full_manager([])
+    checker = IncrementalChecker(manager)
+    content = CONTENT
+    asyncio.run(checker.acheck(content))
+    for edit in EDITS:
+        content = edit(content)
+        assert _located(asyncio.run(checker.acheck(content))) == _located(manager.check(content))
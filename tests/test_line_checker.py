@@ -0,0 +1,94 @@
+"""Tests of batched line checking."""
+
+import asyncio
+import time
+
+import pytest
+
+from ..findings import CheckResult, CheckSeverity
+from ..tests.markdown.checkers.line_checker import BatchedLineChecker
+
+CONTENT = "\n".join(f"line {number}" if number % 3 else "no digits here" for number in range(1, 31))
+
+
+def _flag(batch):
+    return [
+        CheckResult(rule_name="Digits", severity=CheckSeverity.WARNING, message=line, line_number=line_num)
+        for line_num, line in reversed(batch)
+    ]
+
+
+def _checker(batch_function, async_batch_function=None):
+    return BatchedLineChecker(
+        name="Digits",
+        description="Flags lines with digits",
+        candidate_function=lambda line, line_num: any(char.isdigit() for char in line),
+        batch_function=batch_function,
+        batch_size=4,
+        max_concurrency=3,
+        async_batch_function=async_batch_function,
+    )
+
+
+def _expected_lines():
+    return [number for number in range(1, 31) if number % 3]
+
+
+def test_batches_cover_candidates_only():
+    batches = []
+    checker = _checker(lambda batch: batches.append(batch) or [])
+    checker.check(CONTENT)
+    assert all(len(batch) <= 4 for batch in batches)
+    assert sorted(line_num for batch in batches for line_num, _ in batch) == _expected_lines()
+
+
+def test_results_are_ordered_by_line_when_batches_finish_out_of_order():
+    def slow_first(batch):
+        # Earlier batches finish last
+        time.sleep(0.05 / batch[0][0])
+        return _flag(batch)
+
+    results = _checker(slow_first).check(CONTENT)
+    assert [result.line_number for result in results] == _expected_lines()
+
+
+def test_async_results_are_ordered_by_line():
+    async def slow_first(batch):
+        await asyncio.sleep(0.05 / batch[0][0])
+        return _flag(batch)
+
+    results = asyncio.run(_checker(_flag, slow_first).acheck(CONTENT))
+    assert [result.line_number for result in results] == _expected_lines()
+
+
+def test_batch_errors_propagate():
+    def fail_on_line_13(batch):
+        if any(line_num == 13 for line_num, _ in batch):
+            raise RuntimeError("upstream failed")
+        return _flag(batch)
+
+    checker = _checker(fail_on_line_13)
+    with pytest.raises(RuntimeError):
+        checker.check(CONTENT)
+    with pytest.raises(RuntimeError):
+        asyncio.run(checker.acheck(CONTENT))
+
+
+def test_failed_batch_results_keep_their_place():
+    def fail_second_batch(batch):
+        if batch[0][0] == 7:
+            return [CheckResult(
+                rule_name="Digits",
+                severity=CheckSeverity.INFO,
+                message="Could not parse model verdicts",
+                line_number=batch[0][0],
+                end_line_number=batch[-1][0],
+                failed=True,
+            )]
+        return _flag(batch)
+
+    results = _checker(fail_second_batch).check(CONTENT)
+    failed = [result for result in results if result.failed]
+    assert [(result.line_number, result.end_line_number) for result in failed] == [(7, 11)]
+    assert [result.line_number for result in results] == sorted(result.line_number for result in results)
+    assert not {7, 8, 10, 11} & {result.line_number for result in results if not result.failed}
@@ -0,0 +1,66 @@
+"""Tests of the deterministic Go pre-checks."""
+
+from pathlib import Path
+
+from ..go_check.prechecks import DECLARATION_RULE, IMPORT_RULE, SCHEMA_ORDER_RULE, precheck_go_source
+
+SAMPLE = Path(__file__).resolve().parent.parent / "prompt_template" / "code_check_full" / "resource_huaweicloud_aom_application.go"
+
+MISORDERED = """package aom
+
+import (
+	"github.com/hashicorp/terraform-plugin-sdk/v2/helper/schema"
+	"context"
+
+	"github.com/huaweicloud/terraform-provider-huaweicloud/huaweicloud/config"
+)
+
+var defaultName = "app"
+
+const maxItems = 10
+
+const minItems = 1
+
+func ResourceFoo() *schema.Resource {
+	return &schema.Resource{
+		Schema: map[string]*schema.Schema{},
+
+		CreateContext: resourceFooCreate,
+		ReadContext:   resourceFooRead,
+	}
+}
+"""
+
+
+def _findings(source):
+    return [(result.rule_name, result.line_number) for result in precheck_go_source(source)]
+
+
+def test_sample_file_is_clean():
+    assert precheck_go_source(SAMPLE.read_text(encoding="utf-8")) == []
+
+
+def test_misordered_imports():
+    assert [line for rule, line in _findings(MISORDERED) if rule == IMPORT_RULE] == [4, 5, 5]
+
+
+def test_misordered_declarations():
+    assert [line for rule, line in _findings(MISORDERED) if rule == DECLARATION_RULE] == [12, 14, 14]
+
+
+def test_misordered_schema_fields():
+    assert [line for rule, line in _findings(MISORDERED) if rule == SCHEMA_ORDER_RULE] == [18, 20]
+
+
+def test_fixed_file_is_clean():
+    fixed = MISORDERED.replace(
+        '\t"github.com/hashicorp/terraform-plugin-sdk/v2/helper/schema"\n\t"context"\n',
+        '\t"context"\n\n\t"github.com/hashicorp/terraform-plugin-sdk/v2/helper/schema"\n',
+    ).replace(
+        'var defaultName = "app"\n\nconst maxItems = 10\n\nconst minItems = 1\n',
+        'const (\n\tmaxItems = 10\n\tminItems = 1\n)\n\nvar defaultName = "app"\n',
+    ).replace(
+        "\t\tSchema: map[string]*schema.Schema{},\n\n\t\tCreateContext: resourceFooCreate,\n\t\tReadContext:   resourceFooRead,\n",
+        "\t\tCreateContext: resourceFooCreate,\n\t\tReadContext:   resourceFooRead,\n\n\t\tSchema: map[string]*schema.Schema{},\n",
+    )
+    assert _findings(fixed) == []
@@ -0,0 +1,25 @@
+"""Tests of the shared rate limiter."""
+
+import asyncio
+
+import pytest
+
+from ..chains.ratelimit import AdaptiveConcurrency
+
+
+def test_cancelled_waiter_popped_by_release():
+    async def scenario():
+        concurrency = AdaptiveConcurrency(initial=1, maximum=1)
+        await concurrency.aacquire()
+        waiter = asyncio.create_task(concurrency.aacquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        # Pops the cancelled waiter before its task gets to run
+        concurrency.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert concurrency.in_flight == 0
+        await concurrency.aacquire()
+        assert concurrency.in_flight == 1
+
+    asyncio.run(scenario())
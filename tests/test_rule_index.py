@@ -0,0 +1,51 @@
+"""Tests of rule-book retrieval."""
+
+from pathlib import Path
+
+from ..go_check.chunker import chunk_go_source
+from ..go_check.rule_index import RuleIndex, split_sections
+
+SAMPLE = Path(__file__).resolve().parent.parent / "prompt_template" / "code_check_full" / "resource_huaweicloud_aom_application.go"
+
+RULES = """# Rules
+## Imports
+Group imports by source.
+## Errors
+Wrap errors with fmt.Errorf and return diag.FromErr.
+## Pagination
+Use marker and limit.
+"""
+
+
+def _titles(sections):
+    return [section.title for section in sections]
+
+
+def test_bm25_ranks_lexical_matches():
+    index = RuleIndex("test", "v", split_sections(RULES))
+    assert _titles(index.sections) == ["Rules", "Imports", "Errors", "Pagination"]
+    assert _titles(index.search('return diag.FromErr(fmt.Errorf("failed"))', top_k=1)) == ["Errors"]
+    assert _titles(index.search("groups := imports", top_k=1)) == ["Imports"]
+    assert index.search("nothing relevant", top_k=2) == []
+
+
+def test_triggers_pull_in_sections_of_the_sample_chunks():
+    index = RuleIndex.build("resource")
+    chunks = {chunk.name: chunk for chunk in chunk_go_source(SAMPLE.read_text(encoding="utf-8"))}
+
+    schema = chunks["ResourceAomApplication"]
+    assert {"主方法", "CRUD方法声明", "导入方法声明"} <= set(_titles(index.search(schema.text, schema, 4)))
+
+    create = chunks["ResourceAomApplicationCreate"]
+    triggered = {index.sections[i].title for i in index.triggered(create.text, create)}
+    assert triggered == {"CreateContext方法", "获取region和创建client", "设置ID"}
+    # Triggered sections rank above every lexical match
+    assert triggered <= set(_titles(index.search(create.text, create, len(triggered))))
+
+
+def test_search_returns_sections_in_document_order():
+    index = RuleIndex.build("resource")
+    read = next(chunk for chunk in chunk_go_source(SAMPLE.read_text(encoding="utf-8")) if chunk.name.endswith("Read"))
+    sections = index.search(read.text, read, 6)
+    assert len(sections) == 6
+    assert [section.index for section in sections] == sorted(section.index for section in sections)
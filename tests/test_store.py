@@ -0,0 +1,25 @@
+"""Tests of the scan findings store."""
+
+from ..scanner.store import LOCAL, MODEL, FindingsStore
+from ..findings import CheckResult, CheckSeverity
+
+
+def _result(rule: str, line: int) -> CheckResult:
+    return CheckResult(rule_name=rule, severity=CheckSeverity.ERROR, message=f"{rule} at {line}", line_number=line)
+
+
+def test_run_only_closes_findings_of_its_sources(tmp_path):
+    store = FindingsStore(tmp_path / "findings.sqlite3")
+    first = store.begin_run(mode="findings")
+    assert store.record_file(first, "a.go", "h1", [_result("local", 1)], LOCAL) == (1, 0)
+    assert store.record_file(first, "a.go", "h1", [_result("model", 2)], MODEL) == (1, 0)
+
+    # A mode without model findings re-checks the file
+    second = store.begin_run(mode="chunked")
+    assert store.record_file(second, "a.go", "h2", [], LOCAL) == (0, 1)
+    assert [finding.rule for finding in store.open_findings()] == ["model"]
+
+    third = store.begin_run(mode="findings")
+    assert store.record_file(third, "a.go", "h3", [_result("model", 3)], MODEL) == (0, 0)
+    assert store.open_findings()[0].line == 3
+    store.close()
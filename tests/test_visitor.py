@@ -0,0 +1,87 @@
+"""Tests of single-pass tree checker dispatch."""
+
+from marko.element import Element
+
+from ..findings import CheckResult, CheckSeverity
+from ..tests.markdown.checkers.document import ParsedDocument
+from ..tests.markdown.checkers.manager import CheckerManager
+from ..tests.markdown.checkers.tree_checker import TreeBasedChecker
+
+CONTENT = """# Title
+
+Intro with *emphasis* and `code`.
+
+## Section
+
+- item one
+- item **two**
+  - nested item
+
+```go
+fmt.Println("hi")
+```
+
+### Deep
+
+> quoted
+"""
+
+
+def _record(name):
+    def check(node, context):
+        parent = context["parent"]
+        return [CheckResult(
+            rule_name=name,
+            severity=CheckSeverity.INFO,
+            message=f"{type(node).__name__}<{type(parent).__name__ if parent else None}>#{context['index']}",
+        )]
+    return check
+
+
+def _reference(document, name, node_types=None):
+    """Per-checker recursive pre-order traversal, as tree checkers used to run."""
+    messages = []
+
+    def walk(node, parent, index):
+        if node_types is None or type(node).__name__ in node_types:
+            messages.append(_record(name)(node, {"parent": parent, "index": index})[0].message)
+        children = [child for child in getattr(node, "children", None) or [] if isinstance(child, Element)]
+        for child_index, child in enumerate(children):
+            walk(child, node, child_index)
+
+    walk(document.ast, None, -1)
+    return messages
+
+
+def _messages(results):
+    return [result.message for result in results]
+
+
+def test_wildcard_checker_sees_every_node_in_document_order():
+    document = ParsedDocument.parse(CONTENT)
+    checker = TreeBasedChecker("All", "every node", _record("All"))
+    assert _messages(checker.check(document)) == _reference(document, "All")
+
+
+def test_subscribed_checker_sees_only_its_types():
+    document = ParsedDocument.parse(CONTENT)
+    checker = TreeBasedChecker("Headings", "headings", _record("Headings"), node_types=["Heading", "ListItem"])
+    messages = _messages(checker.check(document))
+    assert messages == _reference(document, "Headings", {"Heading", "ListItem"})
+    assert len(messages) == 6
+
+
+def test_shared_traversal_matches_per_checker_traversals():
+    document = ParsedDocument.parse(CONTENT)
+    checkers = [
+        TreeBasedChecker("All", "every node", _record("All")),
+        TreeBasedChecker("Headings", "headings", _record("Headings"), node_types=["Heading"]),
+        TreeBasedChecker("Code", "code", _record("Code"), node_types=["FencedCode", "CodeSpan"]),
+    ]
+    manager = CheckerManager()
+    for checker in checkers:
+        manager.register_tree_checker(checker)
+
+    expected = [result for checker in checkers for result in checker.check(document)]
+    assert _messages(manager.check(CONTENT)) == _messages(expected)
+    assert all(result.line_number is not None for result in expected if result.rule_name == "Headings")